@@ -0,0 +1,170 @@
+"""Benchmark der Persistenz und der Statistik-Abfragen.
+
+Erzeugt (einmalig, gecacht) Datenbanken mit 10k, 1M und 10M Sessions
+und misst darauf:
+
+* Durchsatz von ``log_session`` (eine Transaktion pro Session) und
+  ``log_sessions`` (Group Commit)
+* Latenz von ``get_stats_today``, ``get_stats_all_time`` und
+  ``get_stats_bulk``
+* Latenz von ``build_report`` (ein Jahr, stündliche und monatliche Buckets)
+
+Aufruf::
+
+    python benchmarks/bench_database.py [--sizes 10000 1000000 10000000] [--output datei.json]
+"""
+
+import argparse
+import random
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterator, List
+
+from common import BENCH_DIR, percentiles, quiet_logging, timed, write_results
+
+from timetracker.database import Database, SessionRecord
+from timetracker.reports import build_report
+
+# Sessions der Messung landen unter diesem Namen und werden danach entfernt
+BENCH_APP = "bench-write.exe"
+BATCH = 50_000
+
+
+def app_names(count: int) -> List[str]:
+    """Namen der generierten Apps."""
+    return [f"app{i}.exe" for i in range(count)]
+
+
+def generate_sessions(size: int, apps: List[str], days: int, seed: int) -> Iterator[SessionRecord]:
+    """Erzeuge ``size`` Sessions, gleichmäßig über die letzten ``days`` Tage verteilt."""
+    rng = random.Random(seed)
+    now = datetime.now().replace(microsecond=0)
+    span = days * 86400
+    for i in range(size):
+        # Aufsteigende Startzeiten wie im echten Betrieb, heute inklusive
+        start = now - timedelta(seconds=span - span * i // size)
+        total = rng.randint(10, 3600)
+        app = apps[rng.randrange(len(apps))]
+        yield SessionRecord(app, f"C:/Apps/{app}", start,
+                            start + timedelta(seconds=total), rng.randint(0, total), total)
+
+
+def prepare_db(path: Path, size: int, apps: List[str], days: int, seed: int) -> float:
+    """Erzeuge die DB, falls sie nicht schon im Cache liegt.
+
+    Returns:
+        float: Dauer der Erzeugung in Sekunden (0 bei Cache-Treffer)
+    """
+    if path.exists():
+        with sqlite3.connect(path) as conn:
+            if conn.execute("SELECT COUNT(*) FROM app_sessions").fetchone()[0] == size:
+                return 0.0
+        path.unlink()
+
+    print(f"Erzeuge {path.name} ({size:,} Sessions) …", flush=True)
+    started = time.perf_counter()
+    with Database(path) as db:
+        batch: List[SessionRecord] = []
+        for record in generate_sessions(size, apps, days, seed):
+            batch.append(record)
+            if len(batch) == BATCH:
+                db.log_sessions(batch)
+                batch.clear()
+        if batch:
+            db.log_sessions(batch)
+    return round(time.perf_counter() - started, 2)
+
+
+def bench_writes(db: Database, single: int, batches: int, batch_size: int) -> dict:
+    """Schreibdurchsatz messen; die geschriebenen Zeilen werden danach entfernt."""
+    now = datetime.now()
+    # Je Session ein eigener Start: (App, Start, Ende) ist eindeutig
+    records = iter([
+        SessionRecord(BENCH_APP, "C:/bench.exe",
+                      now - timedelta(seconds=60, milliseconds=i), now, 30, 60)
+        for i in range(single + batches * batch_size)
+    ])
+
+    single_ns = [timed(db.log_session, *next(records)) for _ in range(single)]
+    batch_ns = [timed(db.log_sessions, [next(records) for _ in range(batch_size)])
+                for _ in range(batches)]
+
+    with db._write_lock, db._writer:
+        app_id = "(SELECT id FROM apps WHERE name = ?)"
+        db._writer.execute(f"DELETE FROM app_sessions WHERE app_id = {app_id}", (BENCH_APP,))
+        db._writer.execute(f"DELETE FROM app_daily_stats WHERE app_id = {app_id}", (BENCH_APP,))
+
+    return {
+        "log_session": {
+            "sessions_per_second": round(single / (sum(single_ns) / 1e9), 1),
+            **percentiles(single_ns),
+        },
+        "log_sessions": {
+            "batch_size": batch_size,
+            "sessions_per_second": round(batches * batch_size / (sum(batch_ns) / 1e9), 1),
+            **percentiles(batch_ns),
+        },
+    }
+
+
+def bench_reads(db: Database, apps: List[str], repeat: int) -> dict:
+    """Latenz der Statistik-Abfragen und Reports messen."""
+    rng = random.Random(0)
+    until = datetime.now()
+    since = until - timedelta(days=365)
+    report_repeat = max(1, repeat // 10)
+    return {
+        "report_year_hourly": percentiles(
+            timed(build_report, db, since, until, "hour", apps) for _ in range(report_repeat)),
+        "report_year_monthly": percentiles(
+            timed(build_report, db, since, until, "month", apps) for _ in range(report_repeat)),
+        "get_stats_today": percentiles(
+            timed(db.get_stats_today, rng.choice(apps)) for _ in range(repeat)),
+        "get_stats_all_time": percentiles(
+            timed(db.get_stats_all_time, rng.choice(apps)) for _ in range(repeat)),
+        "get_stats_bulk": percentiles(
+            timed(db.get_stats_bulk, apps) for _ in range(repeat)),
+    }
+
+
+def main() -> None:
+    """Parameter einlesen, Benchmark ausführen, JSON schreiben."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 1_000_000, 10_000_000],
+                        help="Anzahl Sessions der generierten DBs")
+    parser.add_argument("--apps", type=int, default=20, help="Anzahl verschiedener Apps")
+    parser.add_argument("--days", type=int, default=365, help="Zeitraum der Sessions in Tagen")
+    parser.add_argument("--repeat", type=int, default=200, help="Wiederholungen pro Abfrage")
+    parser.add_argument("--writes", type=int, default=1000, help="Einzelne log_session-Aufrufe")
+    parser.add_argument("--batches", type=int, default=100, help="log_sessions-Aufrufe")
+    parser.add_argument("--batch-size", type=int, default=100, help="Sessions pro Batch")
+    parser.add_argument("--cache-dir", default=str(BENCH_DIR / ".cache"),
+                        help="Ablage der generierten DBs")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="JSON-Zieldatei (Standard: results/)")
+    args = parser.parse_args()
+
+    quiet_logging()
+    apps = app_names(args.apps)
+    cache_dir = Path(args.cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    results = {"params": {"apps": args.apps, "days": args.days, "repeat": args.repeat}}
+    for size in args.sizes:
+        path = cache_dir / f"sessions-{size}-a{args.apps}-d{args.days}-s{args.seed}.db"
+        generated = prepare_db(path, size, apps, args.days, args.seed)
+        with Database(path) as db:
+            results[str(size)] = {
+                "generate_seconds": generated,
+                "db_bytes": path.stat().st_size,
+                **bench_reads(db, apps, args.repeat),
+                **bench_writes(db, args.writes, args.batches, args.batch_size),
+            }
+
+    write_results("database", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
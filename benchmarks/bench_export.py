@@ -0,0 +1,113 @@
+"""Benchmark des Streaming-Exports.
+
+Exportiert die (gecachten) Datenbanken aus ``bench_database.py`` in
+jedem Format und misst Durchsatz und Spitzen-RSS. Jeder Export läuft in
+einem frischen Interpreter, damit die RSS-Spitze nur den Export zeigt.
+
+Aufruf::
+
+    python benchmarks/bench_export.py [--sizes 10000 1000000 10000000] [--output datei.json]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from common import BENCH_DIR, quiet_logging, write_results
+from bench_database import app_names, prepare_db
+
+from timetracker.config import EXPORT_FORMATS
+
+
+def peak_rss_mb() -> float:
+    """Spitzen-RSS des eigenen Prozesses in MB."""
+    status = Path("/proc/self/status")
+    if status.exists():
+        # VmHWM statt ru_maxrss: Letzteres übernimmt unter Linux die
+        # Spitze des Elternprozesses über exec hinweg
+        for line in status.read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    try:
+        import resource
+    except ImportError:  # Windows
+        import psutil
+        return psutil.Process().memory_info().peak_wset / 1e6
+    # macOS: Bytes
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e6
+
+
+def run_child(db_path: str, fmt: str, output: str, batch_size: int) -> None:
+    """Ein Export im Kindprozess; Ergebnis als JSON auf stdout."""
+    from timetracker.database import Database
+    from timetracker.export import export_sessions
+
+    quiet_logging()
+    baseline = peak_rss_mb()
+    started = time.perf_counter()
+    with Database(db_path) as db:
+        rows = export_sessions(db, output, fmt, batch_size=batch_size)
+    seconds = time.perf_counter() - started
+    print(json.dumps({
+        "rows": rows,
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(rows / seconds),
+        "baseline_rss_mb": round(baseline, 1),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "output_bytes": Path(output).stat().st_size,
+    }))
+
+
+def bench_export(db_path: Path, fmt: str, batch_size: int) -> dict:
+    """Starte den Export eines Formats in einem frischen Interpreter."""
+    with tempfile.TemporaryDirectory() as tmp:
+        output = str(Path(tmp) / f"sessions.{fmt}")
+        result = subprocess.run(
+            [sys.executable, __file__, "--child", str(db_path), fmt, output, str(batch_size)],
+            capture_output=True, text=True,
+        )
+    if result.returncode != 0:
+        return {"error": result.stderr.strip().splitlines()[-1]}
+    return json.loads(result.stdout)
+
+
+def main() -> None:
+    """Parameter einlesen, Benchmark ausführen, JSON schreiben."""
+    if len(sys.argv) == 6 and sys.argv[1] == "--child":
+        run_child(sys.argv[2], sys.argv[3], sys.argv[4], int(sys.argv[5]))
+        return
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 1_000_000, 10_000_000],
+                        help="Anzahl Sessions der generierten DBs")
+    parser.add_argument("--formats", nargs="+", default=list(EXPORT_FORMATS),
+                        choices=EXPORT_FORMATS, help="Zu messende Formate")
+    parser.add_argument("--batch-size", type=int, default=10_000, help="Zeilen pro fetchmany()")
+    parser.add_argument("--apps", type=int, default=20, help="Anzahl verschiedener Apps")
+    parser.add_argument("--days", type=int, default=365, help="Zeitraum der Sessions in Tagen")
+    parser.add_argument("--cache-dir", default=str(BENCH_DIR / ".cache"),
+                        help="Ablage der generierten DBs")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="JSON-Zieldatei (Standard: results/)")
+    args = parser.parse_args()
+
+    quiet_logging()
+    apps = app_names(args.apps)
+    cache_dir = Path(args.cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    results = {"params": {"batch_size": args.batch_size, "apps": args.apps, "days": args.days}}
+    for size in args.sizes:
+        path = cache_dir / f"sessions-{size}-a{args.apps}-d{args.days}-s{args.seed}.db"
+        prepare_db(path, size, apps, args.days, args.seed)
+        results[str(size)] = {fmt: bench_export(path, fmt, args.batch_size) for fmt in args.formats}
+
+    write_results("export", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
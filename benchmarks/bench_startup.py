@@ -0,0 +1,129 @@
+"""Startup-Benchmark für TimeTracker.
+
+Misst in frischen Interpretern:
+
+* Import-Kosten laut ``python -X importtime`` (gesamt und die teuersten Module)
+* Zeit bis zur ersten Menü-Ausgabe von ``python -m timetracker``
+
+Aufruf::
+
+    python benchmarks/bench_startup.py [--runs 5] [--json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+# Erste Zeile des Menüs, die ohne Config erscheint (siehe strings.Messages)
+MENU_MARKER = "1. Initialisierung"
+
+
+def _env() -> Dict[str, str]:
+    """Umgebung mit src/ im PYTHONPATH."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = str(SRC_DIR) + os.pathsep + env.get("PYTHONPATH", "")
+    env["PYTHONIOENCODING"] = "utf-8"
+    return env
+
+
+def measure_importtime(module: str) -> Tuple[float, List[Tuple[float, str]]]:
+    """Importiere ``module`` mit ``-X importtime``.
+
+    Returns:
+        Tuple: (kumulierte Zeit in ms, [(eigene Zeit in ms, Modul), ...])
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=_env(), capture_output=True, text=True, check=True,
+    )
+
+    total = 0.0
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue  # Kopfzeile
+        modules.append((int(self_us) / 1000, name.strip()))
+        if name.strip() == module:
+            total = int(cumulative_us) / 1000
+    modules.sort(reverse=True)
+    return total, modules
+
+
+def measure_first_menu(config_dir: Path) -> float:
+    """Zeit vom Prozessstart bis zur ersten Menüzeile in Sekunden.
+
+    Läuft mit einer nicht existierenden Config, damit das Menü ohne
+    Datenbankzugriff erscheint; Eingabe "2" beendet das Programm danach.
+    """
+    code = (
+        "import sys; from timetracker.app import TimeTrackerApp; "
+        f"TimeTrackerApp({str(config_dir / 'config.json')!r}).run()"
+    )
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-c", code], env=_env(),
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+        text=True, encoding="utf-8",
+    )
+    elapsed = float("nan")
+    for line in proc.stdout:
+        if MENU_MARKER in line:
+            elapsed = time.perf_counter() - start
+            break
+    proc.communicate("2\n")
+    return elapsed
+
+
+def main() -> None:
+    """Benchmark ausführen und Ergebnisse ausgeben."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Wiederholungen pro Messung")
+    parser.add_argument("--top", type=int, default=10, help="Anzahl teuerster Module")
+    parser.add_argument("--json", action="store_true", help="Ergebnis als JSON ausgeben")
+    args = parser.parse_args()
+
+    results: Dict[str, object] = {"python": sys.version.split()[0], "runs": args.runs}
+
+    for module in ("timetracker", "timetracker.app", "timetracker.tracker"):
+        totals = []
+        modules: List[Tuple[float, str]] = []
+        for _ in range(args.runs):
+            total, modules = measure_importtime(module)
+            totals.append(total)
+        results[f"import_ms[{module}]"] = round(statistics.median(totals), 2)
+        if module == "timetracker.app":
+            results["top_modules_app"] = [
+                {"module": name, "self_ms": round(ms, 2)} for ms, name in modules[:args.top]
+            ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        menu = [measure_first_menu(Path(tmp)) for _ in range(args.runs)]
+    results["first_menu_ms"] = round(statistics.median(menu) * 1000, 1)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    for key, value in results.items():
+        if key == "top_modules_app":
+            print("Teuerste Module (timetracker.app, eigene Zeit):")
+            for entry in value:
+                print(f"  {entry['self_ms']:8.2f} ms  {entry['module']}")
+        else:
+            print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Benchmark des Tracker-Ticks mit synthetischer Prozesstabelle.
+
+Ein Tick entspricht einem Durchlauf der Polling-Schleife: Fokus-Event
+verarbeiten und Prozesstabelle aktualisieren. Der Fokus folgt einer
+skriptgesteuerten Sequenz (``--dwell`` Ticks pro Fenster, abwechselnd
+Ziel-Apps und andere Prozesse).
+
+Aufruf::
+
+    python benchmarks/bench_tick.py [--processes 500] [--ticks 20000] [--output datei.json]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from common import SyntheticBackend, percentiles, quiet_logging, write_results
+
+from timetracker.foreground import ForegroundEvent, ScriptedForegroundSource
+from timetracker.process_table import ProcessInfo
+from timetracker.tracker import AppTracker
+
+
+def focus_sequence(backend: SyntheticBackend, targets: int, ticks: int,
+                   dwell: int, seed: int):
+    """Erzeuge die Fokus-Events pro Tick (jedes zweite Fenster eine Ziel-App)."""
+    rng = random.Random(seed)
+    pids = [info.pid for info in backend.processes]
+    events = []
+    while len(events) < ticks:
+        if len(events) // dwell % 2 == 0:
+            pid = rng.randint(1, targets)
+        else:
+            pid = rng.choice(pids[targets:])
+        # Fokus-Abfrage liefert nur die PID, Name/Pfad löst der Tracker auf
+        events.extend([ForegroundEvent(pid)] * dwell)
+    return events[:ticks]
+
+
+def run(processes: int, targets: int, ticks: int, dwell: int, churn: int, seed: int) -> dict:
+    """Führe den Benchmark aus und liefere die Messwerte."""
+    target_apps = [f"app{i}.exe" for i in range(targets)]
+    backend = SyntheticBackend(processes, target_apps)
+    events = focus_sequence(backend, targets, ticks, dwell, seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config_path = Path(tmp) / "config.json"
+        config_path.write_text(json.dumps({
+            "target_apps": target_apps,
+            "db_path": str(Path(tmp) / "tracker.db"),
+            "check_interval": 0.5,
+        }), encoding="utf-8")
+
+        tracker = AppTracker(config_path, backend=backend,
+                             foreground_source=ScriptedForegroundSource())
+        tracker.process_table.refresh()
+
+        next_pid = processes + 1
+        focus_ns, liveness_ns, tick_ns = [], [], []
+
+        # Ausgaben des Trackers (print) nicht mitmessen
+        with contextlib.redirect_stdout(io.StringIO()):
+            started = time.perf_counter_ns()
+            for tick, event in enumerate(events):
+                # Prozess-Churn: Füllprozesse durch neue ersetzen
+                for _ in range(churn):
+                    index = targets + (next_pid % (processes - targets))
+                    backend.processes[index] = ProcessInfo(
+                        next_pid, f"proc{next_pid}.exe", float(next_pid))
+                    next_pid += 1
+
+                t0 = time.perf_counter_ns()
+                tracker.handle_foreground(event)
+                t1 = time.perf_counter_ns()
+                tracker.check_liveness()
+                t2 = time.perf_counter_ns()
+
+                focus_ns.append(t1 - t0)
+                liveness_ns.append(t2 - t1)
+                tick_ns.append(t2 - t0)
+            elapsed = (time.perf_counter_ns() - started) / 1e9
+        tracker.close()
+
+    return {
+        "params": {
+            "processes": processes, "targets": targets, "ticks": ticks,
+            "dwell": dwell, "churn": churn, "seed": seed,
+        },
+        "ticks_per_second": round(ticks / elapsed, 1),
+        "tick": percentiles(tick_ns),
+        "focus": percentiles(focus_ns),
+        "liveness": percentiles(liveness_ns),
+        "pid_cache": {"hits": tracker.pid_cache.hits, "misses": tracker.pid_cache.misses},
+        "sessions_written": tracker.writer.written,
+    }
+
+
+def main() -> None:
+    """Parameter einlesen, Benchmark ausführen, JSON schreiben."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--processes", type=int, default=500, help="Größe der Prozesstabelle")
+    parser.add_argument("--targets", type=int, default=10, help="Anzahl Ziel-Apps")
+    parser.add_argument("--ticks", type=int, default=20000, help="Anzahl Ticks")
+    parser.add_argument("--dwell", type=int, default=20, help="Ticks pro Fokusfenster")
+    parser.add_argument("--churn", type=int, default=0, help="Neue Prozesse pro Tick")
+    parser.add_argument("--seed", type=int, default=1, help="Zufalls-Seed der Fokus-Sequenz")
+    parser.add_argument("--output", help="JSON-Zieldatei (Standard: results/)")
+    args = parser.parse_args()
+
+    quiet_logging()
+    results = run(args.processes, args.targets, args.ticks, args.dwell, args.churn, args.seed)
+    write_results("tick", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Gemeinsame Hilfen für die TimeTracker-Benchmarks.
+
+Alle Benchmarks laufen headless (ohne Fenster/Fokus-APIs) und schreiben
+ihre Ergebnisse als JSON, damit sich Commits vergleichen lassen.
+"""
+
+import json
+import logging
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+BENCH_DIR = Path(__file__).resolve().parent
+SRC_DIR = BENCH_DIR.parent / "src"
+RESULTS_DIR = BENCH_DIR / "results"
+
+sys.path.insert(0, str(SRC_DIR))
+
+from timetracker.backends import PlatformBackend  # noqa: E402
+from timetracker.process_table import ProcessInfo  # noqa: E402
+
+
+class SyntheticBackend(PlatformBackend):
+    """Backend mit künstlicher Prozessliste fester Größe.
+
+    Die ersten ``len(target_apps)`` PIDs gehören zu den Ziel-Apps, der
+    Rest sind Füllprozesse ``proc<N>.exe``.
+    """
+
+    name = "synthetic"
+
+    def __init__(self, size: int, target_apps: Sequence[str]) -> None:
+        names = list(target_apps) + [f"proc{i}.exe" for i in range(len(target_apps), size)]
+        self.processes = [
+            ProcessInfo(pid, name, 1_000_000.0 + pid) for pid, name in enumerate(names, 1)
+        ]
+        self._details = {info.pid: (info.name, f"C:/Apps/{info.name}") for info in self.processes}
+        self._create_times = {info.pid: info.create_time for info in self.processes}
+
+    def snapshot(self) -> List[ProcessInfo]:
+        return self.processes
+
+    def process_details(self, pid: int):
+        return self._details.get(pid, (None, None))
+
+    def create_time(self, pid: int) -> Optional[float]:
+        return self._create_times.get(pid)
+
+
+def quiet_logging() -> None:
+    """Keine INFO-Logs während der Messung (würden das Log fluten)."""
+    logging.disable(logging.INFO)
+
+
+def percentiles(samples_ns: Iterable[int]) -> Dict[str, float]:
+    """Latenz-Perzentile in Mikrosekunden.
+
+    Args:
+        samples_ns: Einzelmessungen in Nanosekunden
+
+    Returns:
+        Dict: count, mean, p50, p90, p99, max (µs)
+    """
+    samples = sorted(samples_ns)
+    if not samples:
+        return {"count": 0}
+
+    def pick(q: float) -> float:
+        return samples[min(len(samples) - 1, int(q * len(samples)))] / 1000
+
+    return {
+        "count": len(samples),
+        "mean_us": round(sum(samples) / len(samples) / 1000, 3),
+        "p50_us": round(pick(0.50), 3),
+        "p90_us": round(pick(0.90), 3),
+        "p99_us": round(pick(0.99), 3),
+        "max_us": round(samples[-1] / 1000, 3),
+    }
+
+
+def timed(func, *args) -> int:
+    """Führe ``func`` aus und liefere die Dauer in Nanosekunden."""
+    start = time.perf_counter_ns()
+    func(*args)
+    return time.perf_counter_ns() - start
+
+
+def git_commit() -> Optional[str]:
+    """Kurzer Hash des aktuellen Commits (None außerhalb von git)."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BENCH_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_results(benchmark: str, results: Dict[str, object],
+                  output: Optional[str] = None) -> Path:
+    """Schreibe Ergebnisse samt Metadaten als JSON.
+
+    Args:
+        benchmark: Name des Benchmarks (Teil des Dateinamens)
+        results: Messwerte
+        output: Zieldatei (Standard: results/<benchmark>-<commit>.json)
+
+    Returns:
+        Path: Geschriebene Datei
+    """
+    commit = git_commit()
+    document = {
+        "benchmark": benchmark,
+        "commit": commit,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+    path = Path(output) if output else RESULTS_DIR / f"{benchmark}-{commit or 'nogit'}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(document, indent=2), encoding="utf-8")
+    print(json.dumps(document["results"], indent=2))
+    print(f"\nErgebnis: {path}")
+    return path
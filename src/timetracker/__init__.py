@@ -12,6 +12,27 @@ __version__ = "0.1.0"
 __author__ = "Mike ©"
 __all__ = ["TimeTrackerApp", "AppTracker", "Database"]
 
-from timetracker.app import TimeTrackerApp
-from timetracker.tracker import AppTracker
-from timetracker.database import Database
+# Erst bei Zugriff importieren: ``import timetracker`` lädt weder
+# Tracker (psutil, Plattform-APIs) noch Datenbank
+_LAZY_IMPORTS = {
+    "TimeTrackerApp": "timetracker.app",
+    "AppTracker": "timetracker.tracker",
+    "Database": "timetracker.database",
+}
+
+
+def __getattr__(name: str):
+    """Lade die öffentlichen Klassen beim ersten Zugriff."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    import importlib
+
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_IMPORTS))
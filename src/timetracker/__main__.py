@@ -1,19 +1,20 @@
 """TimeTracker - Einstiegspunkt beim Ausführen als Modul.
 
-Erlaubt: python -m timetracker
+Erlaubt: python -m timetracker [--autostart] [--profile] [export ...]
 """
 
-from timetracker.app import TimeTrackerApp
+import sys
+
+from timetracker.cli import main as cli_main
 from timetracker.logger_config import setup_logger
 
 logger = setup_logger(__name__)
 
 
 def main() -> None:
-    """Starte die TimeTrackerApp."""
+    """Werte die Kommandozeile aus und starte die TimeTrackerApp."""
     try:
-        app = TimeTrackerApp()
-        app.run()
+        sys.exit(cli_main())
     except KeyboardInterrupt:
         print("\n👋 Auf Wiedersehen")
         logger.info("Programm durch User beendet")
@@ -0,0 +1,320 @@
+"""Vektorisierte Auswertungen der Sessions mit NumPy (optional).
+
+Die Sessions werden einmal als Spalten-Arrays geladen (App-ID, Start,
+Ende, Fokus- und Gesamtdauer) und neben der Datenbank als ``.npz``
+zwischengespeichert. Der Cache ist an die höchste Session-ID gebunden:
+spätere Läufe lesen nur die neu hinzugekommenen Zeilen und hängen sie an.
+
+Zeiten sind "lokale Epoch-Sekunden" (lokale Uhrzeit, als UTC gezählt),
+Stunde und Wochentag ergeben sich damit direkt per Ganzzahl-Arithmetik.
+Den UTC-Offset liefert ``time.localtime`` einmal pro vorkommender Stunde.
+"""
+
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from .config import ANALYTICS_CACHE_SUFFIX, EXPORT_BATCH_SIZE
+from .database import Database
+from .exceptions import TimeTrackerError
+from .logger_config import setup_logger
+
+try:
+    import numpy as np
+except ImportError:  # optionale Abhängigkeit
+    np = None
+
+logger = setup_logger(__name__)
+
+# Zeilen nach der höchsten gecachten ID, Zeiten in UTC-Epoch-Sekunden.
+# Startzeiten ≤ 0 (nicht lesbare Alt-Daten) werden beim Laden verworfen,
+# ein fehlendes Ende wird zu -1 (= Start + Dauer)
+SQL_ANALYTICS_ROWS = """
+    SELECT
+        s.id,
+        apps.name,
+        s.start_ms / 1000,
+        COALESCE(s.end_ms / 1000, -1),
+        COALESCE(s.duration_seconds, 0),
+        COALESCE(s.total_duration_seconds, 0)
+    FROM app_sessions s
+    JOIN apps ON apps.id = s.app_id
+    WHERE s.id > ?
+    ORDER BY s.id
+"""
+
+SQL_COUNT_UP_TO = "SELECT COUNT(*) FROM app_sessions WHERE id <= ?"
+
+_DAY = 86400
+# 1970-01-01 war ein Donnerstag (Montag = 0)
+_EPOCH_WEEKDAY = 3
+
+_ARRAYS = ("app_ids", "start", "end", "focus", "total")
+
+
+def _require_numpy() -> None:
+    """Raises: TimeTrackerError wenn numpy nicht installiert ist."""
+    if np is None:
+        raise TimeTrackerError("Analytics benötigt numpy (pip install numpy)")
+
+
+class SessionArrays(NamedTuple):
+    """Alle Sessions als Spalten (gleich lang, nach ID sortiert)."""
+
+    apps: List[str]           # App-ID → App-Name
+    app_ids: "np.ndarray"     # int32
+    start: "np.ndarray"       # int64, lokale Epoch-Sekunden
+    end: "np.ndarray"         # int64
+    focus: "np.ndarray"       # int64, Sekunden
+    total: "np.ndarray"       # int64, Sekunden
+    last_id: int              # höchste enthaltene Session-ID
+    source_rows: int          # gelesene DB-Zeilen bis last_id (inkl. verworfener)
+
+    @property
+    def count(self) -> int:
+        """Anzahl Sessions."""
+        return len(self.app_ids)
+
+
+# ========== LADEN & CACHE ==========
+
+def cache_path(db: Database) -> Path:
+    """Cache-Datei neben der Datenbank (``tracker.analytics.npz``)."""
+    return db.db_path.with_suffix(ANALYTICS_CACHE_SUFFIX)
+
+
+def _empty() -> SessionArrays:
+    return SessionArrays([], np.empty(0, np.int32), *(np.empty(0, np.int64) for _ in range(4)),
+                         0, 0)
+
+
+def _read_cache(path: Path) -> Optional[SessionArrays]:
+    """Lies den Cache (None wenn nicht vorhanden oder unlesbar)."""
+    if not path.exists():
+        return None
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            return SessionArrays(
+                data["apps"].tolist(), *(data[name] for name in _ARRAYS),
+                int(data["last_id"]), int(data["source_rows"]),
+            )
+    except (OSError, KeyError, ValueError) as e:
+        logger.warning(f"Analytics-Cache unbrauchbar, wird neu aufgebaut: {e}")
+        return None
+
+
+def _write_cache(path: Path, arrays: SessionArrays) -> None:
+    """Schreibe den Cache atomar (Temp-Datei + replace)."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        with open(tmp_path, "wb") as file:
+            np.savez(
+                file,
+                apps=np.array(arrays.apps, dtype=str),
+                last_id=np.int64(arrays.last_id),
+                source_rows=np.int64(arrays.source_rows),
+                **{name: getattr(arrays, name) for name in _ARRAYS},
+            )
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"Analytics-Cache konnte nicht geschrieben werden: {e}")
+
+
+def _is_valid(db: Database, cached: SessionArrays) -> bool:
+    """Cache passt nur, wenn bis ``last_id`` keine Zeilen gelöscht wurden."""
+    (count,) = db.read(SQL_COUNT_UP_TO, (cached.last_id,))[0]
+    return count == cached.source_rows
+
+
+def _append(db: Database, base: SessionArrays, batch_size: int) -> SessionArrays:
+    """Lies alle Zeilen nach ``base.last_id`` und hänge sie an."""
+    apps = list(base.apps)
+    app_index: Dict[str, int] = {name: i for i, name in enumerate(apps)}
+    # Neue Zeilen, Zeiten zunächst in UTC
+    chunks: Dict[str, list] = {name: [] for name in _ARRAYS}
+    last_id = base.last_id
+    source_rows = base.source_rows
+
+    for batch in db.stream(SQL_ANALYTICS_ROWS, (base.last_id,), batch_size):
+        ids, names, starts, ends, focus, total = zip(*batch)
+        # Neue Apps in der Reihenfolge ihres ersten Auftretens
+        for name in dict.fromkeys(names):
+            if name not in app_index:
+                app_index[name] = len(apps)
+                apps.append(name)
+
+        start = np.array(starts, np.int64)
+        total_arr = np.array(total, np.int64)
+        end = np.array(ends, np.int64)
+        end = np.where(end < 0, start + total_arr, end)
+
+        app_ids = np.fromiter((app_index[n] for n in names), np.int32, len(names))
+        valid = start > 0
+        chunks["app_ids"].append(app_ids[valid])
+        chunks["start"].append(start[valid])
+        chunks["end"].append(end[valid])
+        chunks["focus"].append(np.array(focus, np.int64)[valid])
+        chunks["total"].append(total_arr[valid])
+        last_id = ids[-1]
+        source_rows += len(batch)
+
+    if last_id == base.last_id:
+        return base
+    new = {name: np.concatenate(chunks[name]) for name in _ARRAYS}
+    # Start und Ende gemeinsam umrechnen: ein Offset-Lookup pro Stunde
+    times = _to_local(np.concatenate([new["start"], new["end"]]))
+    new["start"], new["end"] = np.split(times, 2)
+    return SessionArrays(apps, *(np.concatenate([getattr(base, name), new[name]])
+                                 for name in _ARRAYS),
+                         last_id, source_rows)
+
+
+def _to_local(utc: "np.ndarray") -> "np.ndarray":
+    """UTC- in lokale Epoch-Sekunden (Offset einmal pro vorkommender Stunde)."""
+    hours, inverse = np.unique(utc // 3600, return_inverse=True)
+    offsets = np.array([time.localtime(hour * 3600).tm_gmtoff for hour in hours.tolist()],
+                       np.int64)
+    return utc + offsets[inverse]
+
+
+def load_sessions(db: Database, use_cache: bool = True,
+                  batch_size: int = EXPORT_BATCH_SIZE) -> SessionArrays:
+    """Lade alle Sessions als Arrays, inkrementell über den ``.npz``-Cache.
+
+    Args:
+        db: Datenbank
+        use_cache: Cache lesen und aktualisieren
+        batch_size: Zeilen pro Datenbank-Batch
+
+    Returns:
+        SessionArrays: Alle Sessions
+
+    Raises:
+        TimeTrackerError: Wenn numpy nicht installiert ist
+        DatabaseError: Wenn das Lesen fehlschlägt
+    """
+    _require_numpy()
+    path = cache_path(db)
+    cached = _read_cache(path) if use_cache else None
+    if cached is not None and not _is_valid(db, cached):
+        logger.info("Sessions wurden gelöscht – Analytics-Cache wird neu aufgebaut")
+        cached = None
+
+    base = cached if cached is not None else _empty()
+    arrays = _append(db, base, batch_size)
+    if use_cache and arrays is not cached:
+        _write_cache(path, arrays)
+    logger.debug(f"Analytics: {arrays.count} Session(s), {arrays.count - base.count} neu")
+    return arrays
+
+
+# ========== AUSWERTUNGEN ==========
+
+def duration_percentiles(data: SessionArrays, percentiles: Sequence[float] = (50, 90, 99),
+                         field: str = "focus") -> Dict[str, "np.ndarray"]:
+    """Perzentile der Session-Dauer pro App.
+
+    Args:
+        data: Geladene Sessions
+        percentiles: Perzentile (0–100)
+        field: ``focus`` oder ``total``
+
+    Returns:
+        Dict: App-Name → Array der Perzentile (Sekunden)
+    """
+    values = getattr(data, field)
+    # Nach App und Wert sortieren: jede App ist danach ein zusammenhängender Block
+    order = np.lexsort((values, data.app_ids))
+    app_ids, values = data.app_ids[order], values[order]
+    bounds = np.searchsorted(app_ids, np.arange(len(data.apps) + 1))
+    return {
+        name: np.percentile(values[bounds[i]:bounds[i + 1]], percentiles)
+        for i, name in enumerate(data.apps)
+        if bounds[i] < bounds[i + 1]
+    }
+
+
+def hour_heatmap(data: SessionArrays, field: str = "focus") -> "np.ndarray":
+    """Summierte Dauer nach Wochentag und Stunde des Session-Starts.
+
+    Returns:
+        np.ndarray: Form (Apps, 7, 24), Wochentag 0 = Montag, Sekunden
+    """
+    weekday = (data.start // _DAY + _EPOCH_WEEKDAY) % 7
+    hour = (data.start % _DAY) // 3600
+    index = (data.app_ids.astype(np.int64) * 7 + weekday) * 24 + hour
+    counts = np.bincount(index, weights=getattr(data, field), minlength=len(data.apps) * 168)
+    return counts.reshape(len(data.apps), 7, 24)
+
+
+def streaks(data: SessionArrays, today: Optional[int] = None) -> Dict[str, Tuple[int, int]]:
+    """Längste und aktuelle Serie aufeinanderfolgender Nutzungstage pro App.
+
+    Args:
+        data: Geladene Sessions
+        today: Heutiger Tag (Epoch-Tage, Standard: letzter Tag mit Daten)
+
+    Returns:
+        Dict: App-Name → (längste Serie, aktuelle Serie) in Tagen; die
+        aktuelle Serie endet heute oder gestern
+    """
+    if not data.count:
+        return {}
+    # Eindeutige (App, Tag)-Paare, sortiert nach App und Tag
+    days = data.start // _DAY
+    pairs = np.unique(data.app_ids.astype(np.int64) << 32 | days)
+    apps, days = pairs >> 32, pairs & 0xFFFFFFFF
+
+    # Neue Serie bei App-Wechsel oder Lücke > 1 Tag
+    breaks = np.ones(len(pairs), bool)
+    breaks[1:] = (apps[1:] != apps[:-1]) | (days[1:] - days[:-1] != 1)
+    run_ids = np.cumsum(breaks) - 1
+    run_lengths = np.bincount(run_ids)
+    run_apps = apps[breaks]
+    run_ends = np.append(days[np.flatnonzero(breaks)[1:] - 1], days[-1])
+
+    longest = np.zeros(len(data.apps), np.int64)
+    np.maximum.at(longest, run_apps, run_lengths)
+
+    today = int(days.max()) if today is None else today
+    current = np.zeros(len(data.apps), np.int64)
+    active = run_ends >= today - 1
+    np.maximum.at(current, run_apps[active], run_lengths[active])
+
+    present = np.zeros(len(data.apps), bool)
+    present[run_apps] = True
+    return {
+        name: (int(longest[i]), int(current[i]))
+        for i, name in enumerate(data.apps) if present[i]
+    }
+
+
+def co_usage(data: SessionArrays) -> "np.ndarray":
+    """Stunden, in denen zwei Apps gleichzeitig liefen.
+
+    Jede Session belegt alle Stunden von ihrem Start bis zu ihrem Ende.
+
+    Returns:
+        np.ndarray: Symmetrische Matrix (Apps × Apps); die Diagonale
+        enthält die Stunden, in denen die App überhaupt lief
+    """
+    n_apps = len(data.apps)
+    if not data.count:
+        return np.zeros((n_apps, n_apps), np.int64)
+
+    first = data.start // 3600
+    # Ende exklusiv: eine Session bis 10:00 belegt die Stunde 10 nicht mehr
+    last = np.maximum(data.end - 1, data.start) // 3600
+    spans = last - first + 1
+    # Jede Session auf ihre Stunden aufspreizen (ohne Python-Schleife)
+    offsets = np.arange(spans.sum()) - np.repeat(np.cumsum(spans) - spans, spans)
+    hours = np.repeat(first, spans) + offsets
+    apps = np.repeat(data.app_ids.astype(np.int64), spans)
+
+    # Anwesenheitsmatrix Stunde × App (ohne Sortieren: direkt indizieren)
+    origin = hours.min()
+    presence = np.zeros((int(hours.max() - origin) + 1, n_apps), np.float32)
+    presence[hours - origin, apps] = 1.0
+    # Gleitkomma, damit das Produkt über BLAS läuft (float32 exakt bis 2**24 Stunden)
+    return (presence.T @ presence).astype(np.int64)
@@ -2,15 +2,15 @@
 
 import json
 import sys
+from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
-from .config import CONFIG_PATH, DEFAULT_CONFIG, AUTOSTART_PARAM
-from .exceptions import ConfigError
+from .config import CONFIG_PATH, DEFAULT_CONFIG, AUTOSTART_PARAM, PROFILE_PARAM
+from .exceptions import ConfigError, TrackerError
 from .logger_config import setup_logger
 from .strings import Messages
-from .database import Database
-from .tracker import AppTracker
+from .matcher import AppMatcher
 
 logger = setup_logger(__name__)
 
@@ -36,6 +36,7 @@ class TimeTrackerApp:
         
         self.config_path: Path = config_path
         self.autostart_mode: bool = AUTOSTART_PARAM in sys.argv
+        self.profile_mode: bool = PROFILE_PARAM in sys.argv
         self.config: Optional[dict] = None
         
         logger.info(f"TimeTrackerApp initialisiert (Autostart: {self.autostart_mode})")
@@ -97,6 +98,7 @@ class TimeTrackerApp:
             self._validate_config(config)
             
             # Speichere
+            self.config_path.parent.mkdir(parents=True, exist_ok=True)
             with open(self.config_path, 'w', encoding='utf-8') as f:
                 json.dump(config, f, indent=2, ensure_ascii=False)
             
@@ -139,6 +141,9 @@ class TimeTrackerApp:
         for app in config["target_apps"]:
             if not isinstance(app, str):
                 raise ConfigError(f"App '{app}' ist kein String")
+
+        # Glob-/Regex-Regeln müssen kompilierbar sein
+        AppMatcher(config["target_apps"])
         
         # check_interval muss Zahl sein
         if not isinstance(config["check_interval"], (int, float)):
@@ -152,6 +157,8 @@ class TimeTrackerApp:
         Returns:
             bool: True wenn erfolgreich
         """
+        from .database import Database
+
         print(f"\n{Messages.SEPARATOR}")
         print(f"  {Messages.HEADER_INIT}")
         print(f"{Messages.SEPARATOR}\n")
@@ -182,7 +189,7 @@ class TimeTrackerApp:
         
         # Initialisiere Datenbank
         try:
-            db = Database(config["db_path"])
+            Database(config["db_path"]).close()
             print(f"\n{Messages.MSG_SUCCESS_CONFIG.format(len(apps))}")
             print(f"📱 Apps: {', '.join(apps)}\n")
             logger.info(f"App initialisiert mit {len(apps)} App(s): {apps}")
@@ -193,6 +200,43 @@ class TimeTrackerApp:
             logger.error(f"Fehler beim Initialisieren: {e}")
             return False
     
+    def _create_tracker(self, config: dict):
+        """Erstelle den AppTracker, ggf. mit Trace-Aufzeichnung.
+
+        Ist ``trace_dir`` in der Config gesetzt, wird jeder Lauf als
+        Trace (``trace-<zeitstempel>.tttrace``) für ein Replay aufgezeichnet.
+
+        Returns:
+            AppTracker: Initialisierter Tracker
+        """
+        # Tracker (psutil, Plattform-APIs) erst beim Start laden
+        from .tracker import AppTracker
+
+        recorder = None
+        if config.get("trace_dir"):
+            from .trace import TraceRecorder
+
+            name = f"trace-{datetime.now():%Y%m%d-%H%M%S}.tttrace"
+            recorder = TraceRecorder(Path(config["trace_dir"]) / name)
+
+        return AppTracker(self.config_path, recorder=recorder)
+
+    def _monitor(self, config: dict) -> None:
+        """Erstelle den Tracker und überwache, ggf. im Profiling-Modus.
+
+        Mit ``--profile`` oder ``"profile": true`` in der Config läuft das
+        Monitoring unter dem Sampling-Profiler (Dumps in data/profiles).
+        """
+        tracker = self._create_tracker(config)
+        if not (self.profile_mode or config.get("profile")):
+            tracker.start_monitoring()
+            return
+
+        from .profiling import Profiler
+
+        with Profiler.from_config(config):
+            tracker.start_monitoring()
+
     def cmd_run(self) -> None:
         """Starte das Monitoring."""
         config = self.load_config()
@@ -207,8 +251,7 @@ class TimeTrackerApp:
         print(f"{Messages.MSG_INFO_RUNNING}\n")
         
         try:
-            tracker = AppTracker(self.config_path)
-            tracker.start_monitoring()
+            self._monitor(config)
         
         except KeyboardInterrupt:
             print(f"\n{Messages.MSG_SUCCESS_STOP}")
@@ -220,7 +263,7 @@ class TimeTrackerApp:
     
     def cmd_stats(self) -> None:
         """Zeige Statistiken für alle Apps."""
-        from datetime import datetime
+        from .database import Database
 
         print(f"\n{Messages.SEPARATOR}")
         print(f"  {Messages.HEADER_STATS}")
@@ -232,7 +275,9 @@ class TimeTrackerApp:
             return
 
         try:
-            db = Database(config["db_path"])
+            # Alle Apps in einer Abfrage statt zwei Abfragen pro App
+            with Database(config["db_path"]) as db:
+                stats = db.get_stats_bulk(config["target_apps"])
 
             # Zeige Stats für jede App
             for i, app in enumerate(config["target_apps"]):
@@ -243,7 +288,7 @@ class TimeTrackerApp:
                 print(f"{'─'*60}")
 
                 # ========== HEUTE ==========
-                today_stats = db.get_stats_today(app)
+                today_stats = stats[app].today if app in stats else None
                 print(f"\n{Messages.STATS_TODAY.format(datetime.now().strftime('%d.%m.%Y'))}")
 
                 if today_stats and today_stats[0]:
@@ -272,7 +317,7 @@ class TimeTrackerApp:
                     print(Messages.STATS_NO_DATA)
 
                 # ========== GESAMT ==========
-                all_stats = db.get_stats_all_time(app)
+                all_stats = stats[app].all_time if app in stats else None
                 print(f"\n{Messages.STATS_ALL}")
 
                 if all_stats and all_stats[0]:
@@ -301,6 +346,178 @@ class TimeTrackerApp:
             logger.error(f"Fehler beim Abrufen der Statistiken: {e}")
 
     
+    def cmd_export(self, output: str, fmt: Optional[str] = None,
+                   since: Optional[datetime] = None, until: Optional[datetime] = None,
+                   apps: Optional[List[str]] = None, batch_size: Optional[int] = None,
+                   db_path: Optional[str] = None) -> bool:
+        """Exportiere die Roh-Sessions (gestreamt) in eine Datei.
+
+        Args:
+            output: Zieldatei oder ``-`` für stdout
+            fmt: Export-Format (Standard: aus der Dateiendung)
+            since: Nur Sessions ab diesem Zeitpunkt
+            until: Nur Sessions vor diesem Zeitpunkt
+            apps: Nur diese Apps (None = alle)
+            batch_size: Zeilen pro Datenbank-Batch
+            db_path: Datenbank (Standard: ``db_path`` aus der Config)
+
+        Returns:
+            bool: True wenn erfolgreich
+        """
+        from .config import EXPORT_BATCH_SIZE
+        from .database import Database
+        from .export import export_sessions
+
+        if db_path is None:
+            config = self.load_config()
+            if not config:
+                print(Messages.MSG_ERROR_NO_CONFIG, file=sys.stderr)
+                return False
+            db_path = config["db_path"]
+
+        try:
+            with Database(self._require_db(db_path), read_only=True) as db:
+                rows = export_sessions(db, output, fmt, since, until, apps,
+                                       batch_size or EXPORT_BATCH_SIZE)
+        except Exception as e:
+            print(Messages.MSG_ERROR_GENERIC.format(e), file=sys.stderr)
+            logger.error(f"Fehler beim Export: {e}")
+            return False
+
+        # Bei Ausgabe auf stdout keine Meldung in die Daten mischen
+        print(Messages.MSG_SUCCESS_EXPORT.format(rows, output), file=sys.stderr)
+        return True
+
+    def cmd_report(self, since: Optional[datetime] = None, until: Optional[datetime] = None,
+                   bucket: str = "day", apps: Optional[List[str]] = None,
+                   db_path: Optional[str] = None) -> bool:
+        """Zeige Fokus- und Gesamtzeit pro App und Zeit-Bucket.
+
+        Args:
+            since: Beginn (Standard: vor REPORT_DEFAULT_DAYS Tagen, 0 Uhr)
+            until: Ende, exklusiv (Standard: jetzt)
+            bucket: ``hour``, ``weekday``, ``day``, ``week`` oder ``month``
+            apps: Nur diese Apps (Standard: alle Apps, auf die eine Regel aus
+                target_apps der Config passt)
+            db_path: Datenbank (Standard: ``db_path`` aus der Config)
+
+        Returns:
+            bool: True wenn erfolgreich
+        """
+        from datetime import timedelta
+        from .config import REPORT_DEFAULT_DAYS
+        from .database import Database
+        from .reports import bucket_label, build_report, resolve_apps
+
+        rules = None
+        if db_path is None or apps is None:
+            config = self.load_config()
+            if not config:
+                print(Messages.MSG_ERROR_NO_CONFIG)
+                return False
+            db_path = db_path or config["db_path"]
+            if apps is None:
+                rules = config["target_apps"]
+
+        until = until or datetime.now()
+        since = since or (until - timedelta(days=REPORT_DEFAULT_DAYS - 1)).replace(
+            hour=0, minute=0, second=0, microsecond=0)
+
+        try:
+            with Database(self._require_db(db_path), read_only=True) as db:
+                # Glob-/Regex-Regeln gegen die gespeicherten App-Namen auflösen
+                if rules is not None:
+                    apps = resolve_apps(db, rules)
+                rows = build_report(db, since, until, bucket, apps)
+        except Exception as e:
+            print(Messages.MSG_ERROR_GENERIC.format(e))
+            logger.error(f"Fehler beim Report: {e}")
+            return False
+
+        header = Messages.HEADER_REPORT.format(
+            since.strftime("%d.%m.%Y %H:%M"), until.strftime("%d.%m.%Y %H:%M"), bucket)
+        print(f"\n{Messages.SEPARATOR}")
+        print(f"  {header}")
+        print(f"{Messages.SEPARATOR}\n")
+        if not rows:
+            print(Messages.STATS_NO_DATA)
+            return True
+
+        print(Messages.REPORT_COLUMNS.format(*Messages.REPORT_HEADER))
+        for row in rows:
+            share = f"{row.focus_share:.0%}" if row.focus_share is not None else "–"
+            print(Messages.REPORT_COLUMNS.format(
+                bucket_label(bucket, row.bucket), row.app_name[:24], row.opens,
+                self._format_duration(row.focus_seconds),
+                self._format_duration(row.total_seconds), share,
+            ))
+        return True
+
+    def cmd_compact(self, days: Optional[int] = None, vacuum: bool = False,
+                    db_path: Optional[str] = None) -> bool:
+        """Lösche abgelaufene Roh-Sessions (Rollups bleiben erhalten).
+
+        Args:
+            days: Aufbewahrung in Tagen (Standard: ``retention_days`` aus der Config)
+            vacuum: Danach einmalig VACUUM (stellt auf auto_vacuum=INCREMENTAL um)
+            db_path: Datenbank (Standard: ``db_path`` aus der Config)
+
+        Returns:
+            bool: True wenn erfolgreich
+        """
+        from .database import Database
+        from .retention import Compactor
+
+        if db_path is None or days is None:
+            config = self.load_config()
+            if not config:
+                print(Messages.MSG_ERROR_NO_CONFIG)
+                return False
+            db_path = db_path or config["db_path"]
+            days = days if days is not None else config.get("retention_days")
+        if days is None:
+            print(Messages.MSG_ERROR_NO_RETENTION)
+            return False
+
+        try:
+            size_before = self._db_size(self._require_db(db_path))
+            with Database(db_path) as db:
+                deleted = Compactor(db, int(days)).run_once()
+                if vacuum:
+                    db.vacuum()
+            size_after = self._db_size(db_path)
+        except Exception as e:
+            print(Messages.MSG_ERROR_GENERIC.format(e))
+            logger.error(f"Fehler beim Aufräumen: {e}")
+            return False
+
+        print(Messages.MSG_SUCCESS_COMPACT.format(
+            deleted, days, size_before / 1e6, size_after / 1e6))
+        return True
+
+    @staticmethod
+    def _require_db(db_path: str) -> str:
+        """Prüfe, dass die DB existiert (ein Tippfehler soll keine leere DB anlegen).
+
+        Raises:
+            TrackerError: Wenn die Datei fehlt
+        """
+        if not Path(db_path).exists():
+            raise TrackerError(f"Datenbank nicht gefunden: {db_path}")
+        return db_path
+
+    @staticmethod
+    def _db_size(db_path: str) -> int:
+        """Größe der DB-Datei in Bytes (0 falls noch nicht vorhanden)."""
+        path = Path(db_path)
+        return path.stat().st_size if path.exists() else 0
+
+    @staticmethod
+    def _format_duration(seconds: int) -> str:
+        """Sekunden als ``12h 05m``."""
+        hours, minutes = divmod(int(seconds) // 60, 60)
+        return f"{hours}h {minutes:02d}m"
+
     def cmd_settings(self) -> None:
         """Bearbeite Settings (App-Management + Autostart)."""
         config = self.load_config()
@@ -466,8 +683,7 @@ class TimeTrackerApp:
             return
         
         try:
-            tracker = AppTracker(self.config_path)
-            tracker.start_monitoring()
+            self._monitor(config)
         except Exception as e:
             logger.error(f"Fehler im Autostart-Mode: {e}", exc_info=True)
     
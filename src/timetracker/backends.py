@@ -0,0 +1,376 @@
+"""Plattform-Backends (Prozess-Metadaten, Fokus-Quellen, Exit-Events) für TimeTracker."""
+
+import os
+import select
+import sys
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .foreground import (
+    ForegroundSource,
+    PollingForegroundSource,
+    WinEventForegroundSource,
+    X11ForegroundSource,
+)
+from .logger_config import setup_logger
+from .process_table import ProcessInfo, psutil_snapshot
+from .scheduler import IdleDetector, WindowsIdleDetector
+
+logger = setup_logger(__name__)
+
+ExitCallback = Callable[[ProcessInfo], None]
+
+
+class ExitWatcher:
+    """Schnittstelle für Exit-Benachrichtigungen einzelner Prozesse.
+
+    Beobachtete Prozesse melden ihr Ende über den Callback, ohne dass
+    die Prozessliste dafür erneut gescannt werden muss.
+    """
+
+    def start(self, callback: ExitCallback) -> None:
+        """Starte die Überwachung.
+
+        Args:
+            callback: Wird (aus einem Hintergrund-Thread) pro beendetem
+                Prozess aufgerufen
+        """
+
+    def watch(self, info: ProcessInfo) -> None:
+        """Beobachte einen Prozess bis zu seinem Ende."""
+
+    def stop(self) -> None:
+        """Beende die Überwachung und gib alle Handles frei."""
+
+
+class PidfdExitWatcher(ExitWatcher):
+    """Exit-Benachrichtigung über ``pidfd_open`` + ``epoll`` (Linux ≥ 5.3).
+
+    Ein pidfd wird lesbar, sobald der Prozess beendet ist. Ein einzelner
+    Thread blockiert in ``epoll.poll()`` und wacht nur bei Exits auf.
+    """
+
+    def __init__(self, create_time_fn: Callable[[int], Optional[float]]) -> None:
+        """Initialisiere den Watcher.
+
+        Args:
+            create_time_fn: Liefert die create_time einer PID (Schutz vor
+                PID-Wiederverwendung zwischen Snapshot und pidfd_open)
+        """
+        self._create_time_fn = create_time_fn
+        self._callback: Optional[ExitCallback] = None
+        self._epoll: Optional[select.epoll] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._by_fd: Dict[int, ProcessInfo] = {}
+        self._watched_pids: Dict[int, int] = {}  # pid → fd
+        self._wake_r, self._wake_w = -1, -1
+
+    @staticmethod
+    def is_supported() -> bool:
+        """Prüfe ob der Kernel pidfd_open unterstützt."""
+        if not hasattr(os, "pidfd_open"):
+            return False
+        try:
+            os.close(os.pidfd_open(os.getpid()))
+            return True
+        except OSError:
+            return False
+
+    def start(self, callback: ExitCallback) -> None:
+        """Starte den epoll-Thread."""
+        self._callback = callback
+        self._epoll = select.epoll()
+        self._wake_r, self._wake_w = os.pipe()
+        self._epoll.register(self._wake_r, select.EPOLLIN)
+
+        self._thread = threading.Thread(target=self._run, name="PidfdWatcher", daemon=True)
+        self._thread.start()
+
+    def watch(self, info: ProcessInfo) -> None:
+        """Öffne einen pidfd für den Prozess und registriere ihn bei epoll."""
+        if self._epoll is None or info.pid in self._watched_pids:
+            return
+
+        try:
+            fd = os.pidfd_open(info.pid)
+        except ProcessLookupError:
+            self._notify(info)
+            return
+        except OSError as e:
+            logger.debug(f"pidfd_open({info.pid}) fehlgeschlagen: {e}")
+            return
+
+        # PID könnte seit dem Snapshot an einen anderen Prozess vergeben sein
+        if self._create_time_fn(info.pid) != info.create_time:
+            os.close(fd)
+            self._notify(info)
+            return
+
+        with self._lock:
+            self._by_fd[fd] = info
+            self._watched_pids[info.pid] = fd
+        # epoll_ctl ist auch während eines laufenden epoll_wait erlaubt
+        self._epoll.register(fd, select.EPOLLIN)
+
+    def _run(self) -> None:
+        """Warte auf lesbare pidfds (= beendete Prozesse)."""
+        while True:
+            try:
+                events = self._epoll.poll()
+            except InterruptedError:
+                continue
+
+            for fd, _ in events:
+                if fd == self._wake_r:
+                    return
+
+                with self._lock:
+                    info = self._by_fd.pop(fd, None)
+                    if info is not None:
+                        self._watched_pids.pop(info.pid, None)
+                self._epoll.unregister(fd)
+                os.close(fd)
+
+                if info is not None:
+                    self._notify(info)
+
+    def _notify(self, info: ProcessInfo) -> None:
+        """Melde einen beendeten Prozess."""
+        if self._callback is not None:
+            self._callback(info)
+
+    def stop(self) -> None:
+        """Wecke den Thread auf, beende ihn und schließe alle pidfds."""
+        if self._thread is None:
+            return
+
+        os.write(self._wake_w, b"\0")
+        self._thread.join()
+        self._thread = None
+
+        with self._lock:
+            for fd in self._by_fd:
+                os.close(fd)
+            self._by_fd.clear()
+            self._watched_pids.clear()
+
+        self._epoll.close()
+        os.close(self._wake_r)
+        os.close(self._wake_w)
+        self._epoll = None
+
+
+class PlatformBackend:
+    """Generisches Backend auf Basis von psutil (ohne Fokus-Erkennung).
+
+    Plattform-spezifische Backends überschreiben einzelne Methoden.
+    """
+
+    name = "generic"
+
+    def snapshot(self) -> List[ProcessInfo]:
+        """Liefere alle laufenden Prozesse für die ProcessTable."""
+        return psutil_snapshot()
+
+    def process_details(self, pid: int) -> Tuple[Optional[str], Optional[str]]:
+        """Ermittle Name und Pfad eines Prozesses.
+
+        Args:
+            pid: Prozess-ID
+
+        Returns:
+            Tuple: (name, exe), jeweils None wenn nicht ermittelbar
+        """
+        import psutil
+
+        try:
+            process = psutil.Process(pid)
+            name = process.name()
+        except (psutil.NoSuchProcess, psutil.AccessDenied, ValueError):
+            return None, None
+
+        # exe() scheitert z.B. bei Prozessen mit höheren Rechten,
+        # der Name reicht dann trotzdem für den Abgleich
+        try:
+            return name, process.exe()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return name, None
+
+    def create_time(self, pid: int) -> Optional[float]:
+        """Ermittle die aktuelle create_time einer PID (live, nicht aus dem Snapshot).
+
+        Args:
+            pid: Prozess-ID
+
+        Returns:
+            Optional[float]: Epoch-Sekunden, None wenn beendet oder nicht lesbar
+        """
+        import psutil
+
+        try:
+            return psutil.Process(pid).create_time()
+        except (psutil.NoSuchProcess, psutil.AccessDenied, ValueError):
+            return None
+
+    def create_foreground_source(self) -> ForegroundSource:
+        """Erstelle die bevorzugte Fokus-Quelle."""
+        return ForegroundSource()
+
+    def create_polling_source(self) -> ForegroundSource:
+        """Erstelle die Polling-Quelle (Fallback)."""
+        return ForegroundSource()
+
+    def create_exit_watcher(self) -> Optional[ExitWatcher]:
+        """Erstelle einen Exit-Watcher, falls die Plattform einen hat."""
+        return None
+
+    def create_idle_detector(self) -> IdleDetector:
+        """Erstelle die Idle-Erkennung (Standard: keine)."""
+        return IdleDetector()
+
+
+class WindowsBackend(PlatformBackend):
+    """Windows: psutil für Prozesse, WinEvent-Hook bzw. pywin32 für den Fokus."""
+
+    name = "windows"
+
+    def create_foreground_source(self) -> ForegroundSource:
+        """WinEvent-Hook für EVENT_SYSTEM_FOREGROUND."""
+        return WinEventForegroundSource()
+
+    def create_polling_source(self) -> ForegroundSource:
+        """Polling über GetForegroundWindow."""
+        return PollingForegroundSource()
+
+    def create_idle_detector(self) -> IdleDetector:
+        """Letzte Eingabe und Bildschirmsperre über user32."""
+        try:
+            return WindowsIdleDetector()
+        except (AttributeError, OSError) as e:
+            logger.info(f"Idle-Erkennung nicht verfügbar: {e}")
+            return IdleDetector()
+
+
+class LinuxBackend(PlatformBackend):
+    """Linux: Prozess-Metadaten direkt aus ``/proc``, Exits über pidfd.
+
+    Der Fokus wird unter X11 über ``xprop`` ermittelt (ohne X11 gibt es
+    keinen Fokus, Prozesse und Exits funktionieren trotzdem).
+    """
+
+    name = "linux"
+    PROC = "/proc"
+    # Kernel kürzt comm auf 15 Zeichen (TASK_COMM_LEN - 1)
+    COMM_MAX = 15
+
+    def __init__(self) -> None:
+        """Lies Boot-Zeit und Clock-Ticks einmalig für create_time."""
+        self._clock_ticks = os.sysconf("SC_CLK_TCK")
+        self._boot_time = self._read_boot_time()
+
+    def _read_boot_time(self) -> float:
+        """Lies die Boot-Zeit (Epoch-Sekunden) aus /proc/stat."""
+        with open(f"{self.PROC}/stat", "rb") as f:
+            for line in f:
+                if line.startswith(b"btime"):
+                    return float(line.split()[1])
+        return 0.0
+
+    def _read_stat(self, pid: int) -> Optional[Tuple[str, float]]:
+        """Lies comm und create_time aus /proc/<pid>/stat."""
+        try:
+            with open(f"{self.PROC}/{pid}/stat", "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+
+        # comm kann Leerzeichen und Klammern enthalten → letzte ")" suchen
+        lpar = data.find(b"(")
+        rpar = data.rfind(b")")
+        comm = data[lpar + 1:rpar].decode("utf-8", "replace")
+        # Feld 22 (starttime); nach ")" beginnt die Zählung bei Feld 3
+        starttime = int(data[rpar + 2:].split()[19])
+        return comm, self._boot_time + starttime / self._clock_ticks
+
+    def _read_exe(self, pid: int) -> Optional[str]:
+        """Lies den Pfad der ausführbaren Datei (None ohne Berechtigung)."""
+        try:
+            return os.readlink(f"{self.PROC}/{pid}/exe")
+        except OSError:
+            return None
+
+    def _full_name(self, pid: int, comm: str) -> str:
+        """Ergänze einen vom Kernel gekürzten comm über exe bzw. cmdline."""
+        if len(comm) < self.COMM_MAX:
+            return comm
+
+        exe = self._read_exe(pid)
+        if exe:
+            base = os.path.basename(exe)
+            if base.startswith(comm):
+                return base
+
+        try:
+            with open(f"{self.PROC}/{pid}/cmdline", "rb") as f:
+                arg0 = f.read().split(b"\0", 1)[0].decode("utf-8", "replace")
+            base = os.path.basename(arg0)
+            if base.startswith(comm):
+                return base
+        except OSError:
+            pass
+        return comm
+
+    def create_time(self, pid: int) -> Optional[float]:
+        """create_time einer PID aus /proc (None wenn beendet)."""
+        stat = self._read_stat(pid)
+        return stat[1] if stat else None
+
+    def snapshot(self) -> List[ProcessInfo]:
+        """Scanne /proc einmal und liefere alle Prozesse."""
+        snapshot = []
+        for entry in os.listdir(self.PROC):
+            if not entry.isdigit():
+                continue
+            pid = int(entry)
+            stat = self._read_stat(pid)
+            if stat is None:
+                continue
+            comm, create_time = stat
+            snapshot.append(ProcessInfo(pid, self._full_name(pid, comm).lower(), create_time))
+        return snapshot
+
+    def process_details(self, pid: int) -> Tuple[Optional[str], Optional[str]]:
+        """Name und Pfad aus /proc."""
+        stat = self._read_stat(pid)
+        if stat is None:
+            return None, None
+        return self._full_name(pid, stat[0]), self._read_exe(pid)
+
+    def create_foreground_source(self) -> ForegroundSource:
+        """Event-getriebene X11-Quelle (``xprop -spy``)."""
+        return X11ForegroundSource(spy=True)
+
+    def create_polling_source(self) -> ForegroundSource:
+        """X11-Quelle im Polling-Modus."""
+        return X11ForegroundSource(spy=False)
+
+    def create_exit_watcher(self) -> Optional[ExitWatcher]:
+        """pidfd-Watcher, falls der Kernel pidfd_open unterstützt."""
+        if PidfdExitWatcher.is_supported():
+            return PidfdExitWatcher(self.create_time)
+        logger.info("pidfd_open nicht verfügbar – Exits nur per Snapshot")
+        return None
+
+
+def get_backend() -> PlatformBackend:
+    """Wähle das Backend für die aktuelle Plattform.
+
+    Returns:
+        PlatformBackend: Windows-, Linux- oder generisches Backend
+    """
+    if sys.platform == "win32":
+        return WindowsBackend()
+    if sys.platform.startswith("linux"):
+        return LinuxBackend()
+    return PlatformBackend()
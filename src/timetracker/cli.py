@@ -0,0 +1,102 @@
+"""Kommandozeile für TimeTracker.
+
+Ohne Unterbefehl startet das interaktive Menü (bzw. mit ``--autostart``
+das stille Tracking), Unterbefehle wie ``export``, ``report`` oder ``compact`` laufen ohne Menü.
+"""
+
+import argparse
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+from .config import AUTOSTART_PARAM, CONFIG_PATH, EXPORT_FORMATS, PROFILE_PARAM, REPORT_BUCKETS
+
+
+def _parse_time(value: str) -> datetime:
+    """ISO-Datum oder -Zeitpunkt (lokale Zeit), z.B. ``2026-10-01`` oder ``2026-10-01T08:00``."""
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Ungültiges Datum: {value!r} (erwartet ISO-Format)")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Erstelle den Argument-Parser mit allen Unterbefehlen."""
+    parser = argparse.ArgumentParser(
+        prog="timetracker",
+        description="Automatische App-Nutzungsüberwachung.",
+    )
+    parser.add_argument(AUTOSTART_PARAM, action="store_true",
+                        help="Still im Hintergrund tracken (Windows-Autostart)")
+    parser.add_argument(PROFILE_PARAM, action="store_true",
+                        help="Monitoring mit Sampling-Profiler und tracemalloc")
+    parser.add_argument("--config", type=Path, default=CONFIG_PATH,
+                        help="Pfad zur config.json")
+
+    commands = parser.add_subparsers(dest="command", metavar="BEFEHL")
+
+    export = commands.add_parser("export", help="Roh-Sessions exportieren")
+    export.add_argument("output", help="Zieldatei oder - für stdout")
+    export.add_argument("--format", choices=EXPORT_FORMATS,
+                        help="Format (Standard: aus der Dateiendung, sonst csv)")
+    export.add_argument("--since", type=_parse_time,
+                        help="Nur Sessions, die ab diesem Zeitpunkt begonnen haben")
+    export.add_argument("--until", type=_parse_time,
+                        help="Nur Sessions, die vor diesem Zeitpunkt begonnen haben")
+    export.add_argument("--app", action="append", dest="apps", metavar="APP",
+                        help="Nur diese App (mehrfach angebbar)")
+    export.add_argument("--batch-size", type=int,
+                        help="Zeilen pro Datenbank-Batch")
+    export.add_argument("--db", help="Datenbank (Standard: db_path aus der Config)")
+
+    report = commands.add_parser("report", help="Fokus-/Gesamtzeit pro Zeit-Bucket")
+    report.add_argument("--bucket", choices=REPORT_BUCKETS, default="day",
+                        help="Bucket-Größe (Standard: day)")
+    report.add_argument("--since", type=_parse_time,
+                        help="Beginn (Standard: vor 7 Tagen)")
+    report.add_argument("--until", type=_parse_time, help="Ende, exklusiv (Standard: jetzt)")
+    report.add_argument("--app", action="append", dest="apps", metavar="APP",
+                        help="Nur diese App (Standard: Apps aus der Config)")
+    report.add_argument("--db", help="Datenbank (Standard: db_path aus der Config)")
+
+    compact = commands.add_parser("compact", help="Abgelaufene Roh-Sessions löschen")
+    compact.add_argument("--days", type=int,
+                         help="Aufbewahrung in Tagen (Standard: retention_days aus der Config)")
+    compact.add_argument("--vacuum", action="store_true",
+                         help="DB danach einmalig neu aufbauen (bestehende DBs auf "
+                              "auto_vacuum=INCREMENTAL umstellen)")
+    compact.add_argument("--db", help="Datenbank (Standard: db_path aus der Config)")
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Werte die Argumente aus und führe den Befehl aus.
+
+    Args:
+        argv: Argumente ohne Programmnamen (Standard: sys.argv)
+
+    Returns:
+        int: Exit-Code
+    """
+    args = build_parser().parse_args(argv)
+
+    from .app import TimeTrackerApp
+
+    app = TimeTrackerApp(args.config)
+    app.autostart_mode = args.autostart
+    app.profile_mode = args.profile
+
+    if args.command == "export":
+        ok = app.cmd_export(args.output, args.format, args.since, args.until,
+                            args.apps, args.batch_size, args.db)
+        return 0 if ok else 1
+    if args.command == "report":
+        ok = app.cmd_report(args.since, args.until, args.bucket, args.apps, args.db)
+        return 0 if ok else 1
+    if args.command == "compact":
+        ok = app.cmd_compact(args.days, args.vacuum, args.db)
+        return 0 if ok else 1
+
+    app.run()
+    return 0
@@ -15,9 +15,6 @@ else:
 SRC_DIR = BASE_DIR / "src"
 DATA_DIR = BASE_DIR / "data"
 
-# Stelle sicher, dass data/ existiert (inkl. übergeordnete Ordner)
-DATA_DIR.mkdir(parents=True, exist_ok=True)
-
 CONFIG_PATH = DATA_DIR / "config.json"
 DB_PATH = DATA_DIR / "tracker.db"
 LOG_PATH = DATA_DIR / "tracker.log"
@@ -29,13 +26,115 @@ DEFAULT_CONFIG = {
     "check_interval": 0.5,
 }
 
+# ========== DATENBANK ==========
+# Wartezeit (Sekunden), bevor ein gesperrter Zugriff mit Fehler abbricht
+DB_BUSY_TIMEOUT = 5.0
+# Anzahl vorbereiteter Statements, die pro Verbindung gecacht werden
+DB_STATEMENT_CACHE = 64
+# Zeilen pro Transaktion beim Umkopieren großer Tabellen (Schema-Migration)
+MIGRATION_BATCH_SIZE = 50_000
+
+# ========== EXPORT ==========
+# Zeilen pro fetchmany()-Batch beim Export (bestimmt den Speicherbedarf)
+EXPORT_BATCH_SIZE = 10_000
+# Unterstützte Formate (parquet/arrow nur mit installiertem pyarrow)
+EXPORT_FORMATS = ("csv", "jsonl", "parquet", "arrow")
+
+# ========== ANALYTICS ==========
+# Spalten-Cache (numpy .npz) neben der Datenbank, z.B. tracker.analytics.npz
+ANALYTICS_CACHE_SUFFIX = ".analytics.npz"
+
+# ========== REPORTS ==========
+# Bucket-Größen für Zeitraum-Reports (lokale Zeit)
+REPORT_BUCKETS = ("hour", "weekday", "day", "week", "month")
+# Standard-Zeitraum (Tage bis einschließlich heute) ohne --since
+REPORT_DEFAULT_DAYS = 7
+
+# ========== AUFBEWAHRUNG ==========
+# Roh-Sessions älter als config "retention_days" werden gelöscht (ohne
+# Eintrag: unbegrenzt); die Tages-/Stunden-Rollups bleiben dauerhaft
+# Abstand (Sekunden) zwischen zwei Durchläufen im Hintergrund
+RETENTION_INTERVAL = 6 * 3600.0
+# Wartezeit (Sekunden) nach dem Start bis zum ersten Durchlauf
+RETENTION_START_DELAY = 60.0
+# Max. gelöschte Sessions pro Transaktion (begrenzt die Schreibsperre)
+RETENTION_BATCH_SIZE = 1000
+# Pause (Sekunden) zwischen zwei Batches, damit der Writer dazwischenkommt
+RETENTION_BATCH_PAUSE = 0.05
+# Max. freigegebene Seiten pro incremental_vacuum-Schritt
+RETENTION_VACUUM_PAGES = 256
+
+# ========== SESSION-WRITER ==========
+# Max. Sessions pro Transaktion (Group Commit)
+WRITER_BATCH_SIZE = 50
+# Max. Wartezeit (Sekunden), bis ein angefangener Batch geschrieben wird
+WRITER_FLUSH_INTERVAL = 1.0
+# Größe der Warteschlange; bei Überlauf wird direkt ausgelagert
+WRITER_QUEUE_SIZE = 1000
+# Abstand (Sekunden) der Wiederholungsversuche bei nicht erreichbarer DB
+WRITER_RETRY_INTERVAL = 30.0
+
+# ========== CHECKPOINTS ==========
+# Abstand (Sekunden), in dem offene Sessions ins Journal geschrieben werden
+CHECKPOINT_INTERVAL = 10.0
+# Max. Anzahl gleichzeitig offener Sessions im Journal
+CHECKPOINT_SLOTS = 64
+
+# ========== APP-ABGLEICH ==========
+# Max. Anzahl gecachter Match-Entscheidungen (pro Prozess)
+MATCHER_CACHE_SIZE = 1024
+# Max. Anzahl gecachter Prozess-Metadaten (Name, Pfad) pro PID
+PID_CACHE_SIZE = 256
+
 # ========== AUTOSTART ==========
 AUTOSTART_PARAM = "--autostart"
 
 # ========== LOGGING ==========
 LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 LOG_LEVEL = "INFO"
+# Log-Datei wird ab dieser Größe (Bytes) rotiert, ältere Dateien: .1 … .N
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 3
 
 # ========== VALIDIERUNG ==========
 MIN_CHECK_INTERVAL = 0.1
 MAX_CHECK_INTERVAL = 5.0
+
+# ========== MONITORING ==========
+# Bei event-getriebenem Fokus ohne offene Sessions wird die Prozesstabelle
+# nur in diesem Abstand (Sekunden) aktualisiert. Mit offenen Sessions und
+# ohne Exit-Watcher gilt check_interval (bestimmt die Genauigkeit der Endzeit)
+LIVENESS_INTERVAL = 5.0
+# Mit Exit-Benachrichtigung (z.B. pidfd) nur noch als Sicherheitsnetz
+LIVENESS_INTERVAL_WATCHED = 60.0
+# Abstand (Sekunden), in dem die asyncio-Engine einen Zwischenstand loggt
+REPORT_INTERVAL = 60.0
+
+# ========== METRIKEN ==========
+# Abstand (Sekunden), in dem die Metrik-Datei (config: metrics_file) aktualisiert wird
+METRICS_FLUSH_INTERVAL = 15.0
+
+# ========== PROFILING ==========
+# Kommandozeilen-Flag (alternativ config: "profile": true)
+PROFILE_PARAM = "--profile"
+# Zielordner der Profil-Dumps
+PROFILE_DIR = DATA_DIR / "profiles"
+# Abstand (Sekunden) zwischen zwei Stack-Samples (10 Hz: für Dauerbetrieb geeignet)
+PROFILE_SAMPLE_INTERVAL = 0.1
+# Abstand (Sekunden), in dem ein Dump geschrieben wird
+PROFILE_DUMP_INTERVAL = 3600.0
+# Anzahl aufbewahrter Dumps (ältere werden gelöscht)
+PROFILE_KEEP = 24
+# Stack-Tiefe, die tracemalloc pro Allokation speichert (1 = geringster Overhead)
+PROFILE_TRACEMALLOC_FRAMES = 1
+# Einträge pro Top-Liste im Dump
+PROFILE_TOP_N = 25
+
+# ========== ADAPTIVES POLLING ==========
+# Faktor, um den das Polling-Intervall pro Tick mit stabilem Fokus wächst
+# (von check_interval bis MAX_CHECK_INTERVAL)
+CHECK_INTERVAL_BACKOFF = 1.5
+# Ab so vielen Sekunden ohne Eingabe gilt der Benutzer als inaktiv
+IDLE_THRESHOLD = 300.0
+# Polling-Intervall (Sekunden) bei Inaktivität oder gesperrtem Bildschirm
+IDLE_CHECK_INTERVAL = 30.0
@@ -1,150 +1,629 @@
 """SQLite Datenbank-Operationen für TimeTracker."""
 
+import contextlib
 import sqlite3
-from datetime import datetime
-from typing import Optional, Tuple
+import threading
+from datetime import date, datetime
+import json
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
 from pathlib import Path
 
+from .config import DB_BUSY_TIMEOUT, DB_STATEMENT_CACHE, EXPORT_BATCH_SIZE
 from .exceptions import DatabaseError
 from .logger_config import setup_logger
+from .metrics import REGISTRY
+from .migrations import SCHEMA_VERSION, migrate, schema_version
 
 logger = setup_logger(__name__)
 
+# ========== SQL ==========
+# Feste Statement-Texte, damit der Statement-Cache von sqlite3 greift.
+# Schema und Rollup-Trigger: siehe migrations.py. Zeiten liegen als
+# Unix-Epoch in ms (UTC) vor, day/hour sind lokales Datum (Tage seit
+# 1970-01-01) und lokale Stunde des Starts. App-Namen und -Pfade stehen
+# einmal in apps/app_paths, Sessions und Rollups verweisen per ID.
+SQL_INSERT_SESSION = """
+    INSERT INTO app_sessions
+    (app_id, path_id, start_ms, end_ms,
+    duration_seconds, total_duration_seconds, day, hour)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Bereits gespeicherte Sessions (gleiche App, gleicher Start und Ende)
+# überspringen; die Rollup-Trigger feuern dafür nicht
+SQL_INSERT_SESSION_OR_IGNORE = """
+    INSERT OR IGNORE INTO app_sessions
+    (app_id, path_id, start_ms, end_ms,
+    duration_seconds, total_duration_seconds, day, hour)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# ID einer App bzw. eines Pfads (für den Intern-Cache)
+SQL_SELECT_APP_ID = "SELECT id FROM apps WHERE name = ?"
+SQL_INSERT_APP = "INSERT INTO apps (name) VALUES (?)"
+SQL_SELECT_PATH_ID = "SELECT id FROM app_paths WHERE path = ?"
+SQL_INSERT_PATH = "INSERT INTO app_paths (path) VALUES (?)"
+
+SQL_STATS_TODAY = """
+    SELECT
+        COALESCE(SUM(opens), 0) as opens,
+        SUM(focus_seconds) as focus_seconds,
+        SUM(total_seconds) as total_seconds,
+        CAST(SUM(focus_seconds) AS REAL) / SUM(opens) as avg_focus_seconds
+    FROM app_daily_stats
+    WHERE app_id = (SELECT id FROM apps WHERE name = ?) AND date = DATE('now')
+"""
+
+SQL_STATS_ALL_TIME = """
+    SELECT
+        COALESCE(SUM(opens), 0) as opens,
+        SUM(focus_seconds) as focus_seconds,
+        SUM(total_seconds) as total_seconds,
+        MIN(first_start) as first_use
+    FROM app_daily_stats
+    WHERE app_id = (SELECT id FROM apps WHERE name = ?)
+"""
+
+# Heute und Gesamt für beliebig viele Apps in einem GROUP BY-Durchlauf.
+# Die App-Liste kommt als JSON-Array, damit der Statement-Text (und damit
+# das vorbereitete Statement) unabhängig von der Anzahl Apps gleich bleibt.
+SQL_STATS_BULK = """
+    SELECT
+        apps.name,
+        SUM(CASE WHEN date = DATE('now') THEN opens ELSE 0 END) as today_opens,
+        SUM(CASE WHEN date = DATE('now') THEN focus_seconds END) as today_focus,
+        SUM(CASE WHEN date = DATE('now') THEN total_seconds END) as today_total,
+        SUM(opens) as opens,
+        SUM(focus_seconds) as focus_seconds,
+        SUM(total_seconds) as total_seconds,
+        MIN(first_start) as first_use
+    FROM apps
+    JOIN app_daily_stats ON app_daily_stats.app_id = apps.id
+    WHERE apps.name IN (SELECT value FROM json_each(?))
+    GROUP BY app_daily_stats.app_id
+"""
+
+# Epoch-ms → lokaler ISO-Text ('YYYY-MM-DD HH:MM:SS', Millisekunden nur falls ≠ 0)
+_LOCAL_TIME = (
+    "strftime('%Y-%m-%d %H:%M:%S', {0} / 1000, 'unixepoch', 'localtime')"
+    " || CASE WHEN {0} % 1000 THEN printf('.%03d', {0} % 1000) ELSE '' END"
+)
+
+# Rohe Sessions für den Export, in Einfügereihenfolge (Rowid, ohne Sortierung),
+# Zeiten als lokaler Text, date = lokales Datum des Starts.
+# Nicht gesetzte Filter (NULL) gelten als erfüllt, der Statement-Text bleibt fest.
+SQL_EXPORT_SESSIONS = f"""
+    SELECT
+        s.id, apps.name, app_paths.path,
+        {_LOCAL_TIME.format("s.start_ms")},
+        {_LOCAL_TIME.format("s.end_ms")},
+        s.duration_seconds, s.total_duration_seconds,
+        date(s.day * 86400, 'unixepoch')
+    FROM app_sessions s
+    JOIN apps ON apps.id = s.app_id
+    LEFT JOIN app_paths ON app_paths.id = s.path_id
+    WHERE (?1 IS NULL OR s.start_ms >= ?1)
+      AND (?2 IS NULL OR s.start_ms < ?2)
+      AND (?3 IS NULL OR apps.name IN (SELECT value FROM json_each(?3)))
+    ORDER BY s.id
+"""
+
+# Ältester Batch abgelaufener Roh-Sessions, nur über den Index auf start_ms
+SQL_DELETE_EXPIRED_SESSIONS = """
+    DELETE FROM app_sessions
+    WHERE id IN (
+        SELECT id FROM app_sessions
+        WHERE start_ms < ?1
+        ORDER BY start_ms
+        LIMIT ?2
+    )
+"""
+
+# Spaltennamen zu SQL_EXPORT_SESSIONS
+EXPORT_COLUMNS = (
+    "id", "app_name", "app_path", "start_time", "end_time",
+    "duration_seconds", "total_duration_seconds", "date",
+)
+
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def to_epoch_ms(moment: datetime) -> int:
+    """Zeitpunkt als Unix-Epoch in Millisekunden (naive Zeitpunkte = lokale Zeit)."""
+    return round(moment.timestamp() * 1000)
+
+
+class AppStats(NamedTuple):
+    """Heute- und Gesamtstatistik einer App (Format wie get_stats_today/-all_time)."""
+
+    today: Tuple[int, Optional[int], Optional[int], Optional[float]]
+    all_time: Tuple[int, Optional[int], Optional[int], Optional[str]]
+
+
+class SessionRecord(NamedTuple):
+    """Eine abgeschlossene Session, wie sie in app_sessions landet."""
+
+    app_name: str
+    app_path: Optional[str]
+    start_time: datetime
+    end_time: datetime
+    focus_duration: int
+    total_duration: int
+
+    def to_row(self, app_id: int, path_id: Optional[int]) -> tuple:
+        """Parameter für SQL_INSERT_SESSION (Epoch-ms, lokales Datum und Stunde)."""
+        local = self.start_time.astimezone() if self.start_time.tzinfo else self.start_time
+        return (
+            app_id, path_id,
+            to_epoch_ms(self.start_time), to_epoch_ms(self.end_time),
+            self.focus_duration, self.total_duration,
+            local.toordinal() - _EPOCH_ORDINAL, local.hour,
+        )
+
+
+class _InternCache:
+    """In-Process-Cache Text → ID für eine Lookup-Tabelle (apps, app_paths).
+
+    Treffer kosten keinen DB-Zugriff. Unbekannte Werte werden in der
+    laufenden Schreib-Transaktion nachgeschlagen bzw. angelegt und gelten
+    erst nach deren Commit als gesichert.
+    """
+
+    def __init__(self, select_sql: str, insert_sql: str) -> None:
+        self._select_sql = select_sql
+        self._insert_sql = insert_sql
+        self._ids: Dict[str, int] = {}
+        # In der laufenden Transaktion aufgelöst, bei Rollback verworfen
+        self._pending: Dict[str, int] = {}
+
+    def resolve(self, conn: sqlite3.Connection, value: Optional[str]) -> Optional[int]:
+        """ID zu ``value`` (None bleibt None); nur unter der Schreibsperre aufrufen."""
+        if value is None:
+            return None
+        value_id = self._ids.get(value) or self._pending.get(value)
+        if value_id is None:
+            row = conn.execute(self._select_sql, (value,)).fetchone()
+            value_id = row[0] if row else conn.execute(self._insert_sql, (value,)).lastrowid
+            self._pending[value] = value_id
+        return value_id
+
+    def commit(self) -> None:
+        self._ids.update(self._pending)
+        self._pending.clear()
+
+    def rollback(self) -> None:
+        self._pending.clear()
+
 
 class Database:
-    """Verwaltet SQLite-Datenbankoperationen."""
-    
-    def __init__(self, db_path: str | Path) -> None:
+    """Verwaltet SQLite-Datenbankoperationen.
+
+    Hält eine langlebige Schreib- und eine separate Lese-Verbindung. Im
+    WAL-Modus blockieren sich Statistik-Abfragen und das Logging des
+    laufenden Trackers dadurch nicht gegenseitig.
+
+    Mit ``read_only=True`` (Export, Reports) wird nur die Lese-Verbindung
+    geöffnet: keine neue Datei, keine Migration, keine PRAGMA-Änderungen.
+    """
+
+    def __init__(self, db_path: str | Path, read_only: bool = False) -> None:
         """Initialisiere Datenbank.
-        
+
         Args:
             db_path: Pfad zur SQLite-Datenbankdatei
-            
+            read_only: Nur lesend öffnen (die DB muss existieren und
+                aktuell sein)
+
         Raises:
             DatabaseError: Wenn DB nicht initialisiert werden kann
         """
         self.db_path = Path(db_path)
+        self._writer: Optional[sqlite3.Connection] = None
+        self._reader: Optional[sqlite3.Connection] = None
+        # Verbindungen dürfen von mehreren Threads genutzt werden,
+        # aber jeweils nur von einem gleichzeitig
+        self._write_lock = threading.Lock()
+        self._read_lock = threading.Lock()
+        # App-Namen und -Pfade → ID, Inserts brauchen dafür keinen Roundtrip
+        self._app_ids = _InternCache(SQL_SELECT_APP_ID, SQL_INSERT_APP)
+        self._path_ids = _InternCache(SQL_SELECT_PATH_ID, SQL_INSERT_PATH)
         try:
+            if read_only:
+                self._reader = self._connect(read_only=True)
+                self._check_schema()
+                logger.info(f"Database (nur lesend) geöffnet: {self.db_path}")
+                return
             # Ensure parent dir exists (important for frozen executables)
             self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._writer = self._connect()
             self.init_db()
+            self._reader = self._connect(read_only=True)
             logger.info(f"Database initialisiert: {self.db_path}")
         except Exception as e:
+            self.close()
             logger.error(f"Fehler beim Initialisieren der DB: {e}")
             raise DatabaseError(f"DB-Initialisierung fehlgeschlagen: {e}")
-    
+
+    def _connect(self, read_only: bool = False) -> sqlite3.Connection:
+        """Öffne eine Verbindung mit WAL-tauglichen Einstellungen.
+
+        Args:
+            read_only: Verbindung nur lesend öffnen
+
+        Returns:
+            sqlite3.Connection: Offene Verbindung
+        """
+        if read_only:
+            # Autocommit: jede Abfrage ist ein eigener, kurzer Lese-Snapshot
+            conn = sqlite3.connect(
+                f"{self.db_path.resolve().as_uri()}?mode=ro",
+                uri=True,
+                timeout=DB_BUSY_TIMEOUT,
+                cached_statements=DB_STATEMENT_CACHE,
+                check_same_thread=False,
+                isolation_level=None,
+            )
+        else:
+            # IMMEDIATE: Schreibsperre gleich zu Beginn der Transaktion holen
+            conn = sqlite3.connect(
+                self.db_path,
+                timeout=DB_BUSY_TIMEOUT,
+                cached_statements=DB_STATEMENT_CACHE,
+                check_same_thread=False,
+                isolation_level="IMMEDIATE",
+            )
+            # Wirkt nur bei neuen DBs (vor der ersten Tabelle, auch vor WAL);
+            # bestehende DBs stellt die Migration auf Schema-Version 4 um
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            conn.execute("PRAGMA journal_mode=WAL")
+
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @REGISTRY.timed("db_init")
     def init_db(self) -> None:
-        """Erstelle Tabelle falls sie nicht existiert."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS app_sessions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                app_name TEXT NOT NULL,
-                app_path TEXT,
-                start_time DATETIME NOT NULL,
-                end_time DATETIME,
-                duration_seconds INTEGER,
-                total_duration_seconds INTEGER,
-                date DATE DEFAULT CURRENT_DATE
+        """Bringe das Schema per Migration auf den aktuellen Stand.
+
+        Neue DBs durchlaufen alle Migrationen, bestehende nur die fehlenden
+        (siehe migrations.py). Große Tabellen werden dabei batchweise
+        umkopiert; ein abgebrochener Lauf wird beim nächsten Öffnen
+        fortgesetzt.
+        """
+        with self._write_lock:
+            migrate(self._writer)
+
+    def _check_schema(self) -> None:
+        """Ohne Schreib-Verbindung kann nicht migriert werden: Version prüfen.
+
+        Raises:
+            DatabaseError: Bei einer anderen Schema-Version
+        """
+        version = schema_version(self._reader)
+        if version != SCHEMA_VERSION:
+            raise DatabaseError(
+                f"Schema-Version {version} statt {SCHEMA_VERSION} – "
+                f"DB einmal mit dem Tracker öffnen, um sie zu migrieren"
             )
-        """)
-        
-        conn.commit()
-        conn.close()
-    
+
+    def close(self) -> None:
+        """Schließe beide Verbindungen."""
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+        with self._read_lock:
+            if self._reader is not None:
+                self._reader.close()
+                self._reader = None
+
+    def __enter__(self) -> "Database":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @contextlib.contextmanager
+    def _transaction(self) -> Iterator[None]:
+        """Schreib-Transaktion unter der Schreibsperre.
+
+        Neu angelegte App-/Pfad-IDs übernimmt der Intern-Cache erst nach
+        dem Commit, bei einem Rollback werden sie verworfen.
+        """
+        with self._write_lock:
+            try:
+                with self._writer:
+                    yield
+            except BaseException:
+                self._app_ids.rollback()
+                self._path_ids.rollback()
+                raise
+            self._app_ids.commit()
+            self._path_ids.commit()
+
+    def _session_row(self, record: SessionRecord) -> tuple:
+        """Insert-Parameter einer Session (innerhalb von ``_transaction()``)."""
+        return record.to_row(self._app_ids.resolve(self._writer, record.app_name),
+                             self._path_ids.resolve(self._writer, record.app_path))
+
+    @REGISTRY.timed("db_log_session")
     def log_session(self, app_name: str, app_path: str,
                start_time: datetime, end_time: datetime,
                focus_duration: int, total_duration: int) -> None:
         """Speichere eine App-Session in der DB.
-        
+
         Args:
             app_name: Name der App (z.B. "notepad.exe")
             app_path: Voller Pfad zur App
             start_time: Startzeitpunkt
             end_time: Stoppzeitpunkt
-            
+
         Raises:
             DatabaseError: Wenn Speichern fehlschlägt
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                INSERT INTO app_sessions 
-                (app_name, app_path, start_time, end_time,
-                duration_seconds, total_duration_seconds, date)
-                VALUES (?, ?, ?, ?, ?, ?, DATE('now'))
-            """, (app_name, app_path, start_time, end_time,
-                focus_duration, total_duration))
-            
-            conn.commit()
-            conn.close()
-            
+            with self._transaction():
+                self._writer.execute(SQL_INSERT_SESSION, self._session_row(SessionRecord(
+                    app_name, app_path, start_time, end_time,
+                    focus_duration, total_duration)))
+
             logger.info(f"Session geloggt: {app_name} "
                         f"(focus={focus_duration}s, total={total_duration}s)")
         except Exception as e:
             logger.error(f"Fehler beim Speichern der Session: {e}")
             raise DatabaseError(f"Session konnte nicht geloggt werden: {e}")
-    
+
+    @REGISTRY.timed("db_log_sessions")
+    def log_sessions(self, records: Iterable[SessionRecord],
+                     skip_existing: bool = False) -> int:
+        """Speichere mehrere Sessions in einer einzigen Transaktion.
+
+        Args:
+            records: Zu speichernde Sessions
+            skip_existing: Bereits gespeicherte Sessions still überspringen
+                statt mit einem Fehler abzubrechen (Nachtragen aus
+                Auslagerung oder Checkpoint, das evtl. schon committet war)
+
+        Returns:
+            int: Anzahl neu gespeicherter Sessions
+
+        Raises:
+            DatabaseError: Wenn Speichern fehlschlägt (nichts wird gespeichert)
+        """
+        records = list(records)
+        try:
+            with self._transaction():
+                written = self._writer.executemany(
+                    SQL_INSERT_SESSION_OR_IGNORE if skip_existing else SQL_INSERT_SESSION,
+                    [self._session_row(record) for record in records],
+                ).rowcount
+
+            if written < len(records):
+                logger.info(f"{len(records) - written} bereits gespeicherte Session(s) übersprungen")
+            logger.debug(f"{written} Session(s) geloggt")
+            return written
+        except Exception as e:
+            logger.error(f"Fehler beim Speichern von {len(records)} Session(s): {e}")
+            raise DatabaseError(f"Sessions konnten nicht geloggt werden: {e}")
+
+    @REGISTRY.timed("db_get_stats_today")
     def get_stats_today(self, app_name: str) -> Optional[Tuple[int, int, int, float]]:
         """Hole Statistiken für heute.
-        
+
         Args:
             app_name: Name der App
-            
+
         Returns:
             Tuple: (opens, total_seconds, avg_seconds) oder None
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                SELECT 
-                    COUNT(*) as opens,
-                    SUM(duration_seconds) as focus_seconds,
-                    SUM(total_duration_seconds) as total_seconds,
-                    AVG(duration_seconds) as avg_focus_seconds
-                FROM app_sessions
-                WHERE app_name = ? AND date = DATE('now')
-            """, (app_name,))
-            
-            result = cursor.fetchone()
-            conn.close()
-            return result
+            with self._read_lock:
+                return self._reader.execute(SQL_STATS_TODAY, (app_name,)).fetchone()
         except Exception as e:
             logger.error(f"Fehler beim Abrufen der Heute-Stats: {e}")
             return None
-    
+
+    @REGISTRY.timed("db_get_stats_all_time")
     def get_stats_all_time(self, app_name: str) -> Optional[Tuple[int, int, int, str]]:
         """Hole Gesamtstatistiken.
-        
+
         Args:
             app_name: Name der App
-            
+
         Returns:
             Tuple: (opens, total_seconds, first_use_date) oder None
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                SELECT 
-                    COUNT(*) as opens,
-                    SUM(duration_seconds) as focus_seconds,
-                    SUM(total_duration_seconds) as total_seconds,
-                    MIN(start_time) as first_use
-                FROM app_sessions
-                WHERE app_name = ?
-            """, (app_name,))
-            
-            result = cursor.fetchone()
-            conn.close()
-            return result
+            with self._read_lock:
+                return self._reader.execute(SQL_STATS_ALL_TIME, (app_name,)).fetchone()
         except Exception as e:
             logger.error(f"Fehler beim Abrufen der Gesamt-Stats: {e}")
             return None
+
+    def iter_sessions(self, since: Optional[datetime] = None,
+                      until: Optional[datetime] = None,
+                      app_names: Optional[Sequence[str]] = None,
+                      batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[List[tuple]]:
+        """Streame Roh-Sessions in Batches (Spalten: ``EXPORT_COLUMNS``).
+
+        Nutzt eine eigene Lese-Verbindung, damit ein langer Export weder
+        Statistik-Abfragen noch den Tracker blockiert. Im Speicher liegt
+        immer nur ein Batch, unabhängig von der Tabellengröße.
+
+        Args:
+            since: Nur Sessions, die ab diesem Zeitpunkt begonnen haben
+            until: Nur Sessions, die vor diesem Zeitpunkt begonnen haben
+            app_names: Nur diese Apps (None = alle)
+            batch_size: Zeilen pro ``fetchmany()``
+
+        Yields:
+            List: Bis zu ``batch_size`` Zeilen
+
+        Raises:
+            DatabaseError: Wenn das Lesen fehlschlägt
+        """
+        params = (
+            to_epoch_ms(since) if since else None,
+            to_epoch_ms(until) if until else None,
+            json.dumps(list(app_names)) if app_names is not None else None,
+        )
+        return self.stream(SQL_EXPORT_SESSIONS, params, batch_size)
+
+    def stream(self, sql: str, params: Sequence = (),
+               batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[List[tuple]]:
+        """Streame das Ergebnis einer Leseabfrage in Batches.
+
+        Läuft auf einer eigenen, kurzlebigen Lese-Verbindung.
+
+        Args:
+            sql: SELECT-Statement
+            params: Parameter
+            batch_size: Zeilen pro ``fetchmany()``
+
+        Yields:
+            List: Bis zu ``batch_size`` Zeilen
+
+        Raises:
+            DatabaseError: Wenn das Lesen fehlschlägt
+        """
+        try:
+            conn = self._connect(read_only=True)
+        except Exception as e:
+            raise DatabaseError(f"Lese-Verbindung fehlgeschlagen: {e}")
+        try:
+            cursor = conn.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield rows
+        except sqlite3.Error as e:
+            logger.error(f"Fehler beim Lesen der Sessions: {e}")
+            raise DatabaseError(f"Sessions konnten nicht gelesen werden: {e}")
+        finally:
+            conn.close()
+
+    @REGISTRY.timed("db_delete_expired")
+    def delete_expired_sessions(self, cutoff: datetime, batch_size: int) -> int:
+        """Lösche einen Batch Roh-Sessions, die vor ``cutoff`` begonnen haben.
+
+        Die Rollups (app_daily_stats, app_hourly_stats) bleiben unverändert:
+        Sie werden beim Einfügen fortgeschrieben und enthalten die Sessions
+        bereits. Die Schreibsperre wird nur für einen Batch gehalten, die
+        Auswahl läuft über den Index auf start_ms.
+
+        Args:
+            cutoff: Sessions mit früherem Start werden gelöscht
+            batch_size: Max. Sessions pro Transaktion
+
+        Returns:
+            int: Anzahl gelöschter Sessions (0 = keine abgelaufenen mehr)
+
+        Raises:
+            DatabaseError: Wenn das Löschen fehlschlägt
+        """
+        try:
+            with self._write_lock, self._writer:
+                return self._writer.execute(
+                    SQL_DELETE_EXPIRED_SESSIONS, (to_epoch_ms(cutoff), batch_size)
+                ).rowcount
+        except sqlite3.Error as e:
+            logger.error(f"Fehler beim Löschen abgelaufener Sessions: {e}")
+            raise DatabaseError(f"Sessions konnten nicht gelöscht werden: {e}")
+
+    def incremental_vacuum(self, pages: int) -> int:
+        """Gib bis zu ``pages`` freie Seiten an das Dateisystem zurück.
+
+        Nur mit ``auto_vacuum=INCREMENTAL`` (ab Schema-Version 4 immer
+        gesetzt), sonst ohne Wirkung.
+
+        Args:
+            pages: Max. Seiten pro Aufruf (begrenzt die Dauer der Schreibsperre)
+
+        Returns:
+            int: Danach noch freie Seiten (0 ohne inkrementelles Vacuum)
+
+        Raises:
+            DatabaseError: Wenn das Vacuum fehlschlägt
+        """
+        try:
+            with self._write_lock:
+                if self._writer.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                    return 0
+                # executescript läuft bis zum Ende; execute() gäbe nur eine Seite frei
+                self._writer.executescript(f"PRAGMA incremental_vacuum({int(pages)})")
+                return self._writer.execute("PRAGMA freelist_count").fetchone()[0]
+        except sqlite3.Error as e:
+            logger.error(f"Fehler beim inkrementellen Vacuum: {e}")
+            raise DatabaseError(f"Vacuum fehlgeschlagen: {e}")
+
+    def vacuum(self) -> None:
+        """Baue die DB neu auf und stelle auf ``auto_vacuum=INCREMENTAL`` um.
+
+        Die Umstellung übernimmt bereits die Migration auf Schema-Version 4;
+        ein erneuter Aufruf gibt zusätzlich alle freien Seiten auf einmal
+        zurück. Sperrt die DB für die gesamte Dauer und ist daher nicht für
+        den laufenden Tracker gedacht.
+
+        Raises:
+            DatabaseError: Wenn das Vacuum fehlschlägt
+        """
+        try:
+            with self._write_lock:
+                self._writer.execute("PRAGMA auto_vacuum=INCREMENTAL")
+                self._writer.execute("VACUUM")
+            logger.info(f"Datenbank neu aufgebaut (auto_vacuum=INCREMENTAL): {self.db_path}")
+        except sqlite3.Error as e:
+            logger.error(f"Fehler beim Vacuum: {e}")
+            raise DatabaseError(f"Vacuum fehlgeschlagen: {e}")
+
+    def read(self, sql: str, params: Sequence = ()) -> List[tuple]:
+        """Führe eine Leseabfrage auf der Lese-Verbindung aus.
+
+        Für Auswertungsmodule (z.B. reports.py) mit eigenem SQL.
+
+        Args:
+            sql: SELECT-Statement (fester Text, damit der Statement-Cache greift)
+            params: Parameter
+
+        Returns:
+            List: Alle Ergebniszeilen
+
+        Raises:
+            DatabaseError: Wenn die Abfrage fehlschlägt
+        """
+        try:
+            with self._read_lock:
+                return self._reader.execute(sql, params).fetchall()
+        except sqlite3.Error as e:
+            logger.error(f"Fehler bei Leseabfrage: {e}")
+            raise DatabaseError(f"Abfrage fehlgeschlagen: {e}")
+
+    @REGISTRY.timed("db_get_stats_bulk")
+    def get_stats_bulk(self, app_names: List[str]) -> Dict[str, AppStats]:
+        """Hole Heute- und Gesamtstatistiken für mehrere Apps auf einmal.
+
+        Args:
+            app_names: Namen der Apps
+
+        Returns:
+            Dict: app_name → AppStats (Apps ohne Daten mit 0 Öffnungen),
+            leer bei Fehlern
+        """
+        try:
+            with self._read_lock:
+                rows = self._reader.execute(SQL_STATS_BULK, (json.dumps(app_names),)).fetchall()
+        except Exception as e:
+            logger.error(f"Fehler beim Abrufen der Statistiken: {e}")
+            return {}
+
+        empty = AppStats((0, None, None, None), (0, None, None, None))
+        stats = dict.fromkeys(app_names, empty)
+        for (app_name, today_opens, today_focus, today_total,
+             opens, focus, total, first_use) in rows:
+            today_avg = today_focus / today_opens if today_opens else None
+            stats[app_name] = AppStats(
+                (today_opens, today_focus, today_total, today_avg),
+                (opens, focus, total, first_use),
+            )
+        return stats
@@ -0,0 +1,188 @@
+"""Streaming-Export der Roh-Sessions (CSV, JSONL, Arrow/Parquet)."""
+
+import contextlib
+import csv
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, TextIO
+
+from .config import EXPORT_BATCH_SIZE, EXPORT_FORMATS
+from .database import EXPORT_COLUMNS, Database
+from .exceptions import TimeTrackerError
+from .logger_config import setup_logger
+
+logger = setup_logger(__name__)
+
+# Formate, die pyarrow benötigen
+_ARROW_FORMATS = ("parquet", "arrow")
+
+# Dateiendung → Format
+_SUFFIXES = {
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".parquet": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+}
+
+Batches = Iterator[List[tuple]]
+
+
+def detect_format(output: str) -> str:
+    """Bestimme das Format aus der Dateiendung (Standard: CSV).
+
+    Args:
+        output: Zieldatei oder ``-`` für stdout
+    """
+    return _SUFFIXES.get(Path(output).suffix.lower(), "csv")
+
+
+@contextlib.contextmanager
+def _open_text(output: str) -> Iterator[TextIO]:
+    """Öffne die Zieldatei als Text (``-`` = stdout, wird nicht geschlossen)."""
+    if output == "-":
+        yield sys.stdout
+        return
+    Path(output).parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8", newline="") as file:
+        yield file
+
+
+def _write_csv(batches: Batches, output: str) -> int:
+    rows = 0
+    with _open_text(output) as file:
+        writer = csv.writer(file)
+        writer.writerow(EXPORT_COLUMNS)
+        for batch in batches:
+            writer.writerows(batch)
+            rows += len(batch)
+    return rows
+
+
+def _write_jsonl(batches: Batches, output: str) -> int:
+    rows = 0
+    with _open_text(output) as file:
+        for batch in batches:
+            file.writelines(
+                json.dumps(dict(zip(EXPORT_COLUMNS, row)), ensure_ascii=False) + "\n"
+                for row in batch
+            )
+            rows += len(batch)
+    return rows
+
+
+def _import_pyarrow():
+    """Importiere pyarrow (optionale Abhängigkeit).
+
+    Raises:
+        TimeTrackerError: Wenn pyarrow nicht installiert ist
+    """
+    try:
+        import pyarrow
+    except ImportError:
+        raise TimeTrackerError(
+            "Parquet/Arrow-Export benötigt pyarrow (pip install pyarrow)"
+        )
+    return pyarrow
+
+
+def _write_arrow(batches: Batches, output: str, fmt: str) -> int:
+    """Schreibe jeden Batch als eigenen RecordBatch bzw. Row Group."""
+    pa = _import_pyarrow()
+
+    schema = pa.schema([
+        ("id", pa.int64()),
+        ("app_name", pa.string()),
+        ("app_path", pa.string()),
+        ("start_time", pa.timestamp("us")),
+        ("end_time", pa.timestamp("us")),
+        ("duration_seconds", pa.int64()),
+        ("total_duration_seconds", pa.int64()),
+        ("date", pa.date32()),
+    ])
+
+    if output == "-":
+        sink = pa.output_stream(sys.stdout.buffer)
+    else:
+        Path(output).parent.mkdir(parents=True, exist_ok=True)
+        sink = pa.OSFile(output, "wb")
+
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        writer = pq.ParquetWriter(sink, schema)
+    else:
+        writer = pa.ipc.new_file(sink, schema)
+
+    rows = 0
+    try:
+        for batch in batches:
+            columns = list(zip(*batch))
+            # Zeiten liegen als ISO-Text vor, Arrow parst sie beim Cast
+            arrays = [
+                pa.array(column, pa.string()).cast(field.type)
+                if pa.types.is_temporal(field.type) else pa.array(column, field.type)
+                for column, field in zip(columns, schema)
+            ]
+            record_batch = pa.RecordBatch.from_arrays(arrays, schema=schema)
+            if fmt == "parquet":
+                writer.write_batch(record_batch)
+            else:
+                writer.write(record_batch)
+            rows += len(batch)
+    finally:
+        writer.close()
+        if output != "-":
+            sink.close()
+    return rows
+
+
+_WRITERS: Dict[str, Callable[[Batches, str], int]] = {
+    "csv": _write_csv,
+    "jsonl": _write_jsonl,
+    "parquet": lambda batches, output: _write_arrow(batches, output, "parquet"),
+    "arrow": lambda batches, output: _write_arrow(batches, output, "arrow"),
+}
+
+
+def export_sessions(db: Database, output: str, fmt: Optional[str] = None,
+                    since: Optional[datetime] = None, until: Optional[datetime] = None,
+                    app_names: Optional[Sequence[str]] = None,
+                    batch_size: int = EXPORT_BATCH_SIZE) -> int:
+    """Exportiere app_sessions gestreamt in eine Datei.
+
+    Der Speicherbedarf hängt nur von ``batch_size`` ab, nicht von der
+    Anzahl exportierter Zeilen.
+
+    Args:
+        db: Quell-Datenbank
+        output: Zieldatei oder ``-`` für stdout
+        fmt: ``csv``, ``jsonl``, ``parquet`` oder ``arrow``
+            (Standard: aus der Dateiendung)
+        since: Nur Sessions, die ab diesem Zeitpunkt begonnen haben
+        until: Nur Sessions, die vor diesem Zeitpunkt begonnen haben
+        app_names: Nur diese Apps (None = alle)
+        batch_size: Zeilen pro Datenbank-Batch
+
+    Returns:
+        int: Anzahl exportierter Sessions
+
+    Raises:
+        TimeTrackerError: Bei unbekanntem Format oder fehlendem pyarrow
+        DatabaseError: Wenn das Lesen fehlschlägt
+    """
+    fmt = fmt or detect_format(output)
+    writer = _WRITERS.get(fmt)
+    if writer is None:
+        raise TimeTrackerError(
+            f"Unbekanntes Export-Format: {fmt} (erlaubt: {', '.join(EXPORT_FORMATS)})"
+        )
+    if fmt in _ARROW_FORMATS:
+        # Vor dem Öffnen der Zieldatei prüfen
+        _import_pyarrow()
+
+    rows = writer(db.iter_sessions(since, until, app_names, batch_size), output)
+    logger.info(f"{rows} Session(s) als {fmt} exportiert: {output}")
+    return rows
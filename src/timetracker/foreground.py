@@ -0,0 +1,304 @@
+"""Quellen für Vordergrund-Fenster-Wechsel (Fokus-Events) für TimeTracker."""
+
+import os
+import shutil
+import subprocess
+import threading
+from typing import Callable, Iterable, List, NamedTuple, Optional
+
+from .exceptions import TrackerError
+from .logger_config import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class ForegroundEvent(NamedTuple):
+    """Ein Fokuswechsel auf den Prozess ``pid``.
+
+    ``name``/``exe`` sind optional: Echte Quellen liefern nur die PID,
+    der Tracker löst Name und Pfad selbst auf. Skriptgesteuerte Quellen
+    (Tests) können beides direkt mitgeben.
+    """
+
+    pid: int
+    name: Optional[str] = None
+    exe: Optional[str] = None
+
+
+# Callback einer Quelle; None signalisiert, dass die Quelle erschöpft ist
+ForegroundCallback = Callable[[Optional[ForegroundEvent]], None]
+
+
+class ForegroundSource:
+    """Schnittstelle für Fokus-Quellen.
+
+    Event-getriebene Quellen (``event_driven = True``) rufen nach
+    ``start()`` bei jedem Fokuswechsel den Callback auf. Alle anderen
+    werden vom Tracker im ``check_interval`` über ``poll()`` abgefragt.
+    """
+
+    event_driven: bool = False
+
+    def start(self, callback: ForegroundCallback) -> None:
+        """Starte die Quelle.
+
+        Args:
+            callback: Wird bei jedem Fokuswechsel aufgerufen
+
+        Raises:
+            TrackerError: Wenn die Quelle nicht gestartet werden kann
+        """
+
+    def stop(self) -> None:
+        """Stoppe die Quelle und gib Ressourcen frei."""
+
+    def poll(self) -> Optional[ForegroundEvent]:
+        """Frage das aktuelle Vordergrund-Fenster ab.
+
+        Returns:
+            ForegroundEvent: Aktueller Fokus
+            None: Wenn kein Fenster ermittelt werden kann
+        """
+        return None
+
+
+class PollingForegroundSource(ForegroundSource):
+    """Fragt ``GetForegroundWindow`` bei jedem Tick ab (Fallback)."""
+
+    def poll(self) -> Optional[ForegroundEvent]:
+        """Frage das aktuelle Vordergrund-Fenster über pywin32 ab."""
+        import win32gui
+        import win32process
+
+        try:
+            hwnd = win32gui.GetForegroundWindow()
+            _, pid = win32process.GetWindowThreadProcessId(hwnd)
+            return ForegroundEvent(pid)
+        except Exception as e:
+            logger.debug(f"Fehler beim Abrufen des aktiven Fensters: {e}")
+            return None
+
+
+class WinEventForegroundSource(PollingForegroundSource):
+    """Event-getriebene Quelle über einen WinEvent-Hook (EVENT_SYSTEM_FOREGROUND).
+
+    Der Hook läuft in einem eigenen Thread mit Message-Loop. Windows ruft
+    ihn nur bei echten Fokuswechseln auf, der Tracker schläft dazwischen.
+    """
+
+    event_driven = True
+
+    EVENT_SYSTEM_FOREGROUND = 0x0003
+    WINEVENT_OUTOFCONTEXT = 0x0000
+    WINEVENT_SKIPOWNPROCESS = 0x0002
+    WM_QUIT = 0x0012
+    START_TIMEOUT = 5.0
+
+    def __init__(self) -> None:
+        """Initialisiere die WinEvent-Quelle (Hook wird erst in start() gesetzt)."""
+        self._thread: Optional[threading.Thread] = None
+        self._thread_id: int = 0
+        self._started = threading.Event()
+        self._error: Optional[str] = None
+
+    def start(self, callback: ForegroundCallback) -> None:
+        """Installiere den Hook in einem eigenen Thread.
+
+        Raises:
+            TrackerError: Wenn der Hook nicht installiert werden kann
+        """
+        self._thread = threading.Thread(
+            target=self._run, args=(callback,), name="WinEventHook", daemon=True
+        )
+        self._thread.start()
+
+        if not self._started.wait(self.START_TIMEOUT):
+            raise TrackerError("WinEvent-Hook: Timeout beim Starten")
+        if self._error:
+            raise TrackerError(f"WinEvent-Hook fehlgeschlagen: {self._error}")
+
+        logger.info("WinEvent-Hook für Fokuswechsel installiert")
+
+    def _run(self, callback: ForegroundCallback) -> None:
+        """Message-Loop des Hook-Threads."""
+        import ctypes
+        from ctypes import wintypes
+
+        user32 = ctypes.windll.user32
+        kernel32 = ctypes.windll.kernel32
+
+        WinEventProc = ctypes.WINFUNCTYPE(
+            None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+            wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD,
+        )
+
+        def on_event(hook, event, hwnd, id_object, id_child, thread, time_ms):
+            pid = wintypes.DWORD()
+            user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+            if pid.value:
+                callback(ForegroundEvent(pid.value))
+
+        # Referenz halten, sonst räumt der GC den Callback weg
+        proc = WinEventProc(on_event)
+        user32.SetWinEventHook.restype = wintypes.HANDLE
+        hook = user32.SetWinEventHook(
+            self.EVENT_SYSTEM_FOREGROUND, self.EVENT_SYSTEM_FOREGROUND,
+            0, proc, 0, 0,
+            self.WINEVENT_OUTOFCONTEXT | self.WINEVENT_SKIPOWNPROCESS,
+        )
+
+        self._thread_id = kernel32.GetCurrentThreadId()
+        if not hook:
+            self._error = f"SetWinEventHook lieferte 0 (Fehler {kernel32.GetLastError()})"
+            self._started.set()
+            return
+        self._started.set()
+
+        msg = wintypes.MSG()
+        while user32.GetMessageW(ctypes.byref(msg), 0, 0, 0) > 0:
+            user32.TranslateMessage(ctypes.byref(msg))
+            user32.DispatchMessageW(ctypes.byref(msg))
+
+        user32.UnhookWinEvent(hook)
+        logger.info("WinEvent-Hook entfernt")
+
+    def stop(self) -> None:
+        """Beende die Message-Loop des Hook-Threads."""
+        if not self._thread or not self._thread.is_alive():
+            return
+
+        import ctypes
+
+        ctypes.windll.user32.PostThreadMessageW(self._thread_id, self.WM_QUIT, 0, 0)
+        self._thread.join(timeout=self.START_TIMEOUT)
+
+
+class X11ForegroundSource(ForegroundSource):
+    """Fokus unter X11 über ``xprop`` (_NET_ACTIVE_WINDOW → _NET_WM_PID).
+
+    Mit ``spy=True`` läuft ``xprop -spy`` dauerhaft und meldet jeden
+    Wechsel des aktiven Fensters; ohne wird bei jedem ``poll()`` gefragt.
+    """
+
+    def __init__(self, spy: bool = True) -> None:
+        """Initialisiere die Quelle.
+
+        Args:
+            spy: Event-getrieben über ``xprop -spy`` statt Polling
+        """
+        self.event_driven = spy
+        self._process: Optional[subprocess.Popen] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _run_xprop(*args: str) -> Optional[str]:
+        """Führe xprop einmal aus (None wenn nicht verfügbar)."""
+        try:
+            result = subprocess.run(
+                ["xprop", *args], capture_output=True, text=True, timeout=2
+            )
+            return result.stdout
+        except (OSError, subprocess.SubprocessError):
+            return None
+
+    @staticmethod
+    def _parse_window(line: str) -> Optional[str]:
+        """Extrahiere die Fenster-ID aus einer _NET_ACTIVE_WINDOW-Zeile."""
+        window = line.strip().rsplit(" ", 1)[-1]
+        if not window.startswith("0x") or int(window, 16) == 0:
+            return None
+        return window
+
+    def _window_pid(self, window: str) -> Optional[int]:
+        """Ermittle die PID eines Fensters über _NET_WM_PID."""
+        output = self._run_xprop("-id", window, "_NET_WM_PID")
+        if not output or "=" not in output:
+            return None
+        try:
+            return int(output.split("=", 1)[1])
+        except ValueError:
+            return None
+
+    def start(self, callback: ForegroundCallback) -> None:
+        """Starte ``xprop -spy`` und lies Fokuswechsel in einem Thread.
+
+        Raises:
+            TrackerError: Wenn kein X11-Display oder kein xprop vorhanden ist
+        """
+        if not self.event_driven:
+            return
+        if not os.environ.get("DISPLAY") or not shutil.which("xprop"):
+            raise TrackerError("X11-Fokus nicht verfügbar (DISPLAY/xprop fehlt)")
+
+        self._process = subprocess.Popen(
+            ["xprop", "-root", "-spy", "_NET_ACTIVE_WINDOW"],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+        )
+        self._thread = threading.Thread(
+            target=self._read_events, args=(callback,), name="XpropSpy", daemon=True
+        )
+        self._thread.start()
+        logger.info("X11-Fokusüberwachung (xprop -spy) gestartet")
+
+    def _read_events(self, callback: ForegroundCallback) -> None:
+        """Lies die Ausgabe von ``xprop -spy`` zeilenweise."""
+        for line in self._process.stdout:
+            window = self._parse_window(line)
+            pid = self._window_pid(window) if window else None
+            if pid:
+                callback(ForegroundEvent(pid))
+
+    def stop(self) -> None:
+        """Beende ``xprop -spy``."""
+        if self._process is None:
+            return
+        self._process.terminate()
+        self._process.wait()
+        self._process = None
+        if self._thread is not None:
+            self._thread.join()
+
+    def poll(self) -> Optional[ForegroundEvent]:
+        """Frage das aktive Fenster einmalig ab."""
+        output = self._run_xprop("-root", "_NET_ACTIVE_WINDOW")
+        window = self._parse_window(output) if output else None
+        pid = self._window_pid(window) if window else None
+        return ForegroundEvent(pid) if pid else None
+
+
+class ScriptedForegroundSource(ForegroundSource):
+    """In-Memory-Quelle mit vorgegebenen Events (für Tests, plattformunabhängig).
+
+    Beim Start werden alle Events der Reihe nach über den Callback
+    ausgeliefert, danach meldet die Quelle ihr Ende (Callback mit None).
+    Weitere Events können über ``push()`` eingespeist werden.
+    """
+
+    event_driven = True
+
+    def __init__(self, events: Iterable[ForegroundEvent] = (),
+                 stop_when_done: bool = True) -> None:
+        """Initialisiere die Quelle.
+
+        Args:
+            events: Auszuliefernde Fokuswechsel
+            stop_when_done: Nach dem letzten Event das Ende melden
+        """
+        self._events: List[ForegroundEvent] = list(events)
+        self._stop_when_done = stop_when_done
+        self._callback: Optional[ForegroundCallback] = None
+
+    def start(self, callback: ForegroundCallback) -> None:
+        """Liefere alle vorgegebenen Events aus."""
+        self._callback = callback
+        for event in self._events:
+            callback(event)
+        if self._stop_when_done:
+            callback(None)
+
+    def push(self, event: Optional[ForegroundEvent]) -> None:
+        """Speise ein weiteres Event ein (None beendet die Quelle)."""
+        if self._callback is None:
+            self._events.append(event)
+        else:
+            self._callback(event)
@@ -1,41 +1,162 @@
 """Logging-Konfiguration für TimeTracker."""
 
+import atexit
+import copy
 import logging
-from .config import LOG_FORMAT, LOG_LEVEL, LOG_PATH
+import queue
+import threading
+from .config import LOG_BACKUP_COUNT, LOG_FORMAT, LOG_LEVEL, LOG_MAX_BYTES, LOG_PATH
 from pathlib import Path
+from typing import Optional
+
+
+# Nur für Tracebacks im aufrufenden Thread (formatException)
+_exc_formatter = logging.Formatter()
+
+
+class _DeferredQueueHandler(logging.Handler):
+    """Queue-Handler, der Zeitstempel und Zeilenformat dem Listener überlässt.
+
+    Anders als ``logging.handlers.QueueHandler`` wird im aufrufenden Thread
+    nicht die ganze Zeile formatiert. Nur die Nachricht (``msg % args``)
+    und ein Traceback werden dort aufgelöst, damit sich veränderliche
+    Argumente bis zur Ausgabe nicht mehr ändern. ``logging.handlers``
+    (zieht u.a. socket nach) wird erst mit dem Listener importiert.
+    """
+
+    def __init__(self, log_queue: "queue.SimpleQueue[logging.LogRecord]") -> None:
+        super().__init__()
+        self.queue = log_queue
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # Log-Datei und Listener erst beim ersten Record (nicht beim Import)
+        if _listener is None:
+            _start_listener(self.queue)
+        try:
+            self.queue.put_nowait(self._prepare(record))
+        except Exception:
+            self.handleError(record)
+
+    @staticmethod
+    def _prepare(record: logging.LogRecord) -> logging.LogRecord:
+        """Kopie mit fertiger Nachricht und Traceback-Text.
+
+        Die Kopie lässt den Record für weitere Handler (propagiert an den
+        Root-Logger) unverändert.
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = _exc_formatter.formatException(record.exc_info)
+            # Frames nicht bis zum Listener festhalten
+            record.exc_info = None
+        return record
+
+
+# Gemeinsame Pipeline für alle Logger (wird beim ersten Aufruf erstellt)
+_queue_handler: Optional[logging.Handler] = None
+_listener = None  # logging.handlers.QueueListener
+_listener_lock = threading.Lock()
+_atexit_registered = False
+
+
+def _get_queue_handler() -> logging.Handler:
+    """Erstelle einmalig den geteilten QueueHandler (ohne Datei-I/O).
+
+    Returns:
+        logging.Handler: Geteilter QueueHandler
+    """
+    global _queue_handler
+
+    if _queue_handler is None:
+        _queue_handler = _DeferredQueueHandler(queue.SimpleQueue())
+    return _queue_handler
+
+
+def _start_listener(log_queue: "queue.SimpleQueue[logging.LogRecord]") -> None:
+    """Starte einmalig den QueueListener.
+
+    Der Listener-Thread schreibt in eine einzige, nach Größe rotierende
+    Log-Datei und auf die Konsole. Rotation und Datei-I/O laufen damit nie
+    im Thread, der loggt.
+    """
+    global _listener, _atexit_registered
+
+    with _listener_lock:
+        if _listener is not None:
+            return
+        _listener = _create_listener(log_queue)
+        _listener.start()
+        # Beim Beenden alle ausstehenden Records schreiben (auch nach Neustarts nur einmal)
+        if not _atexit_registered:
+            atexit.register(shutdown_logging)
+            _atexit_registered = True
+
+
+def _create_listener(log_queue: "queue.SimpleQueue[logging.LogRecord]"):
+    """Erstelle Konsolen- und rotierenden Datei-Handler samt Listener.
+
+    Returns:
+        logging.handlers.QueueListener: Noch nicht gestarteter Listener
+    """
+    import logging.handlers
+
+    level = logging.getLevelName(LOG_LEVEL)
+    formatter = logging.Formatter(LOG_FORMAT)
+
+    # Console Handler
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(level)
+    console_handler.setFormatter(formatter)
+
+    # File Handler (rotierend, damit das Log im Autostart nicht unbegrenzt wächst)
+    Path(LOG_PATH).parent.mkdir(parents=True, exist_ok=True)
+    file_handler = logging.handlers.RotatingFileHandler(
+        LOG_PATH,
+        maxBytes=LOG_MAX_BYTES,
+        backupCount=LOG_BACKUP_COUNT,
+        encoding="utf-8",
+    )
+    file_handler.setLevel(level)
+    file_handler.setFormatter(formatter)
+
+    return logging.handlers.QueueListener(
+        log_queue, console_handler, file_handler, respect_handler_level=True
+    )
+
+
+def shutdown_logging() -> None:
+    """Schreibe ausstehende Log-Records und beende den Listener-Thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
 
 
 def setup_logger(name: str) -> logging.Logger:
     """Richte einen Logger auf.
-    
+
+    Der geteilte QueueHandler hängt nur am Paket-Logger (z.B.
+    ``timetracker``), Modul-Logger propagieren dorthin. Die Propagierung
+    zum Root-Logger bleibt an, damit einbettende Anwendungen und pytest
+    (``caplog``) die Records ebenfalls sehen. Geschrieben wird nur vom
+    Listener-Thread.
+
     Args:
         name: Name des Loggers (normalerweise __name__)
-        
+
     Returns:
         logging.Logger: Konfigurierter Logger
     """
-    logger = logging.getLogger(name)
-    logger.setLevel(logging.getLevelName(LOG_LEVEL))
-    
+    package = logging.getLogger(name.partition(".")[0])
+    handler = _get_queue_handler()
     # Verhindere doppelte Handler
-    if logger.handlers:
-        return logger
-    
-    # Console Handler
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.getLevelName(LOG_LEVEL))
-    formatter = logging.Formatter(LOG_FORMAT)
-    console_handler.setFormatter(formatter)
-    
-    # File Handler
-    # Ensure log directory exists
-    Path(LOG_PATH).parent.mkdir(parents=True, exist_ok=True)
-    file_handler = logging.FileHandler(LOG_PATH, encoding='utf-8')
-    file_handler.setLevel(logging.getLevelName(LOG_LEVEL))
-    file_handler.setFormatter(formatter)
-    
-    # Handler hinzufügen
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
-    
-    return logger
+    if handler not in package.handlers:
+        package.setLevel(logging.getLevelName(LOG_LEVEL))
+        package.addHandler(handler)
+
+    return logging.getLogger(name)
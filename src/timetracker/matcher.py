@@ -0,0 +1,173 @@
+"""Vorkompilierter Abgleich von Prozessen mit den Ziel-Apps für TimeTracker."""
+
+import fnmatch
+import re
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Pattern, Tuple
+
+from .config import MATCHER_CACHE_SIZE
+from .exceptions import ConfigError
+from .logger_config import setup_logger
+
+logger = setup_logger(__name__)
+
+ProcessKey = Tuple[int, float]
+
+# Präfix für reguläre Ausdrücke in target_apps
+REGEX_PREFIX = "re:"
+_GLOB_CHARS = frozenset("*?[")
+
+
+def _normalize_path(path: str) -> str:
+    """Pfad für den Vergleich vereinheitlichen (lowercase, ``/`` als Trenner)."""
+    return path.replace("\\", "/").lower()
+
+
+class AppMatcher:
+    """Entscheidet, ob ein Prozess zu einer Ziel-App gehört.
+
+    Die Regeln aus ``target_apps`` werden einmal kompiliert:
+
+    * ``notepad.exe`` – exakter Name (Set-Lookup), wie bisher zusätzlich
+      als Teilstring (``notepad`` passt auf ``notepad.exe``)
+    * ``code*.exe`` – Glob auf den Prozessnamen
+    * ``re:^(code|codium)\\.exe$`` – regulärer Ausdruck auf den Namen
+    * ``C:/Program Files/Foo/*`` – Regel mit Pfadtrenner, Glob auf den
+      vollen Pfad der ausführbaren Datei
+
+    Teilstring-, Glob- und Regex-Regeln werden zu einem einzigen Ausdruck
+    zusammengefasst. Regex-Regeln mit Gruppen oder Rückverweisen (``\\1``)
+    bleiben eigene Ausdrücke – in der Alternation würden ihre Gruppen
+    umnummeriert. Entscheidungen werden pro (pid, create_time) gecacht,
+    im Normalbetrieb kostet ein Abgleich also einen Dict-Zugriff –
+    unabhängig von der Anzahl der Regeln.
+    """
+
+    def __init__(self, rules: Iterable[str], cache_size: int = MATCHER_CACHE_SIZE) -> None:
+        """Kompiliere die Regeln.
+
+        Args:
+            rules: Einträge aus ``target_apps``
+            cache_size: Max. Anzahl gecachter Entscheidungen
+
+        Raises:
+            ConfigError: Wenn ein regulärer Ausdruck ungültig ist
+        """
+        self._exact = set()
+        name_parts: List[str] = []
+        path_parts: List[str] = []
+        # Regex-Regeln, die nicht in die Alternation passen
+        self._name_res: List[Pattern[str]] = []
+
+        for rule in rules:
+            rule = rule.strip()
+            if not rule:
+                continue
+
+            if rule.startswith(REGEX_PREFIX):
+                pattern = rule[len(REGEX_PREFIX):]
+                compiled = self._compile_rule(pattern)
+                if self._combinable(compiled):
+                    name_parts.append(f"(?:{pattern})")
+                else:
+                    self._name_res.append(compiled)
+            elif "/" in rule or "\\" in rule:
+                path_parts.append(fnmatch.translate(_normalize_path(rule)))
+            elif _GLOB_CHARS.intersection(rule):
+                name_parts.append(f"^(?:{fnmatch.translate(rule.lower())})")
+            else:
+                self._exact.add(rule.lower())
+                name_parts.append(re.escape(rule.lower()))
+
+        self._name_re = self._compile(name_parts)
+        self._path_re = self._compile(path_parts)
+        self.needs_path = self._path_re is not None
+
+        self._cache: "OrderedDict[ProcessKey, bool]" = OrderedDict()
+        self._cache_size = cache_size
+
+    @staticmethod
+    def _compile_rule(pattern: str) -> Pattern[str]:
+        """Kompiliere eine einzelne Regex-Regel (validiert sie zugleich).
+
+        Raises:
+            ConfigError: Wenn der Ausdruck ungültig ist
+        """
+        try:
+            return re.compile(pattern, re.IGNORECASE)
+        except re.error as e:
+            raise ConfigError(f"Ungültiger regulärer Ausdruck '{pattern}': {e}")
+
+    @staticmethod
+    def _combinable(compiled: Pattern[str]) -> bool:
+        """Ob eine Regel unverändert Teil der Alternation sein kann.
+
+        Nicht bei Gruppen (Rückverweise setzen welche voraus) und nicht bei
+        globalen Flags wie ``(?i)``, die nur am Anfang eines Ausdrucks stehen
+        dürfen.
+        """
+        if compiled.groups:
+            return False
+        try:
+            re.compile(f"(?:{compiled.pattern})")
+        except re.error:
+            return False
+        return True
+
+    @staticmethod
+    def _compile(parts: List[str]) -> Optional[Pattern[str]]:
+        """Fasse (einzeln gültige, gruppenlose) Teil-Ausdrücke zu einer Alternation zusammen."""
+        if not parts:
+            return None
+        return re.compile("|".join(parts), re.IGNORECASE)
+
+    def match(self, name: Optional[str], exe: Optional[str] = None) -> bool:
+        """Prüfe einen Prozess ohne Cache.
+
+        Args:
+            name: Prozessname
+            exe: Voller Pfad der ausführbaren Datei (nur für Pfadregeln)
+
+        Returns:
+            bool: True wenn eine Regel passt
+        """
+        if name:
+            name = name.lower()
+            if name in self._exact:
+                return True
+            if self._name_re is not None and self._name_re.search(name):
+                return True
+            if any(pattern.search(name) for pattern in self._name_res):
+                return True
+
+        if exe and self._path_re is not None:
+            return self._path_re.match(_normalize_path(exe)) is not None
+        return False
+
+    def match_process(self, key: ProcessKey, name: Optional[str],
+                      exe: Optional[str] = None) -> bool:
+        """Prüfe einen Prozess, gecacht über (pid, create_time).
+
+        Args:
+            key: (pid, create_time) des Prozesses
+            name: Prozessname
+            exe: Voller Pfad der ausführbaren Datei
+
+        Returns:
+            bool: True wenn eine Regel passt
+        """
+        cache = self._cache
+        result = cache.get(key)
+        if result is not None:
+            cache.move_to_end(key)
+            return result
+
+        result = self.match(name, exe)
+        cache[key] = result
+        if len(cache) > self._cache_size:
+            cache.popitem(last=False)
+        return result
+
+    def forget(self, key: ProcessKey) -> None:
+        """Entferne die Entscheidung für einen beendeten Prozess."""
+        self._cache.pop(key, None)
@@ -0,0 +1,247 @@
+"""Laufzeit-Metriken (Latenz-Histogramme, Zähler) für TimeTracker."""
+
+import functools
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, TypeVar
+
+from .config import METRICS_FLUSH_INTERVAL
+from .logger_config import setup_logger
+
+logger = setup_logger(__name__)
+
+F = TypeVar("F", bound=Callable)
+
+# Perzentile in der Prometheus-Ausgabe
+QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+
+class Histogram:
+    """Latenz-Histogramm mit log-linearen Buckets (HDR-Prinzip).
+
+    Jede Zweierpotenz wird in ``2**sub_bits`` gleich breite Buckets
+    geteilt, der relative Fehler liegt also unter ``2**-sub_bits``
+    (Standard: ~3 %) – über den gesamten Wertebereich von Nanosekunden
+    bis Stunden. ``record()`` ist reine Integer-Arithmetik ohne
+    Allokation.
+    """
+
+    __slots__ = ("sub_bits", "counts", "count", "total", "max")
+
+    def __init__(self, sub_bits: int = 5) -> None:
+        self.sub_bits = sub_bits
+        self.counts: List[int] = [0] * ((64 - sub_bits + 1) << sub_bits)
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def _index(self, value: int) -> int:
+        """Bucket-Index eines Werts."""
+        shift = value.bit_length() - self.sub_bits - 1
+        if shift <= 0:
+            return value
+        # Exponent-Block + die obersten sub_bits Bits der Mantisse
+        return ((shift + 1) << self.sub_bits) + ((value >> shift) - (1 << self.sub_bits))
+
+    def _lower_bound(self, index: int) -> int:
+        """Kleinster Wert eines Buckets."""
+        block, offset = divmod(index, 1 << self.sub_bits)
+        if block <= 1:
+            return index
+        return ((1 << self.sub_bits) + offset) << (block - 1)
+
+    def record(self, value: int) -> None:
+        """Erfasse einen Wert (z.B. Nanosekunden, negative Werte zählen als 0)."""
+        if value < 0:
+            value = 0
+        self.counts[self._index(value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, q: float) -> int:
+        """Wert beim Perzentil ``q`` (0..1), Genauigkeit eines Buckets."""
+        if not self.count:
+            return 0
+        rank = max(1, int(q * self.count + 0.5))
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(self._lower_bound(index), self.max)
+        return self.max
+
+
+class Metrics:
+    """Registry für Zähler und Histogramme."""
+
+    def __init__(self) -> None:
+        self.counters: Dict[str, int] = {}
+        self.histograms: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str) -> Histogram:
+        """Hole (oder erstelle) ein Histogramm.
+
+        Für heiße Pfade einmal holen und direkt ``record()`` aufrufen.
+        """
+        hist = self.histograms.get(name)
+        if hist is None:
+            with self._lock:
+                hist = self.histograms.setdefault(name, Histogram())
+        return hist
+
+    def inc(self, name: str, amount: int = 1) -> None:
+        """Erhöhe einen Zähler (thread-sicher: Tracker, Writer und Exit-Watcher zählen)."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def timed(self, name: str) -> Callable[[F], F]:
+        """Decorator: Laufzeit jedes Aufrufs in Nanosekunden erfassen."""
+        def decorator(func: F) -> F:
+            hist = self.histogram(name)
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter_ns()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    hist.record(time.perf_counter_ns() - start)
+            return wrapper  # type: ignore[return-value]
+        return decorator
+
+    def render_prometheus(self, prefix: str = "timetracker") -> str:
+        """Alle Metriken im Prometheus-Textformat.
+
+        Zähler als ``counter``, Histogramme als ``summary`` in Sekunden.
+        """
+        lines = []
+        with self._lock:
+            counters = sorted(self.counters.items())
+        for name, value in counters:
+            metric = f"{prefix}_{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value}")
+
+        for name, hist in sorted(self.histograms.items()):
+            metric = f"{prefix}_{name}_seconds"
+            lines.append(f"# TYPE {metric} summary")
+            for q in QUANTILES:
+                lines.append(f'{metric}{{quantile="{q}"}} {hist.percentile(q) / 1e9:.9f}')
+            lines.append(f"{metric}_sum {hist.total / 1e9:.9f}")
+            lines.append(f"{metric}_count {hist.count}")
+        return "\n".join(lines) + "\n"
+
+
+# Prozessweite Registry (Tracker, Datenbank, Writer)
+REGISTRY = Metrics()
+
+
+# ========== AUSGABE ==========
+
+class MetricsServer:
+    """HTTP-Endpunkt ``/metrics`` auf localhost (Prometheus-Text)."""
+
+    def __init__(self, metrics: Metrics, port: int, host: str = "127.0.0.1") -> None:
+        """Starte den Server in einem Hintergrund-Thread.
+
+        Args:
+            metrics: Auszuliefernde Registry
+            port: TCP-Port (0 = beliebiger freier Port)
+            host: Nur lokal erreichbar (Standard)
+        """
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args) -> None:
+                pass  # kein Zugriffslog auf stderr
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="MetricsServer", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Metriken unter http://{host}:{self.port}/metrics")
+
+    def close(self) -> None:
+        """Server beenden."""
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class MetricsFileWriter:
+    """Schreibt die Metriken periodisch (atomar) in eine Datei."""
+
+    def __init__(self, metrics: Metrics, path: Path | str,
+                 interval: float = METRICS_FLUSH_INTERVAL) -> None:
+        """Starte den Schreib-Thread.
+
+        Args:
+            metrics: Zu schreibende Registry
+            path: Zieldatei (Prometheus-Text, z.B. für den node_exporter)
+            interval: Abstand der Aktualisierungen in Sekunden
+        """
+        self.metrics = metrics
+        self.path = Path(path)
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="MetricsFile", daemon=True)
+        self._thread.start()
+
+    def flush(self) -> None:
+        """Aktuellen Stand schreiben (über Temp-Datei + replace)."""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            tmp_path.write_text(self.metrics.render_prometheus(), encoding="utf-8")
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Metrik-Datei konnte nicht geschrieben werden: {e}")
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.flush()
+
+    def close(self) -> None:
+        """Thread beenden und einen letzten Stand schreiben."""
+        self._stop.set()
+        self._thread.join()
+        self.flush()
+
+
+def start_exporters(config: dict, metrics: Metrics = REGISTRY) -> List[object]:
+    """Starte die in der Config gewünschten Exporter.
+
+    Args:
+        config: Config mit optional ``metrics_port`` und/oder ``metrics_file``
+        metrics: Registry
+
+    Returns:
+        List: Gestartete Exporter (jeweils mit ``close()``)
+    """
+    exporters: List[object] = []
+    port: Optional[int] = config.get("metrics_port")
+    if port is not None:
+        try:
+            exporters.append(MetricsServer(metrics, int(port)))
+        except OSError as e:
+            logger.warning(f"Metrik-Endpunkt nicht verfügbar (Port {port}): {e}")
+    if config.get("metrics_file"):
+        exporters.append(MetricsFileWriter(metrics, config["metrics_file"]))
+    return exporters
@@ -0,0 +1,655 @@
+"""Versionierte Schema-Migrationen für die TimeTracker-Datenbank.
+
+Die Schema-Version steht in ``PRAGMA user_version`` (0 = DB aus der Zeit
+vor den Migrationen oder neue, leere DB). ``migrate()`` führt alle
+fehlenden Migrationen der Reihe nach aus. Jede Migration besteht aus
+einem optionalen ``prepare``-Schritt, der große Datenmengen in einzelnen
+Transaktionen kopiert und nach einem Abbruch dort weitermacht, wo er
+aufgehört hat, und einem ``finish``-Schritt, der zusammen mit der neuen
+``user_version`` atomar in einer Transaktion läuft.
+"""
+
+import sqlite3
+from typing import Callable, List, NamedTuple, Optional, Sequence
+
+from .config import MIGRATION_BATCH_SIZE
+from .exceptions import DatabaseError
+from .logger_config import setup_logger
+
+logger = setup_logger(__name__)
+
+
+# ========== VERSION 1: AUSGANGSSCHEMA ==========
+# Text-Zeitstempel, date = UTC-Datum des Session-Endes
+
+SQL_CREATE_SESSIONS_V1 = """
+    CREATE TABLE IF NOT EXISTS app_sessions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        app_name TEXT NOT NULL,
+        app_path TEXT,
+        start_time DATETIME NOT NULL,
+        end_time DATETIME,
+        duration_seconds INTEGER,
+        total_duration_seconds INTEGER,
+        date DATE DEFAULT CURRENT_DATE
+    )
+"""
+
+# Tagesweise Rollup-Tabelle: Statistiken lesen nur noch wenige Zeilen statt
+# app_sessions komplett zu scannen. Gepflegt per Trigger in derselben
+# Transaktion wie der INSERT der Session.
+SQL_CREATE_DAILY_STATS = """
+    CREATE TABLE IF NOT EXISTS app_daily_stats (
+        app_name TEXT NOT NULL,
+        date DATE NOT NULL,
+        opens INTEGER NOT NULL DEFAULT 0,
+        focus_seconds INTEGER NOT NULL DEFAULT 0,
+        total_seconds INTEGER NOT NULL DEFAULT 0,
+        first_start DATETIME,
+        PRIMARY KEY (app_name, date)
+    ) WITHOUT ROWID
+"""
+
+# Stündliches Rollup in lokaler Zeit (Stunde des Session-Starts,
+# Format 'YYYY-MM-DD HH'), Grundlage der Reports in reports.py.
+SQL_CREATE_HOURLY_STATS = """
+    CREATE TABLE IF NOT EXISTS app_hourly_stats (
+        app_name TEXT NOT NULL,
+        hour TEXT NOT NULL,
+        opens INTEGER NOT NULL DEFAULT 0,
+        focus_seconds INTEGER NOT NULL DEFAULT 0,
+        total_seconds INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (app_name, hour)
+    ) WITHOUT ROWID
+"""
+
+SQL_CREATE_INDEXES_V1 = (
+    "CREATE INDEX IF NOT EXISTS idx_sessions_app_date ON app_sessions (app_name, date)",
+    "CREATE INDEX IF NOT EXISTS idx_sessions_app_start ON app_sessions (app_name, start_time)",
+)
+
+SQL_CREATE_DAILY_TRIGGER_V1 = """
+    CREATE TRIGGER IF NOT EXISTS trg_sessions_daily_stats
+    AFTER INSERT ON app_sessions
+    BEGIN
+        INSERT INTO app_daily_stats
+            (app_name, date, opens, focus_seconds, total_seconds, first_start)
+        VALUES (
+            NEW.app_name, NEW.date, 1,
+            COALESCE(NEW.duration_seconds, 0),
+            COALESCE(NEW.total_duration_seconds, 0),
+            NEW.start_time
+        )
+        ON CONFLICT (app_name, date) DO UPDATE SET
+            opens = opens + 1,
+            focus_seconds = focus_seconds + excluded.focus_seconds,
+            total_seconds = total_seconds + excluded.total_seconds,
+            first_start = MIN(first_start, excluded.first_start);
+    END
+"""
+
+# Nicht parsebare start_time-Werte landen unverändert gekürzt im Schlüssel
+SQL_CREATE_HOURLY_TRIGGER_V1 = """
+    CREATE TRIGGER IF NOT EXISTS trg_sessions_hourly_stats
+    AFTER INSERT ON app_sessions
+    BEGIN
+        INSERT INTO app_hourly_stats
+            (app_name, hour, opens, focus_seconds, total_seconds)
+        VALUES (
+            NEW.app_name,
+            COALESCE(strftime('%Y-%m-%d %H', NEW.start_time), substr(NEW.start_time, 1, 13)),
+            1,
+            COALESCE(NEW.duration_seconds, 0),
+            COALESCE(NEW.total_duration_seconds, 0)
+        )
+        ON CONFLICT (app_name, hour) DO UPDATE SET
+            opens = opens + 1,
+            focus_seconds = focus_seconds + excluded.focus_seconds,
+            total_seconds = total_seconds + excluded.total_seconds;
+    END
+"""
+
+# Für DBs, die noch keine Rollup-Tabelle hatten
+SQL_BACKFILL_DAILY_STATS = """
+    INSERT INTO app_daily_stats
+        (app_name, date, opens, focus_seconds, total_seconds, first_start)
+    SELECT
+        app_name, date, COUNT(*),
+        COALESCE(SUM(duration_seconds), 0),
+        COALESCE(SUM(total_duration_seconds), 0),
+        MIN(start_time)
+    FROM app_sessions
+    GROUP BY app_name, date
+"""
+
+SQL_BACKFILL_HOURLY_STATS = """
+    INSERT INTO app_hourly_stats
+        (app_name, hour, opens, focus_seconds, total_seconds)
+    SELECT
+        app_name,
+        COALESCE(strftime('%Y-%m-%d %H', start_time), substr(start_time, 1, 13)),
+        COUNT(*),
+        COALESCE(SUM(duration_seconds), 0),
+        COALESCE(SUM(total_duration_seconds), 0)
+    FROM app_sessions
+    GROUP BY 1, 2
+"""
+
+
+def _create_base_schema(conn: sqlite3.Connection) -> None:
+    """Tabellen, Indizes und Rollup-Trigger; fehlende Rollups aus app_sessions befüllen."""
+    tables = {row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table'"
+    )}
+
+    conn.execute(SQL_CREATE_SESSIONS_V1)
+    conn.execute(SQL_CREATE_DAILY_STATS)
+    conn.execute(SQL_CREATE_HOURLY_STATS)
+    for sql in SQL_CREATE_INDEXES_V1:
+        conn.execute(sql)
+    conn.execute(SQL_CREATE_DAILY_TRIGGER_V1)
+    conn.execute(SQL_CREATE_HOURLY_TRIGGER_V1)
+
+    if "app_daily_stats" not in tables:
+        backfilled = conn.execute(SQL_BACKFILL_DAILY_STATS).rowcount
+        if backfilled > 0:
+            logger.info(f"Rollup-Tabelle aus {backfilled} Tageswert(en) befüllt")
+    if "app_hourly_stats" not in tables:
+        backfilled = conn.execute(SQL_BACKFILL_HOURLY_STATS).rowcount
+        if backfilled > 0:
+            logger.info(f"Stunden-Rollup aus {backfilled} Stundenwert(en) befüllt")
+
+
+# ========== VERSION 2: EPOCH-MILLISEKUNDEN, STRICT ==========
+# Zeiten als Unix-Epoch in ms (UTC), dazu lokales Datum (Tage seit
+# 1970-01-01) und lokale Stunde des Starts als Bucket-Spalten. Die Zeile
+# schrumpft von zwei 26-Byte-Texten plus Datum auf wenige Byte Ganzzahlen.
+
+# STRICT-Tabellen gibt es erst ab SQLite 3.37
+_STRICT = " STRICT" if sqlite3.sqlite_version_info >= (3, 37, 0) else ""
+# Zusätzlich zu WITHOUT ROWID
+_STRICT_OPTION = "," + _STRICT if _STRICT else ""
+
+SQL_CREATE_SESSIONS_V2 = f"""
+    CREATE TABLE IF NOT EXISTS app_sessions_v2 (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        app_name TEXT NOT NULL,
+        app_path TEXT,
+        start_ms INTEGER NOT NULL,
+        end_ms INTEGER,
+        duration_seconds INTEGER,
+        total_duration_seconds INTEGER,
+        day INTEGER NOT NULL,
+        hour INTEGER NOT NULL
+    ){_STRICT}
+"""
+
+# Abdeckende Indizes: Zeitbereich (Aufbewahrung) und Zeitbereich pro App
+# samt Dauern, beide ohne Zugriff auf die Tabelle lesbar
+SQL_CREATE_INDEXES_V2 = (
+    "CREATE INDEX IF NOT EXISTS idx_sessions_start_ms ON app_sessions_v2 (start_ms)",
+    "CREATE INDEX IF NOT EXISTS idx_sessions_app_start_ms ON app_sessions_v2 "
+    "(app_name, start_ms, duration_seconds, total_duration_seconds)",
+)
+
+# Nicht lesbare Zeitstempel (nur in Alt-Daten möglich) werden zu 0
+SQL_COPY_SESSIONS_V2 = """
+    INSERT INTO app_sessions_v2
+        (id, app_name, app_path, start_ms, end_ms,
+         duration_seconds, total_duration_seconds, day, hour)
+    SELECT
+        id, app_name, app_path,
+        COALESCE(CAST(round((julianday(start_time, 'utc') - 2440587.5) * 86400000) AS INTEGER), 0),
+        CAST(round((julianday(end_time, 'utc') - 2440587.5) * 86400000) AS INTEGER),
+        duration_seconds, total_duration_seconds,
+        COALESCE(CAST(julianday(date(start_time)) - 2440587.5 AS INTEGER), 0),
+        COALESCE(CAST(strftime('%H', start_time) AS INTEGER), 0)
+    FROM app_sessions
+    WHERE id > ?1
+    ORDER BY id
+    LIMIT ?2
+"""
+
+# date im Tages-Rollup bleibt das UTC-Datum des Session-Endes
+SQL_CREATE_DAILY_TRIGGER_V2 = """
+    CREATE TRIGGER trg_sessions_daily_stats
+    AFTER INSERT ON app_sessions
+    BEGIN
+        INSERT INTO app_daily_stats
+            (app_name, date, opens, focus_seconds, total_seconds, first_start)
+        VALUES (
+            NEW.app_name,
+            date(COALESCE(NEW.end_ms, NEW.start_ms) / 1000, 'unixepoch'),
+            1,
+            COALESCE(NEW.duration_seconds, 0),
+            COALESCE(NEW.total_duration_seconds, 0),
+            strftime('%Y-%m-%d %H:%M:%S', NEW.start_ms / 1000, 'unixepoch', 'localtime')
+        )
+        ON CONFLICT (app_name, date) DO UPDATE SET
+            opens = opens + 1,
+            focus_seconds = focus_seconds + excluded.focus_seconds,
+            total_seconds = total_seconds + excluded.total_seconds,
+            first_start = MIN(first_start, excluded.first_start);
+    END
+"""
+
+SQL_CREATE_HOURLY_TRIGGER_V2 = """
+    CREATE TRIGGER trg_sessions_hourly_stats
+    AFTER INSERT ON app_sessions
+    BEGIN
+        INSERT INTO app_hourly_stats
+            (app_name, hour, opens, focus_seconds, total_seconds)
+        VALUES (
+            NEW.app_name,
+            date(NEW.day * 86400, 'unixepoch') || printf(' %02d', NEW.hour),
+            1,
+            COALESCE(NEW.duration_seconds, 0),
+            COALESCE(NEW.total_duration_seconds, 0)
+        )
+        ON CONFLICT (app_name, hour) DO UPDATE SET
+            opens = opens + 1,
+            focus_seconds = focus_seconds + excluded.focus_seconds,
+            total_seconds = total_seconds + excluded.total_seconds;
+    END
+"""
+
+
+def _last_copied_id(conn: sqlite3.Connection, target: str) -> int:
+    return conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {target}").fetchone()[0]
+
+
+def _copy_in_batches(conn: sqlite3.Connection, target: str,
+                     statements: Sequence[str], batch_size: int) -> None:
+    """Kopiere app_sessions batchweise (je eine Transaktion) nach ``target``.
+
+    Jedes Statement bekommt (höchste kopierte ID, Batchgröße), das letzte
+    kopiert die Zeilen. Die Kopie hat keine Trigger, die Rollups zählen
+    nichts doppelt. Nach einem Abbruch geht es ab der höchsten bereits
+    kopierten ID weiter.
+    """
+    last_id = _last_copied_id(conn, target)
+    if last_id:
+        logger.info(f"Migration wird ab Session-ID {last_id} fortgesetzt")
+    copied = 0
+    while True:
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            for sql in statements:
+                rows = conn.execute(sql, (last_id, batch_size)).rowcount
+            last_id = _last_copied_id(conn, target)
+        copied += rows
+        if rows < batch_size:
+            break
+        logger.info(f"Migration: {copied} Session(s) kopiert")
+
+
+def _swap_sessions(conn: sqlite3.Connection, target: str, statements: Sequence[str]) -> None:
+    """Rest kopieren, alte app_sessions (samt Triggern und Indizes) durch ``target`` ersetzen."""
+    last_id = _last_copied_id(conn, target)
+    for sql in statements:
+        conn.execute(sql, (last_id, -1))
+    # AUTOINCREMENT-Zähler übernehmen: IDs gelöschter Sessions bleiben vergeben
+    conn.execute("DELETE FROM sqlite_sequence WHERE name = ?", (target,))
+    conn.execute("UPDATE sqlite_sequence SET name = ? WHERE name = 'app_sessions'", (target,))
+    conn.execute("DROP TABLE app_sessions")
+    conn.execute(f"ALTER TABLE {target} RENAME TO app_sessions")
+
+
+def _copy_sessions_v2(conn: sqlite3.Connection, batch_size: int) -> None:
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute(SQL_CREATE_SESSIONS_V2)
+        for sql in SQL_CREATE_INDEXES_V2:
+            conn.execute(sql)
+    _copy_in_batches(conn, "app_sessions_v2", [SQL_COPY_SESSIONS_V2], batch_size)
+
+
+def _swap_sessions_v2(conn: sqlite3.Connection) -> None:
+    _swap_sessions(conn, "app_sessions_v2", [SQL_COPY_SESSIONS_V2])
+    conn.execute(SQL_CREATE_DAILY_TRIGGER_V2)
+    conn.execute(SQL_CREATE_HOURLY_TRIGGER_V2)
+
+
+# ========== VERSION 3: LOOKUP-TABELLEN FÜR APP-NAMEN UND -PFADE ==========
+# Sessions und Rollups verweisen per Ganzzahl auf apps bzw. app_paths,
+# statt Namen und Pfade in jeder Zeile zu wiederholen. GROUP BY und
+# Primärschlüssel der Rollups laufen damit auf Ganzzahlen.
+
+SQL_CREATE_LOOKUPS = (
+    f"""
+    CREATE TABLE IF NOT EXISTS apps (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL UNIQUE
+    ){_STRICT}
+    """,
+    f"""
+    CREATE TABLE IF NOT EXISTS app_paths (
+        id INTEGER PRIMARY KEY,
+        path TEXT NOT NULL UNIQUE
+    ){_STRICT}
+    """,
+)
+
+SQL_CREATE_SESSIONS_V3 = f"""
+    CREATE TABLE IF NOT EXISTS app_sessions_v3 (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        app_id INTEGER NOT NULL REFERENCES apps (id),
+        path_id INTEGER REFERENCES app_paths (id),
+        start_ms INTEGER NOT NULL,
+        end_ms INTEGER,
+        duration_seconds INTEGER,
+        total_duration_seconds INTEGER,
+        day INTEGER NOT NULL,
+        hour INTEGER NOT NULL
+    ){_STRICT}
+"""
+
+SQL_CREATE_INDEXES_V3 = (
+    "CREATE INDEX IF NOT EXISTS idx_sessions_start ON app_sessions_v3 (start_ms)",
+    "CREATE INDEX IF NOT EXISTS idx_sessions_app_start ON app_sessions_v3 "
+    "(app_id, start_ms, duration_seconds, total_duration_seconds)",
+)
+
+# Pro Batch: erst unbekannte Namen und Pfade anlegen, dann kopieren
+SQL_FILL_APPS_V3 = """
+    INSERT OR IGNORE INTO apps (name)
+    SELECT app_name FROM app_sessions
+    WHERE id > ?1
+    ORDER BY id
+    LIMIT ?2
+"""
+
+SQL_FILL_PATHS_V3 = """
+    INSERT OR IGNORE INTO app_paths (path)
+    SELECT app_path FROM (
+        SELECT app_path FROM app_sessions
+        WHERE id > ?1
+        ORDER BY id
+        LIMIT ?2
+    )
+    WHERE app_path IS NOT NULL
+"""
+
+SQL_COPY_SESSIONS_V3 = """
+    INSERT INTO app_sessions_v3
+        (id, app_id, path_id, start_ms, end_ms,
+         duration_seconds, total_duration_seconds, day, hour)
+    SELECT
+        s.id, a.id, p.id, s.start_ms, s.end_ms,
+        s.duration_seconds, s.total_duration_seconds, s.day, s.hour
+    FROM app_sessions s
+    JOIN apps a ON a.name = s.app_name
+    LEFT JOIN app_paths p ON p.path = s.app_path
+    WHERE s.id > ?1
+    ORDER BY s.id
+    LIMIT ?2
+"""
+
+_COPY_STATEMENTS_V3 = (SQL_FILL_APPS_V3, SQL_FILL_PATHS_V3, SQL_COPY_SESSIONS_V3)
+
+# Rollups: Apps, deren Roh-Sessions schon gelöscht sind, gibt es nur hier
+SQL_FILL_APPS_FROM_ROLLUPS = (
+    "INSERT OR IGNORE INTO apps (name) SELECT DISTINCT app_name FROM app_daily_stats",
+    "INSERT OR IGNORE INTO apps (name) SELECT DISTINCT app_name FROM app_hourly_stats",
+)
+
+SQL_CREATE_ROLLUPS_V3 = (
+    f"""
+    CREATE TABLE app_daily_stats_v3 (
+        app_id INTEGER NOT NULL,
+        date TEXT NOT NULL,
+        opens INTEGER NOT NULL DEFAULT 0,
+        focus_seconds INTEGER NOT NULL DEFAULT 0,
+        total_seconds INTEGER NOT NULL DEFAULT 0,
+        first_start TEXT,
+        PRIMARY KEY (app_id, date)
+    ) WITHOUT ROWID{_STRICT_OPTION}
+    """,
+    f"""
+    CREATE TABLE app_hourly_stats_v3 (
+        app_id INTEGER NOT NULL,
+        hour TEXT NOT NULL,
+        opens INTEGER NOT NULL DEFAULT 0,
+        focus_seconds INTEGER NOT NULL DEFAULT 0,
+        total_seconds INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (app_id, hour)
+    ) WITHOUT ROWID{_STRICT_OPTION}
+    """,
+)
+
+SQL_COPY_ROLLUPS_V3 = (
+    """
+    INSERT INTO app_daily_stats_v3
+    SELECT a.id, s.date, s.opens, s.focus_seconds, s.total_seconds, s.first_start
+    FROM app_daily_stats s JOIN apps a ON a.name = s.app_name
+    """,
+    """
+    INSERT INTO app_hourly_stats_v3
+    SELECT a.id, s.hour, s.opens, s.focus_seconds, s.total_seconds
+    FROM app_hourly_stats s JOIN apps a ON a.name = s.app_name
+    """,
+)
+
+SQL_CREATE_DAILY_TRIGGER_V3 = """
+    CREATE TRIGGER trg_sessions_daily_stats
+    AFTER INSERT ON app_sessions
+    BEGIN
+        INSERT INTO app_daily_stats
+            (app_id, date, opens, focus_seconds, total_seconds, first_start)
+        VALUES (
+            NEW.app_id,
+            date(COALESCE(NEW.end_ms, NEW.start_ms) / 1000, 'unixepoch'),
+            1,
+            COALESCE(NEW.duration_seconds, 0),
+            COALESCE(NEW.total_duration_seconds, 0),
+            strftime('%Y-%m-%d %H:%M:%S', NEW.start_ms / 1000, 'unixepoch', 'localtime')
+        )
+        ON CONFLICT (app_id, date) DO UPDATE SET
+            opens = opens + 1,
+            focus_seconds = focus_seconds + excluded.focus_seconds,
+            total_seconds = total_seconds + excluded.total_seconds,
+            first_start = MIN(first_start, excluded.first_start);
+    END
+"""
+
+SQL_CREATE_HOURLY_TRIGGER_V3 = """
+    CREATE TRIGGER trg_sessions_hourly_stats
+    AFTER INSERT ON app_sessions
+    BEGIN
+        INSERT INTO app_hourly_stats
+            (app_id, hour, opens, focus_seconds, total_seconds)
+        VALUES (
+            NEW.app_id,
+            date(NEW.day * 86400, 'unixepoch') || printf(' %02d', NEW.hour),
+            1,
+            COALESCE(NEW.duration_seconds, 0),
+            COALESCE(NEW.total_duration_seconds, 0)
+        )
+        ON CONFLICT (app_id, hour) DO UPDATE SET
+            opens = opens + 1,
+            focus_seconds = focus_seconds + excluded.focus_seconds,
+            total_seconds = total_seconds + excluded.total_seconds;
+    END
+"""
+
+
+def _copy_sessions_v3(conn: sqlite3.Connection, batch_size: int) -> None:
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        for sql in SQL_CREATE_LOOKUPS:
+            conn.execute(sql)
+        conn.execute(SQL_CREATE_SESSIONS_V3)
+        for sql in SQL_CREATE_INDEXES_V3:
+            conn.execute(sql)
+    _copy_in_batches(conn, "app_sessions_v3", _COPY_STATEMENTS_V3, batch_size)
+
+
+def _swap_sessions_v3(conn: sqlite3.Connection) -> None:
+    """Sessions tauschen, danach die Rollups auf app_id umstellen."""
+    _swap_sessions(conn, "app_sessions_v3", _COPY_STATEMENTS_V3)
+
+    # Erst nach dem Tausch: die alten Trigger verweisen auf die Rollups
+    for sql in SQL_FILL_APPS_FROM_ROLLUPS + SQL_CREATE_ROLLUPS_V3 + SQL_COPY_ROLLUPS_V3:
+        conn.execute(sql)
+    for table in ("app_daily_stats", "app_hourly_stats"):
+        conn.execute(f"DROP TABLE {table}")
+        conn.execute(f"ALTER TABLE {table}_v3 RENAME TO {table}")
+
+    conn.execute(SQL_CREATE_DAILY_TRIGGER_V3)
+    conn.execute(SQL_CREATE_HOURLY_TRIGGER_V3)
+
+
+# ========== V4: INKREMENTELLES VACUUM ==========
+
+def _enable_incremental_vacuum(conn: sqlite3.Connection, batch_size: int) -> None:
+    """Stelle bestehende DBs einmalig auf ``auto_vacuum=INCREMENTAL`` um.
+
+    Das PRAGMA wirkt bei einer DB mit Tabellen erst nach einem VACUUM –
+    ohne diesen Schritt bliebe ``incremental_vacuum`` (Aufbewahrung) dort
+    wirkungslos. VACUUM läuft außerhalb einer Transaktion; neue DBs sind
+    schon beim Anlegen umgestellt und werden übersprungen.
+    """
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+        return
+    conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    conn.execute("VACUUM")
+
+
+def _check_incremental_vacuum(conn: sqlite3.Connection) -> None:
+    """Nur noch prüfen; der Umbau selbst lief in ``_enable_incremental_vacuum``."""
+    mode = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+    if mode != 2:
+        raise DatabaseError(f"auto_vacuum={mode} nach VACUUM, erwartet 2 (INCREMENTAL)")
+
+
+# ========== V5: EINDEUTIGE SESSIONS ==========
+# Eine App hat nie zwei Sessions mit demselben Start und Ende. Der Writer
+# trägt Auslagerung und Checkpoint-Wiederherstellung per INSERT OR IGNORE
+# ein; nach einem Absturz zwischen Commit und Aufräumen wird eine Session
+# so nicht doppelt gezählt.
+
+SQL_CREATE_UNIQUE_INDEX_V5 = (
+    "CREATE UNIQUE INDEX idx_sessions_identity ON app_sessions (app_id, start_ms, end_ms)"
+)
+
+# Bereits doppelt gespeicherte Sessions (ältere Versionen); die erste bleibt
+SQL_FIND_DUPLICATES_V5 = """
+    CREATE TEMP TABLE duplicate_sessions AS
+    SELECT s.* FROM app_sessions s
+    WHERE s.end_ms IS NOT NULL AND EXISTS (
+        SELECT 1 FROM app_sessions o
+        WHERE o.app_id = s.app_id AND o.start_ms = s.start_ms
+          AND o.end_ms = s.end_ms AND o.id < s.id
+    )
+"""
+
+# Rollups zurückrechnen: dieselben Schlüssel wie in den V3-Triggern. Die
+# Zeilen existieren immer, der Upsert zieht also nur ab.
+SQL_UNCOUNT_DUPLICATES_V5 = (
+    """
+    INSERT INTO app_daily_stats (app_id, date, opens, focus_seconds, total_seconds)
+    SELECT
+        app_id, date(end_ms / 1000, 'unixepoch'), COUNT(*),
+        SUM(COALESCE(duration_seconds, 0)), SUM(COALESCE(total_duration_seconds, 0))
+    FROM duplicate_sessions
+    GROUP BY 1, 2
+    ON CONFLICT (app_id, date) DO UPDATE SET
+        opens = opens - excluded.opens,
+        focus_seconds = focus_seconds - excluded.focus_seconds,
+        total_seconds = total_seconds - excluded.total_seconds
+    """,
+    """
+    INSERT INTO app_hourly_stats (app_id, hour, opens, focus_seconds, total_seconds)
+    SELECT
+        app_id, date(day * 86400, 'unixepoch') || printf(' %02d', hour), COUNT(*),
+        SUM(COALESCE(duration_seconds, 0)), SUM(COALESCE(total_duration_seconds, 0))
+    FROM duplicate_sessions
+    GROUP BY 1, 2
+    ON CONFLICT (app_id, hour) DO UPDATE SET
+        opens = opens - excluded.opens,
+        focus_seconds = focus_seconds - excluded.focus_seconds,
+        total_seconds = total_seconds - excluded.total_seconds
+    """,
+    "DELETE FROM app_sessions WHERE id IN (SELECT id FROM duplicate_sessions)",
+)
+
+
+def _create_unique_index(conn: sqlite3.Connection) -> None:
+    """Doppelte Sessions entfernen (samt Rollup-Anteil), dann Unique-Index anlegen."""
+    conn.execute(SQL_FIND_DUPLICATES_V5)
+    removed = conn.execute("SELECT COUNT(*) FROM duplicate_sessions").fetchone()[0]
+    if removed:
+        for sql in SQL_UNCOUNT_DUPLICATES_V5:
+            conn.execute(sql)
+        logger.warning(f"{removed} doppelt gespeicherte Session(s) entfernt")
+    conn.execute("DROP TABLE temp.duplicate_sessions")
+    conn.execute(SQL_CREATE_UNIQUE_INDEX_V5)
+
+
+# ========== ABLAUF ==========
+
+class Migration(NamedTuple):
+    """Ein Schritt von ``version - 1`` auf ``version``."""
+
+    version: int
+    description: str
+    # Läuft atomar zusammen mit dem Setzen von user_version
+    finish: Callable[[sqlite3.Connection], None]
+    # Optional vorab: große Datenmengen in eigenen Transaktionen, wiederaufnehmbar
+    prepare: Optional[Callable[[sqlite3.Connection, int], None]] = None
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "Ausgangsschema mit Tages- und Stunden-Rollup", _create_base_schema),
+    Migration(2, "app_sessions als STRICT-Tabelle mit Epoch-Millisekunden",
+              _swap_sessions_v2, _copy_sessions_v2),
+    Migration(3, "Lookup-Tabellen apps und app_paths, Ganzzahl-Schlüssel",
+              _swap_sessions_v3, _copy_sessions_v3),
+    Migration(4, "auto_vacuum=INCREMENTAL für bestehende Datenbanken",
+              _check_incremental_vacuum, _enable_incremental_vacuum),
+    Migration(5, "Unique-Index gegen doppelt nachgetragene Sessions", _create_unique_index),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1].version
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    """Aktuelle Schema-Version (``PRAGMA user_version``)."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection, batch_size: int = MIGRATION_BATCH_SIZE) -> int:
+    """Bringe das Schema auf ``SCHEMA_VERSION``.
+
+    Args:
+        conn: Schreib-Verbindung (ohne offene Transaktion)
+        batch_size: Zeilen pro Transaktion beim Kopieren großer Tabellen
+
+    Returns:
+        int: Schema-Version danach
+
+    Raises:
+        DatabaseError: Wenn die DB neuer ist als diese Programmversion
+        sqlite3.Error: Wenn eine Migration fehlschlägt (die aktuelle
+            Version bleibt dann unverändert)
+    """
+    version = schema_version(conn)
+    if version > SCHEMA_VERSION:
+        raise DatabaseError(
+            f"Schema-Version {version} ist neuer als unterstützt ({SCHEMA_VERSION})"
+        )
+    # Beim Anlegen einer neuen DB nur auf Debug-Level melden
+    fresh = conn.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()[0] == 0
+
+    for migration in MIGRATIONS[version:]:
+        log = logger.debug if fresh else logger.info
+        log(f"Migration auf Version {migration.version}: {migration.description}")
+        if migration.prepare is not None:
+            migration.prepare(conn, batch_size)
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            migration.finish(conn)
+            conn.execute(f"PRAGMA user_version = {migration.version}")
+        version = migration.version
+
+    return version
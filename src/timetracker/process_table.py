@@ -0,0 +1,226 @@
+"""Prozesstabelle mit Snapshot-und-Diff für TimeTracker."""
+
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+import psutil
+
+from .config import PID_CACHE_SIZE
+from .logger_config import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class ProcessInfo(NamedTuple):
+    """Ein Prozess aus einem Snapshot.
+
+    Ein Prozess wird eindeutig über (pid, create_time) identifiziert,
+    damit wiederverwendete PIDs nicht als derselbe Prozess gelten.
+    """
+
+    pid: int
+    name: str          # Prozessname, lowercase (z.B. "notepad.exe")
+    create_time: float  # Startzeitpunkt als Epoch-Sekunden
+
+    @property
+    def key(self) -> Tuple[int, float]:
+        """Eindeutiger Schlüssel (pid, create_time)."""
+        return self.pid, self.create_time
+
+
+ProcessKey = Tuple[int, float]
+SnapshotFn = Callable[[], Iterable[ProcessInfo]]
+DetailsFn = Callable[[int], Tuple[Optional[str], Optional[str]]]
+CreateTimeFn = Callable[[int], Optional[float]]
+
+
+class ProcessMeta(NamedTuple):
+    """Gecachte Metadaten eines Prozesses."""
+
+    name: Optional[str]
+    exe: Optional[str]
+    create_time: float
+
+
+def psutil_snapshot() -> List[ProcessInfo]:
+    """Erstelle einen Snapshot aller laufenden Prozesse über psutil.
+
+    Returns:
+        List[ProcessInfo]: Alle lesbaren Prozesse
+    """
+    snapshot = []
+    for proc in psutil.process_iter(["name", "create_time"]):
+        info = proc.info
+        name = info.get("name")
+        create_time = info.get("create_time")
+        # Prozesse ohne lesbaren Namen (AccessDenied) sind für uns irrelevant
+        if not name or create_time is None:
+            continue
+        snapshot.append(ProcessInfo(proc.pid, name.lower(), create_time))
+    return snapshot
+
+
+class ProcessTable:
+    """Hält den letzten Prozess-Snapshot und liefert Start/Exit-Events.
+
+    Pro Tick wird genau ein Snapshot erstellt und mit dem vorherigen
+    verglichen. Liveness-Abfragen (``is_running``) sind danach reine
+    Dict-Lookups statt eines Scans über alle Prozesse.
+    """
+
+    def __init__(self, snapshot_fn: Optional[SnapshotFn] = None) -> None:
+        """Initialisiere die Prozesstabelle.
+
+        Args:
+            snapshot_fn: Liefert die aktuell laufenden Prozesse
+                (Standard: psutil.process_iter)
+        """
+        self._snapshot_fn: SnapshotFn = snapshot_fn or psutil_snapshot
+        self._processes: Dict[ProcessKey, ProcessInfo] = {}
+        self._by_name: Dict[str, Set[ProcessKey]] = {}
+        self._by_pid: Dict[int, ProcessInfo] = {}
+
+    def refresh(self) -> Tuple[List[ProcessInfo], List[ProcessInfo]]:
+        """Erstelle einen neuen Snapshot und vergleiche ihn mit dem letzten.
+
+        Returns:
+            Tuple: (gestartete Prozesse, beendete Prozesse)
+        """
+        try:
+            current = {info.key: info for info in self._snapshot_fn()}
+        except Exception as e:
+            # Bei Fehlern alten Stand behalten statt alle Prozesse zu "beenden"
+            logger.debug(f"Fehler beim Erstellen des Prozess-Snapshots: {e}")
+            return [], []
+
+        previous = self._processes
+        started = [info for key, info in current.items() if key not in previous]
+        exited = [info for key, info in previous.items() if key not in current]
+
+        for info in exited:
+            self._unindex(info)
+        for info in started:
+            self._by_name.setdefault(info.name, set()).add(info.key)
+            self._by_pid[info.pid] = info
+
+        self._processes = current
+        return started, exited
+
+    def _unindex(self, info: ProcessInfo) -> None:
+        """Entferne einen Prozess aus Namens- und PID-Index."""
+        if self._by_pid.get(info.pid) == info:
+            del self._by_pid[info.pid]
+        keys = self._by_name.get(info.name)
+        if keys is None:
+            return
+        keys.discard(info.key)
+        if not keys:
+            del self._by_name[info.name]
+
+    def is_running(self, name: str) -> bool:
+        """Prüfe ob laut letztem Snapshot ein Prozess mit diesem Namen läuft.
+
+        Args:
+            name: Prozessname (lowercase)
+
+        Returns:
+            bool: True wenn mindestens ein Prozess läuft
+        """
+        return name in self._by_name
+
+    def instances(self, name: str) -> List[ProcessInfo]:
+        """Hole alle laufenden Prozesse mit diesem Namen.
+
+        Args:
+            name: Prozessname (lowercase)
+
+        Returns:
+            List[ProcessInfo]: Laufende Instanzen (ggf. leer)
+        """
+        return [self._processes[key] for key in self._by_name.get(name, ())]
+
+    def get(self, key: ProcessKey) -> Optional[ProcessInfo]:
+        """Hole einen Prozess anhand von (pid, create_time)."""
+        return self._processes.get(key)
+
+    def by_pid(self, pid: int) -> Optional[ProcessInfo]:
+        """Hole den aktuell laufenden Prozess mit dieser PID."""
+        return self._by_pid.get(pid)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._processes
+
+    def __len__(self) -> int:
+        return len(self._processes)
+
+
+class PidCache:
+    """Begrenzter LRU-Cache pid → (name, exe, create_time).
+
+    Name und Pfad eines Prozesses ändern sich nicht, ihre Abfrage (auf
+    Windows ein Handle-Open plus Pfad-Query) ist aber teuer. Ein Treffer
+    wird gegen die aktuelle create_time der PID geprüft – live, nicht aus
+    dem letzten Snapshot, der bis zu LIVENESS_INTERVAL_WATCHED alt sein
+    kann –, damit eine wiederverwendete PID nie die Daten des alten
+    Prozesses liefert.
+    """
+
+    def __init__(self, details_fn: DetailsFn, create_time_fn: CreateTimeFn,
+                 size: int = PID_CACHE_SIZE) -> None:
+        """Initialisiere den Cache.
+
+        Args:
+            details_fn: Ermittelt (name, exe) einer PID (z.B. Backend)
+            create_time_fn: Liefert die aktuelle create_time einer PID
+                (None wenn beendet), z.B. ``PlatformBackend.create_time``
+            size: Max. Anzahl Einträge
+        """
+        self._details_fn = details_fn
+        self._create_time_fn = create_time_fn
+        self._size = size
+        self._entries: "OrderedDict[int, ProcessMeta]" = OrderedDict()
+
+        # Zähler für Diagnose
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, pid: int) -> Tuple[Optional[str], Optional[str]]:
+        """Hole Name und Pfad eines Prozesses.
+
+        Args:
+            pid: Prozess-ID
+
+        Returns:
+            Tuple: (name, exe), jeweils None wenn nicht ermittelbar
+        """
+        create_time = self._create_time_fn(pid)
+        entry = self._entries.get(pid)
+        if entry is not None and create_time is not None and entry.create_time == create_time:
+            self._entries.move_to_end(pid)
+            self.hits += 1
+            return entry.name, entry.exe
+
+        self.misses += 1
+        name, exe = self._details_fn(pid)
+
+        # Ohne bekannte create_time lässt sich der Eintrag nicht validieren.
+        # Wurde die PID während der Abfrage neu vergeben, gehören name/exe
+        # evtl. schon zum neuen Prozess → nicht cachen
+        if create_time is None or name is None or self._create_time_fn(pid) != create_time:
+            self._entries.pop(pid, None)
+            return name, exe
+
+        self._entries[pid] = ProcessMeta(name, exe, create_time)
+        self._entries.move_to_end(pid)
+        if len(self._entries) > self._size:
+            self._entries.popitem(last=False)
+        return name, exe
+
+    def evict(self, info: ProcessInfo) -> None:
+        """Entferne den Eintrag eines beendeten Prozesses."""
+        entry = self._entries.get(info.pid)
+        if entry is not None and entry.create_time == info.create_time:
+            del self._entries[info.pid]
+
+    def __len__(self) -> int:
+        return len(self._entries)
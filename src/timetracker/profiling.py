@@ -0,0 +1,316 @@
+"""Profiling-Modus für lang laufende Tracker-Sessions.
+
+Ein Sampling-Profiler liest in festen Abständen die Stacks aller Threads
+(``sys._current_frames``), ``tracemalloc`` liefert Speicher-Snapshots.
+In jedem Dump-Intervall entsteht ein Text-Report (Top-Funktionen,
+Top-Allokationen und deren Zuwachs seit dem letzten Dump) sowie eine
+``.folded``-Datei mit gesammelten Stacks für Flamegraph-Tools.
+"""
+
+import os
+import sys
+import threading
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from types import CodeType
+from typing import Dict, List, Optional, Tuple
+
+from .config import (
+    PROFILE_DIR,
+    PROFILE_DUMP_INTERVAL,
+    PROFILE_KEEP,
+    PROFILE_SAMPLE_INTERVAL,
+    PROFILE_TOP_N,
+    PROFILE_TRACEMALLOC_FRAMES,
+)
+from .logger_config import setup_logger
+
+logger = setup_logger(__name__)
+
+# Max. Anzahl Frames pro gesampeltem Stack
+_MAX_DEPTH = 64
+
+# Blatt-Frames, in denen ein Thread nur wartet (zählen nicht als CPU-Zeit)
+_IDLE_LEAVES = {
+    ("threading.py", "wait"),
+    ("queue.py", "get"),
+    ("handlers.py", "dequeue"),          # QueueListener an SimpleQueue.get
+    ("selectors.py", "select"),
+    ("socketserver.py", "serve_forever"),
+}
+
+Stack = Tuple[CodeType, ...]
+
+
+def _describe(code: CodeType) -> str:
+    """Lesbare Bezeichnung eines Code-Objekts (``datei:funktion:zeile``)."""
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}:{code.co_firstlineno}"
+
+
+class SamplingProfiler:
+    """Sammelt Stacks aller Threads in einem Hintergrund-Thread.
+
+    Pro Sample wird nur ein Tupel von Code-Objekten gezählt, aufgelöst
+    wird erst beim Dump. Bei 10 Hz kostet das auch im Dauerbetrieb
+    praktisch keine CPU.
+    """
+
+    def __init__(self, interval: float = PROFILE_SAMPLE_INTERVAL) -> None:
+        """Initialisiere den Profiler (noch ohne Thread).
+
+        Args:
+            interval: Abstand zwischen zwei Samples in Sekunden
+        """
+        self.interval = interval
+        self.stacks: Dict[Stack, int] = {}
+        self.samples = 0
+        self.idle_samples = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Starte den Sampler-Thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="Profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Beende den Sampler-Thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def sample(self) -> None:
+        """Lies die aktuellen Stacks aller anderen Threads."""
+        own = threading.get_ident()
+        frames = sys._current_frames()
+        with self._lock:
+            for ident, frame in frames.items():
+                if ident == own:
+                    continue
+                code = frame.f_code
+                if (os.path.basename(code.co_filename), code.co_name) in _IDLE_LEAVES:
+                    self.idle_samples += 1
+                    continue
+
+                stack: List[CodeType] = []
+                while frame is not None and len(stack) < _MAX_DEPTH:
+                    stack.append(frame.f_code)
+                    frame = frame.f_back
+                key = tuple(reversed(stack))
+                self.stacks[key] = self.stacks.get(key, 0) + 1
+                self.samples += 1
+
+    def take(self) -> Tuple[Dict[Stack, int], int, int]:
+        """Gib die gesammelten Stacks zurück und beginne von vorn.
+
+        Returns:
+            Tuple: (Stacks mit Anzahl, aktive Samples, wartende Samples)
+        """
+        with self._lock:
+            result = (self.stacks, self.samples, self.idle_samples)
+            self.stacks = {}
+            self.samples = 0
+            self.idle_samples = 0
+        return result
+
+
+class Profiler:
+    """CPU-Sampling plus tracemalloc, mit rotierenden Dumps.
+
+    Verwendung::
+
+        with Profiler():
+            tracker.start_monitoring()
+    """
+
+    def __init__(self, output_dir: Path | str = PROFILE_DIR,
+                 dump_interval: float = PROFILE_DUMP_INTERVAL,
+                 sample_interval: float = PROFILE_SAMPLE_INTERVAL,
+                 keep: int = PROFILE_KEEP,
+                 top_n: int = PROFILE_TOP_N,
+                 tracemalloc_frames: int = PROFILE_TRACEMALLOC_FRAMES) -> None:
+        """Initialisiere den Profiler.
+
+        Args:
+            output_dir: Zielordner der Dumps
+            dump_interval: Abstand zwischen zwei Dumps in Sekunden
+            sample_interval: Abstand zwischen zwei Stack-Samples in Sekunden
+            keep: Anzahl aufbewahrter Dumps
+            top_n: Einträge pro Top-Liste
+            tracemalloc_frames: Stack-Tiefe pro Allokation
+        """
+        self.output_dir = Path(output_dir)
+        self.dump_interval = dump_interval
+        self.keep = keep
+        self.top_n = top_n
+        self.tracemalloc_frames = tracemalloc_frames
+        self.sampler = SamplingProfiler(sample_interval)
+        self.dumps = 0
+
+        self._snapshot: Optional[tracemalloc.Snapshot] = None
+        self._owns_tracemalloc = False
+        self._started_at = datetime.now()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_config(cls, config: dict) -> "Profiler":
+        """Erstelle einen Profiler aus den optionalen Config-Schlüsseln.
+
+        ``profile_dir``, ``profile_interval`` (Dump-Abstand) und
+        ``profile_sample_interval`` überschreiben die Standardwerte.
+        """
+        return cls(
+            output_dir=config.get("profile_dir", PROFILE_DIR),
+            dump_interval=float(config.get("profile_interval", PROFILE_DUMP_INTERVAL)),
+            sample_interval=float(config.get("profile_sample_interval", PROFILE_SAMPLE_INTERVAL)),
+        )
+
+    def start(self) -> None:
+        """Starte tracemalloc, den Sampler und den Dump-Thread."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.tracemalloc_frames)
+            self._owns_tracemalloc = True
+        self._snapshot = self._take_snapshot()
+        self._started_at = datetime.now()
+        self.sampler.start()
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="ProfilerDump", daemon=True)
+        self._thread.start()
+        logger.info(
+            f"Profiling aktiv: {1 / self.sampler.interval:.0f} Hz, "
+            f"Dump alle {self.dump_interval:.0f}s nach {self.output_dir}"
+        )
+
+    def stop(self) -> None:
+        """Beende alle Threads und schreibe einen letzten Dump."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.sampler.stop()
+        self.dump()
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+
+    def __enter__(self) -> "Profiler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.dump_interval):
+            self.dump()
+
+    @staticmethod
+    def _take_snapshot() -> tracemalloc.Snapshot:
+        """Snapshot ohne die Allokationen von tracemalloc selbst."""
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+
+    # ========== DUMP ==========
+
+    def dump(self) -> Optional[Path]:
+        """Schreibe Report und gesammelte Stacks, rotiere alte Dumps.
+
+        Returns:
+            Path: Pfad des Reports (None bei Schreibfehler)
+        """
+        now = datetime.now()
+        stacks, samples, idle = self.sampler.take()
+        lines = [
+            f"TimeTracker-Profil {self._started_at:%Y-%m-%d %H:%M:%S} – {now:%Y-%m-%d %H:%M:%S}",
+            "",
+        ]
+        lines += self._cpu_report(stacks, samples, idle)
+        lines.append("")
+        lines += self._memory_report()
+        self._started_at = now
+
+        stem = f"profile-{now:%Y%m%d-%H%M%S}-{self.dumps:04d}"
+        report_path = self.output_dir / f"{stem}.txt"
+        try:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            report_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+            (self.output_dir / f"{stem}.folded").write_text(
+                "".join(
+                    f"{';'.join(_describe(code) for code in stack)} {count}\n"
+                    for stack, count in stacks.items()
+                ),
+                encoding="utf-8",
+            )
+        except OSError as e:
+            logger.warning(f"Profil-Dump fehlgeschlagen: {e}")
+            return None
+
+        self.dumps += 1
+        self._rotate()
+        logger.info(f"Profil geschrieben: {report_path}")
+        return report_path
+
+    def _cpu_report(self, stacks: Dict[Stack, int], samples: int, idle: int) -> List[str]:
+        """Top-Funktionen nach Eigenzeit und kumulierter Zeit."""
+        own: Dict[CodeType, int] = {}
+        cumulative: Dict[CodeType, int] = {}
+        for stack, count in stacks.items():
+            own[stack[-1]] = own.get(stack[-1], 0) + count
+            # Rekursion nur einmal pro Stack zählen
+            for code in set(stack):
+                cumulative[code] = cumulative.get(code, 0) + count
+
+        lines = [
+            "== CPU (Sampling) ==",
+            f"Samples: {samples} aktiv, {idle} wartend "
+            f"(Intervall {self.sampler.interval * 1000:.0f} ms)",
+        ]
+        for title, counts in (("Eigenzeit", own), ("Kumuliert", cumulative)):
+            lines.append(f"-- Top {self.top_n} {title} --")
+            top = sorted(counts.items(), key=lambda item: item[1], reverse=True)[:self.top_n]
+            for code, count in top:
+                lines.append(f"{count:8d} {count / samples:7.1%}  {_describe(code)}")
+        return lines
+
+    def _memory_report(self) -> List[str]:
+        """Top-Allokationen und Zuwachs seit dem letzten Snapshot."""
+        if not tracemalloc.is_tracing():
+            return ["== Speicher ==", "tracemalloc nicht aktiv"]
+
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = self._take_snapshot()
+        lines = [
+            "== Speicher (tracemalloc) ==",
+            f"Aktuell: {current / 1024:.1f} KiB, Spitze: {peak / 1024:.1f} KiB",
+            f"-- Top {self.top_n} Allokationen --",
+        ]
+        lines += [str(stat) for stat in snapshot.statistics("lineno")[:self.top_n]]
+
+        if self._snapshot is not None:
+            lines.append(f"-- Top {self.top_n} Zuwachs seit letztem Dump --")
+            diff = snapshot.compare_to(self._snapshot, "lineno")
+            lines += [str(stat) for stat in diff[:self.top_n] if stat.size_diff]
+        self._snapshot = snapshot
+        return lines
+
+    def _rotate(self) -> None:
+        """Lösche die ältesten Dumps über ``keep`` hinaus."""
+        reports = sorted(self.output_dir.glob("profile-*.txt"))
+        for old in reports[:max(0, len(reports) - self.keep)]:
+            for path in (old, old.with_suffix(".folded")):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
@@ -0,0 +1,183 @@
+"""Zeitraum-Reports: Fokus- und Gesamtzeit pro App in Zeit-Buckets.
+
+Grundlage ist das stündliche Rollup ``app_hourly_stats`` (lokale Zeit,
+Stunde des Session-Starts). Ein Report liest damit höchstens eine Zeile
+pro App und Stunde über einen Bereichs-Scan auf dem Primärschlüssel
+(app_id, hour) und fasst sie per SQL zu Buckets zusammen; der Anteil
+jeder App an der Fokuszeit eines Buckets kommt aus einer Window-Funktion.
+"""
+
+import json
+from datetime import datetime, timedelta
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+from .config import REPORT_BUCKETS
+from .database import Database
+from .exceptions import TimeTrackerError
+from .logger_config import setup_logger
+from .matcher import AppMatcher
+
+logger = setup_logger(__name__)
+
+# Bucket-Ausdruck auf der Spalte hour ('YYYY-MM-DD HH')
+_BUCKET_EXPRESSIONS = {
+    "hour": "hour",
+    "day": "substr(hour, 1, 10)",
+    # Montag der Woche ('weekday 0' = nächster Sonntag, oder derselbe Tag)
+    "week": "date(substr(hour, 1, 10), 'weekday 0', '-6 days')",
+    "month": "substr(hour, 1, 7)",
+    # 0 = Montag … 6 = Sonntag
+    "weekday": "(CAST(strftime('%w', substr(hour, 1, 10)) AS INTEGER) + 6) % 7",
+}
+
+WEEKDAYS = ("Mo", "Di", "Mi", "Do", "Fr", "Sa", "So")
+
+_SQL_BUCKETS = """
+    SELECT
+        app_id,
+        {bucket} AS bucket,
+        SUM(opens) AS opens,
+        SUM(focus_seconds) AS focus_seconds,
+        SUM(total_seconds) AS total_seconds
+    FROM app_hourly_stats
+    WHERE {apps}
+      AND hour >= ?1 AND hour < ?2
+    GROUP BY app_id, bucket
+"""
+
+# Stunden-Buckets sind bereits die Rollup-Zeilen: kein erneutes GROUP BY
+_SQL_BUCKETS_HOURLY = """
+    SELECT app_id, hour AS bucket, opens, focus_seconds, total_seconds
+    FROM app_hourly_stats
+    WHERE {apps}
+      AND hour >= ?1 AND hour < ?2
+"""
+
+# Die Window-Sortierung (bucket, app_name) deckt das ORDER BY ab, es wird
+# nur einmal sortiert. Gruppiert wird auf der Ganzzahl app_id, den Namen
+# liefert erst der Join auf apps. Eine zusätzliche laufende Summe pro App würde eine
+# zweite Sortierung kosten (~doppelte Laufzeit bei stündlichen Buckets).
+_SQL_REPORT = """
+    WITH buckets AS ({buckets})
+    SELECT
+        apps.name, bucket, opens, focus_seconds, total_seconds,
+        CAST(focus_seconds AS REAL) / SUM(focus_seconds) OVER (
+            PARTITION BY bucket ORDER BY apps.name
+            ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING
+        ) AS focus_share
+    FROM buckets
+    JOIN apps ON apps.id = buckets.app_id
+    ORDER BY bucket, apps.name
+"""
+
+# Mit App-Liste: Bereichs-Scan auf (app_id, hour) pro App
+_APPS_FILTER = "app_id IN (SELECT id FROM apps WHERE name IN (SELECT value FROM json_each(?3)))"
+
+# Bekannte Apps für den Abgleich mit target_apps-Regeln (auch Apps, deren
+# Roh-Sessions schon gelöscht sind); Pfade nur für Pfadregeln
+_SQL_APP_NAMES = "SELECT name FROM apps"
+_SQL_APP_PATHS = """
+    SELECT DISTINCT apps.name, app_paths.path
+    FROM app_sessions s
+    JOIN apps ON apps.id = s.app_id
+    JOIN app_paths ON app_paths.id = s.path_id
+"""
+
+# Fester Statement-Text pro (Bucket, mit/ohne App-Filter)
+_STATEMENTS: Dict[tuple, str] = {
+    (bucket, filtered): _SQL_REPORT.format(buckets=(
+        _SQL_BUCKETS_HOURLY if bucket == "hour" else _SQL_BUCKETS
+    ).format(bucket=expression, apps=_APPS_FILTER if filtered else "?3 IS NULL"))
+    for bucket, expression in _BUCKET_EXPRESSIONS.items()
+    for filtered in (True, False)
+}
+
+
+class ReportRow(NamedTuple):
+    """Eine App in einem Bucket."""
+
+    app_name: str
+    bucket: str | int                 # z.B. '2026-10-17 09', '2026-10', 0 (= Montag)
+    opens: int
+    focus_seconds: int
+    total_seconds: int
+    focus_share: Optional[float]      # Anteil an der Fokuszeit aller Apps im Bucket
+
+
+def _hour_key(moment: datetime, round_up: bool = False) -> str:
+    """Stunden-Schlüssel ('YYYY-MM-DD HH'), optional auf die volle Stunde aufgerundet."""
+    hour = moment.replace(minute=0, second=0, microsecond=0)
+    if round_up and hour != moment:
+        hour += timedelta(hours=1)
+    return hour.strftime("%Y-%m-%d %H")
+
+
+def bucket_label(bucket: str, value: str | int) -> str:
+    """Lesbare Bezeichnung eines Buckets (Wochentage als Kürzel)."""
+    if bucket == "weekday":
+        return WEEKDAYS[int(value)]
+    if bucket == "hour":
+        return f"{value}:00"
+    return str(value)
+
+
+def resolve_apps(db: Database, rules: Sequence[str]) -> List[str]:
+    """Alle gespeicherten Apps, auf die eine ``target_apps``-Regel passt.
+
+    Glob-, Regex- und Pfadregeln lassen sich nicht als exakter Namensfilter
+    an SQL geben; sie werden daher über den ``AppMatcher`` gegen die
+    bekannten App-Namen (und bei Pfadregeln deren Pfade) geprüft.
+
+    Args:
+        db: Datenbank
+        rules: Einträge aus ``target_apps``
+
+    Returns:
+        List[str]: Passende App-Namen, sortiert
+
+    Raises:
+        ConfigError: Bei ungültigen Regeln
+        DatabaseError: Wenn die Abfrage fehlschlägt
+    """
+    matcher = AppMatcher(rules)
+    apps = {name for (name,) in db.read(_SQL_APP_NAMES) if matcher.match(name)}
+    if matcher.needs_path:
+        apps.update(name for name, path in db.read(_SQL_APP_PATHS) if matcher.match(name, path))
+    return sorted(apps)
+
+
+def build_report(db: Database, since: datetime, until: datetime, bucket: str = "day",
+                 app_names: Optional[Sequence[str]] = None) -> List[ReportRow]:
+    """Fokus- und Gesamtzeit pro App und Bucket im Zeitraum [since, until).
+
+    Sessions zählen zur Stunde ihres Starts (lokale Zeit); die Grenzen
+    werden auf volle Stunden erweitert.
+
+    Args:
+        db: Datenbank
+        since: Beginn des Zeitraums
+        until: Ende des Zeitraums (exklusiv)
+        bucket: ``hour``, ``weekday``, ``day``, ``week`` oder ``month``
+        app_names: Nur diese Apps (None = alle)
+
+    Returns:
+        List[ReportRow]: Nach Bucket und App sortiert
+
+    Raises:
+        TimeTrackerError: Bei unbekanntem Bucket
+        DatabaseError: Wenn die Abfrage fehlschlägt
+    """
+    if bucket not in REPORT_BUCKETS:
+        raise TimeTrackerError(
+            f"Unbekannter Bucket: {bucket} (erlaubt: {', '.join(REPORT_BUCKETS)})"
+        )
+
+    sql = _STATEMENTS[(bucket, app_names is not None)]
+    params = (
+        _hour_key(since),
+        _hour_key(until, round_up=True),
+        json.dumps(list(app_names)) if app_names is not None else None,
+    )
+    rows = [ReportRow(*row) for row in db.read(sql, params)]
+    logger.debug(f"Report ({bucket}, {since} – {until}): {len(rows)} Zeile(n)")
+    return rows
@@ -0,0 +1,147 @@
+"""Aufbewahrung: alte Roh-Sessions löschen und Speicher zurückgeben.
+
+Die Tages- und Stunden-Rollups (app_daily_stats, app_hourly_stats)
+werden schon beim Einfügen jeder Session per Trigger fortgeschrieben und
+bleiben dauerhaft erhalten. Abgelaufene Zeilen in app_sessions sind damit
+bereits verdichtet und können einfach gelöscht werden – in kleinen
+Transaktionen, damit der Session-Writer des Trackers nie lange wartet.
+Freigewordene Seiten gibt ``PRAGMA incremental_vacuum`` schrittweise an
+das Dateisystem zurück.
+"""
+
+import threading
+from datetime import datetime, timedelta
+from typing import Optional
+
+from .config import (
+    RETENTION_BATCH_PAUSE,
+    RETENTION_BATCH_SIZE,
+    RETENTION_INTERVAL,
+    RETENTION_START_DELAY,
+    RETENTION_VACUUM_PAGES,
+)
+from .database import Database
+from .exceptions import ConfigError, DatabaseError
+from .logger_config import setup_logger
+from .metrics import REGISTRY
+
+logger = setup_logger(__name__)
+
+
+class Compactor:
+    """Löscht Roh-Sessions nach Ablauf der Aufbewahrungsdauer.
+
+    Läuft wahlweise einmalig (``run_once()``) oder als Hintergrund-Thread
+    alle ``interval`` Sekunden (``start()``/``close()``).
+    """
+
+    def __init__(self, db: Database, retention_days: int,
+                 interval: float = RETENTION_INTERVAL,
+                 batch_size: int = RETENTION_BATCH_SIZE,
+                 pause: float = RETENTION_BATCH_PAUSE,
+                 vacuum_pages: int = RETENTION_VACUUM_PAGES) -> None:
+        """Initialisiere den Compactor (ohne ihn zu starten).
+
+        Args:
+            db: Datenbank
+            retention_days: Aufbewahrungsdauer der Roh-Sessions in Tagen
+            interval: Abstand zwischen zwei Durchläufen im Hintergrund
+            batch_size: Max. gelöschte Sessions pro Transaktion
+            pause: Pause zwischen zwei Batches bzw. Vacuum-Schritten
+            vacuum_pages: Max. freigegebene Seiten pro Vacuum-Schritt
+
+        Raises:
+            ConfigError: Bei einer Aufbewahrungsdauer unter einem Tag
+        """
+        if retention_days < 1:
+            raise ConfigError(f"Ungültige Aufbewahrungsdauer: {retention_days} Tag(e)")
+        self.db = db
+        self.retention_days = retention_days
+        self.interval = interval
+        self.batch_size = batch_size
+        self.pause = pause
+        self.vacuum_pages = vacuum_pages
+
+        # Zähler für Diagnose
+        self.deleted = 0
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_config(cls, db: Database, config: dict) -> Optional["Compactor"]:
+        """Erstelle einen Compactor, falls ``retention_days`` gesetzt ist.
+
+        Returns:
+            Optional[Compactor]: None ohne Eintrag (Roh-Sessions unbegrenzt)
+
+        Raises:
+            ConfigError: Bei ungültiger Aufbewahrungsdauer
+        """
+        days = config.get("retention_days")
+        if days is None:
+            return None
+        try:
+            days = int(days)
+        except (TypeError, ValueError):
+            raise ConfigError(f"Ungültige Aufbewahrungsdauer: {days!r}")
+        return cls(db, days)
+
+    def cutoff(self, now: Optional[datetime] = None) -> datetime:
+        """Sessions mit früherem Start sind abgelaufen."""
+        return (now or datetime.now()) - timedelta(days=self.retention_days)
+
+    def run_once(self, now: Optional[datetime] = None) -> int:
+        """Lösche alle abgelaufenen Sessions in Batches und gib Speicher frei.
+
+        Bricht nach dem laufenden Batch ab, sobald ``close()`` aufgerufen wird.
+
+        Args:
+            now: Bezugszeitpunkt (Standard: jetzt)
+
+        Returns:
+            int: Anzahl gelöschter Sessions
+
+        Raises:
+            DatabaseError: Wenn Löschen oder Vacuum fehlschlagen
+        """
+        cutoff = self.cutoff(now)
+        deleted = 0
+        while not self._stop.is_set():
+            batch = self.db.delete_expired_sessions(cutoff, self.batch_size)
+            if batch == 0:
+                break
+            deleted += batch
+            REGISTRY.inc("sessions_compacted", batch)
+            self._stop.wait(self.pause)
+
+        while not self._stop.is_set() and self.db.incremental_vacuum(self.vacuum_pages) > 0:
+            self._stop.wait(self.pause)
+
+        self.deleted += deleted
+        if deleted:
+            logger.info(f"{deleted} Roh-Session(s) vor {cutoff:%Y-%m-%d %H:%M} gelöscht")
+        return deleted
+
+    def start(self) -> None:
+        """Starte den Hintergrund-Thread (erster Durchlauf nach kurzer Wartezeit)."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="Compactor", daemon=True)
+        self._thread.start()
+        logger.info(f"Aufbewahrung aktiv: Roh-Sessions {self.retention_days} Tag(e)")
+
+    def close(self) -> None:
+        """Beende den Hintergrund-Thread (nach dem laufenden Batch)."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        delay = min(RETENTION_START_DELAY, self.interval)
+        while not self._stop.wait(delay):
+            try:
+                self.run_once()
+            except DatabaseError as e:
+                logger.warning(f"Aufbewahrung übersprungen: {e}")
+            delay = self.interval
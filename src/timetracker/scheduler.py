@@ -0,0 +1,162 @@
+"""Adaptives Polling-Intervall und Idle-Erkennung für TimeTracker."""
+
+from typing import Optional
+
+from .config import (
+    CHECK_INTERVAL_BACKOFF,
+    IDLE_CHECK_INTERVAL,
+    IDLE_THRESHOLD,
+    MAX_CHECK_INTERVAL,
+    MIN_CHECK_INTERVAL,
+)
+from .logger_config import setup_logger
+
+logger = setup_logger(__name__)
+
+
+# ========== IDLE-ERKENNUNG ==========
+
+class IdleDetector:
+    """Schnittstelle für die Erkennung von Benutzer-Inaktivität.
+
+    Die Basisklasse kennt keine Inaktivität (Plattformen ohne Unterstützung).
+    """
+
+    def idle_seconds(self) -> float:
+        """Sekunden seit der letzten Benutzereingabe."""
+        return 0.0
+
+    def is_locked(self) -> bool:
+        """True wenn der Bildschirm gesperrt ist."""
+        return False
+
+
+class WindowsIdleDetector(IdleDetector):
+    """Idle über ``GetLastInputInfo``, Sperre über ``OpenInputDesktop``."""
+
+    DESKTOP_SWITCHDESKTOP = 0x0100
+
+    def __init__(self) -> None:
+        """Lade user32/kernel32 über ctypes."""
+        import ctypes
+        from ctypes import wintypes
+
+        class LASTINPUTINFO(ctypes.Structure):
+            _fields_ = [("cbSize", wintypes.UINT), ("dwTime", wintypes.DWORD)]
+
+        self._ctypes = ctypes
+        self._user32 = ctypes.windll.user32
+        self._kernel32 = ctypes.windll.kernel32
+        self._info = LASTINPUTINFO()
+        self._info.cbSize = ctypes.sizeof(LASTINPUTINFO)
+
+    def idle_seconds(self) -> float:
+        """Millisekunden seit der letzten Eingabe, als Sekunden."""
+        if not self._user32.GetLastInputInfo(self._ctypes.byref(self._info)):
+            return 0.0
+        # Beide Werte sind 32-Bit-Tickzähler (Überlauf nach ~49 Tagen)
+        now = self._kernel32.GetTickCount() & 0xFFFFFFFF
+        return ((now - self._info.dwTime) & 0xFFFFFFFF) / 1000.0
+
+    def is_locked(self) -> bool:
+        """Bei gesperrtem Bildschirm ist der Eingabe-Desktop nicht zugänglich."""
+        desktop = self._user32.OpenInputDesktop(0, False, self.DESKTOP_SWITCHDESKTOP)
+        if not desktop:
+            return True
+        self._user32.CloseDesktop(desktop)
+        return False
+
+
+class ManualIdleDetector(IdleDetector):
+    """Von außen gesetzter Idle-Zustand (für Tests, plattformunabhängig)."""
+
+    def __init__(self, idle: float = 0.0, locked: bool = False) -> None:
+        self.idle = idle
+        self.locked = locked
+
+    def idle_seconds(self) -> float:
+        return self.idle
+
+    def is_locked(self) -> bool:
+        return self.locked
+
+
+# ========== SCHEDULER ==========
+
+class AdaptiveScheduler:
+    """Bestimmt das Intervall bis zum nächsten Polling-Tick.
+
+    * nach einem Fokuswechsel wird sofort wieder schnell gepollt
+    * bei stabilem Fokus wächst das Intervall schrittweise bis
+      ``max_interval``
+    * ohne offene Session direkt ``max_interval``
+    * bei inaktivem Benutzer oder gesperrtem Bildschirm nur noch alle
+      ``idle_interval`` Sekunden
+    """
+
+    def __init__(self, min_interval: float = MIN_CHECK_INTERVAL,
+                 max_interval: float = MAX_CHECK_INTERVAL,
+                 idle_detector: Optional[IdleDetector] = None,
+                 backoff: float = CHECK_INTERVAL_BACKOFF,
+                 idle_threshold: float = IDLE_THRESHOLD,
+                 idle_interval: float = IDLE_CHECK_INTERVAL) -> None:
+        """Initialisiere den Scheduler.
+
+        Args:
+            min_interval: Intervall direkt nach einem Fokuswechsel
+            max_interval: Obergrenze bei stabilem Fokus
+            idle_detector: Quelle für Inaktivität (Standard: keine)
+            backoff: Faktor, um den das Intervall pro stabilem Tick wächst
+            idle_threshold: Ab so vielen Sekunden ohne Eingabe gilt der
+                Benutzer als inaktiv
+            idle_interval: Intervall bei Inaktivität/Sperre
+        """
+        self.min_interval = max(MIN_CHECK_INTERVAL, min(min_interval, max_interval))
+        self.max_interval = max_interval
+        self.idle_detector = idle_detector or IdleDetector()
+        self.backoff = backoff
+        self.idle_threshold = idle_threshold
+        self.idle_interval = idle_interval
+
+        self.interval = self.min_interval
+        self._idle = False
+
+    def on_transition(self) -> None:
+        """Fokuswechsel erkannt: wieder schnell pollen."""
+        self.interval = self.min_interval
+
+    def _user_idle(self) -> bool:
+        """Prüfe Inaktivität/Sperre (Fehler gelten als aktiv)."""
+        try:
+            return (self.idle_detector.is_locked()
+                    or self.idle_detector.idle_seconds() >= self.idle_threshold)
+        except Exception as e:
+            logger.debug(f"Idle-Erkennung fehlgeschlagen: {e}")
+            return False
+
+    def next_interval(self, has_sessions: bool) -> float:
+        """Berechne das Intervall bis zum nächsten Tick.
+
+        Args:
+            has_sessions: True wenn mindestens eine Session offen ist
+
+        Returns:
+            float: Wartezeit in Sekunden
+        """
+        idle = self._user_idle()
+        if idle != self._idle:
+            self._idle = idle
+            logger.info("Benutzer inaktiv – Polling pausiert" if idle
+                        else "Benutzer wieder aktiv")
+            if not idle:
+                self.interval = self.min_interval
+        if idle:
+            return self.idle_interval
+
+        if not has_sessions:
+            self.interval = self.max_interval
+            return self.interval
+
+        interval = self.interval
+        self.interval = min(self.interval * self.backoff, self.max_interval)
+        return interval
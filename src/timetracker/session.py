@@ -0,0 +1,122 @@
+"""Session-Zustand und Uhren für TimeTracker."""
+
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+
+class SystemClock:
+    """Echte Uhren des Systems.
+
+    Dauern werden ausschließlich über die monotone Uhr gemessen (immun
+    gegen Zeitumstellung und DST), die Wanduhr liefert nur die
+    Zeitpunkte, die in der DB landen.
+    """
+
+    @staticmethod
+    def monotonic_ns() -> int:
+        """Monotone Zeit in Nanosekunden."""
+        return time.monotonic_ns()
+
+    @staticmethod
+    def now() -> datetime:
+        """Aktuelle lokale Wanduhrzeit."""
+        return datetime.now()
+
+
+class VirtualClock(SystemClock):
+    """Manuell gesetzte Uhr für Replay und Tests.
+
+    Monotone Zeit und Wanduhr laufen gemeinsam: ``now()`` ist immer
+    ``start + monotonic``.
+    """
+
+    def __init__(self, start: datetime, ns: int = 0) -> None:
+        """Initialisiere die Uhr.
+
+        Args:
+            start: Wanduhrzeit bei ``ns == 0``
+            ns: Monotone Startzeit in Nanosekunden
+        """
+        self.start = start
+        self.ns = ns
+
+    def set(self, ns: int) -> None:
+        """Stelle die Uhr auf ``ns`` (darf nicht zurückgehen)."""
+        self.ns = max(self.ns, ns)
+
+    def advance(self, seconds: float) -> None:
+        """Stelle die Uhr um ``seconds`` vor."""
+        self.ns += int(seconds * 1e9)
+
+    def monotonic_ns(self) -> int:
+        return self.ns
+
+    def now(self) -> datetime:
+        return self.start + timedelta(microseconds=self.ns // 1000)
+
+
+class Session:
+    """Zustand einer offenen App-Session.
+
+    Kompakt über ``__slots__``; Fokus- und Gesamtzeit werden in
+    Nanosekunden der monotonen Uhr akkumuliert und erst beim Speichern
+    einmal auf Sekunden gerundet.
+    """
+
+    __slots__ = (
+        "app_name",
+        "app_path",
+        "started_at",
+        "start_ns",
+        "focus_start_ns",
+        "focus_ns",
+        "checkpoint_slot",
+    )
+
+    def __init__(self, app_name: str, app_path: Optional[str],
+                 started_at: datetime, now_ns: int,
+                 checkpoint_slot: int = -1) -> None:
+        """Starte eine Session, die App ist dabei im Fokus.
+
+        Args:
+            app_name: Name der App
+            app_path: Voller Pfad zur App
+            started_at: Wanduhr-Startzeitpunkt (für die DB)
+            now_ns: Monotone Startzeit
+            checkpoint_slot: Slot im Checkpoint-Journal
+        """
+        self.app_name = app_name
+        self.app_path = app_path
+        self.started_at = started_at
+        self.start_ns = now_ns
+        self.focus_start_ns: Optional[int] = now_ns
+        self.focus_ns = 0
+        self.checkpoint_slot = checkpoint_slot
+
+    @property
+    def is_focused(self) -> bool:
+        """True solange die App im Fokus ist."""
+        return self.focus_start_ns is not None
+
+    def focus(self, now_ns: int) -> None:
+        """Beginne eine Fokusphase."""
+        if self.focus_start_ns is None:
+            self.focus_start_ns = now_ns
+
+    def blur(self, now_ns: int) -> None:
+        """Beende die laufende Fokusphase und akkumuliere sie."""
+        if self.focus_start_ns is not None:
+            self.focus_ns += now_ns - self.focus_start_ns
+            self.focus_start_ns = None
+
+    def focus_seconds(self, now_ns: int) -> float:
+        """Fokuszeit bis ``now_ns`` inkl. laufender Fokusphase."""
+        focus_ns = self.focus_ns
+        if self.focus_start_ns is not None:
+            focus_ns += now_ns - self.focus_start_ns
+        return focus_ns / 1e9
+
+    def total_seconds(self, now_ns: int) -> float:
+        """Gesamtlaufzeit bis ``now_ns``."""
+        return (now_ns - self.start_ns) / 1e9
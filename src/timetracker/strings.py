@@ -34,12 +34,15 @@ class Messages:
     MSG_SUCCESS_APP_ADDED = "✅ App hinzugefügt: {}"
     MSG_SUCCESS_APP_REMOVED = "✅ App entfernt: {}"
     MSG_SUCCESS_STOP = "✅ Monitoring beendet"
+    MSG_SUCCESS_EXPORT = "✅ {} Session(s) exportiert: {}"
+    MSG_SUCCESS_COMPACT = "✅ {} Roh-Session(s) älter als {} Tag(e) gelöscht ({:.1f} MB → {:.1f} MB)"
     
     # ========== ERROR ==========
     MSG_ERROR_INVALID = "❌ Ungültige Eingabe!"
     MSG_ERROR_NO_CONFIG = "❌ Config nicht gefunden!"
     MSG_ERROR_NO_DATA = "❌ Keine Daten vorhanden"
     MSG_ERROR_GENERIC = "❌ Fehler: {}"
+    MSG_ERROR_NO_RETENTION = "❌ Keine Aufbewahrungsdauer: --days angeben oder retention_days in der Config setzen"
     
     # ========== INFO ==========
     MSG_INFO_CONFIG_MISSING = "⚠️  Config nicht gefunden!\n"
@@ -54,6 +57,11 @@ class Messages:
     STATS_AVG = "• Ø pro Öffnung: {}m {}s"
     STATS_FIRST = "• Erste Nutzung: {}"
     STATS_NO_DATA = "Keine Daten"
+
+    # ========== REPORT ==========
+    HEADER_REPORT = "📊 REPORT {} – {} (pro {})"
+    REPORT_COLUMNS = "{:<16} {:<24} {:>6} {:>10} {:>10} {:>7}"
+    REPORT_HEADER = ("Zeitraum", "App", "Öffn.", "Fokus", "Gesamt", "Anteil")
     
     # ========== AUTOSTART ==========
     AUTOSTART_ENABLED = "✅ Aktiviert"
@@ -0,0 +1,283 @@
+"""Aufzeichnung und Replay von Fokus-/Prozess-Traces für TimeTracker."""
+
+import contextlib
+import os
+import struct
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, NamedTuple, Optional
+
+from .backends import PlatformBackend
+from .exceptions import TrackerError
+from .foreground import ForegroundEvent, ScriptedForegroundSource
+from .logger_config import setup_logger
+from .process_table import ProcessInfo
+from .session import SystemClock, VirtualClock
+
+logger = setup_logger(__name__)
+
+# ========== FORMAT ==========
+# Header: Magic, Version, Wanduhr-Start (Epoch-Sekunden)
+TRACE_MAGIC = b"TTTRACE1"
+TRACE_VERSION = 1
+_HEADER = struct.Struct("<8sHd")
+# String-Definition: kind, id, Länge (danach UTF-8-Bytes)
+_STRING = struct.Struct("<BIH")
+# Event: kind, t (ns seit Start), pid, create_time, name_id, exe_id
+_EVENT = struct.Struct("<BqIdII")
+
+KIND_STRING = 0
+KIND_FOCUS = 1
+KIND_START = 2
+KIND_EXIT = 3
+KIND_END = 4
+
+
+class TraceEvent(NamedTuple):
+    """Ein Event aus einem Trace."""
+
+    kind: int
+    t_ns: int                 # Nanosekunden seit Aufzeichnungsbeginn
+    pid: int
+    create_time: float        # nur bei START/EXIT
+    name: Optional[str]
+    exe: Optional[str]
+
+
+# ========== AUFZEICHNUNG ==========
+
+class TraceRecorder:
+    """Schreibt Fokuswechsel und Prozess-Starts/-Exits in eine Binärdatei.
+
+    Jedes Event belegt 29 Byte; Namen und Pfade werden beim ersten
+    Auftreten einmal definiert und danach nur per ID referenziert. Die
+    Datei wird gepuffert geschrieben, nach einem Absturz fehlt höchstens
+    das Ende (der Reader bricht an einem unvollständigen Record ab).
+    """
+
+    def __init__(self, path: Path | str, clock: Optional[SystemClock] = None) -> None:
+        """Öffne die Trace-Datei und schreibe den Header.
+
+        Args:
+            path: Zieldatei (wird überschrieben)
+            clock: Uhr des Trackers (Standard: Systemuhr)
+        """
+        self.path = Path(path)
+        self.clock = clock or SystemClock()
+        self.events = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file: BinaryIO = open(self.path, "wb")
+        self._strings: Dict[str, int] = {}
+        self._start_ns = self.clock.monotonic_ns()
+        self._file.write(_HEADER.pack(TRACE_MAGIC, TRACE_VERSION, self.clock.now().timestamp()))
+
+    def _intern(self, text: Optional[str]) -> int:
+        """ID eines Strings (0 = None), neue Strings werden definiert."""
+        if text is None:
+            return 0
+        string_id = self._strings.get(text)
+        if string_id is None:
+            string_id = len(self._strings) + 1
+            self._strings[text] = string_id
+            data = text.encode("utf-8")[:0xFFFF]
+            self._file.write(_STRING.pack(KIND_STRING, string_id, len(data)) + data)
+        return string_id
+
+    def _write(self, kind: int, pid: int = 0, create_time: float = 0.0,
+               name: Optional[str] = None, exe: Optional[str] = None) -> None:
+        """Schreibe ein Event mit dem aktuellen Zeitstempel."""
+        if self._file.closed:
+            return
+        self._file.write(_EVENT.pack(
+            kind, self.clock.monotonic_ns() - self._start_ns, pid, create_time,
+            self._intern(name), self._intern(exe),
+        ))
+        self.events += 1
+
+    def focus(self, pid: int, name: Optional[str], exe: Optional[str]) -> None:
+        """Fokuswechsel (nach Auflösung von Name und Pfad)."""
+        self._write(KIND_FOCUS, pid, 0.0, name, exe)
+
+    def processes(self, started: List[ProcessInfo], exited: List[ProcessInfo]) -> None:
+        """Start/Exit-Events eines Snapshot-Diffs."""
+        for info in exited:
+            self._write(KIND_EXIT, info.pid, info.create_time, info.name)
+        for info in started:
+            self._write(KIND_START, info.pid, info.create_time, info.name)
+
+    def flush(self) -> None:
+        """Gepufferte Events auf die Platte schreiben."""
+        if not self._file.closed:
+            self._file.flush()
+
+    def close(self) -> None:
+        """Ende markieren und Datei schließen."""
+        if self._file.closed:
+            return
+        self._write(KIND_END)
+        self._file.close()
+        logger.info(f"Trace gespeichert: {self.path} ({self.events} Events)")
+
+
+# ========== LESEN ==========
+
+class TraceReader:
+    """Liest eine mit ``TraceRecorder`` geschriebene Datei."""
+
+    def __init__(self, path: Path | str) -> None:
+        """Öffne den Trace und prüfe den Header.
+
+        Raises:
+            TrackerError: Wenn die Datei kein gültiger Trace ist
+        """
+        self.path = Path(path)
+        self._data = self.path.read_bytes()
+        if len(self._data) < _HEADER.size:
+            raise TrackerError(f"Trace zu kurz: {self.path}")
+        magic, version, start = _HEADER.unpack_from(self._data, 0)
+        if magic != TRACE_MAGIC or version != TRACE_VERSION:
+            raise TrackerError(f"Kein gültiger Trace: {self.path}")
+        self.start = datetime.fromtimestamp(start)
+
+    def __iter__(self) -> Iterator[TraceEvent]:
+        """Liefere alle Events in Aufzeichnungsreihenfolge."""
+        data = self._data
+        strings: Dict[int, Optional[str]] = {0: None}
+        offset = _HEADER.size
+        size = len(data)
+
+        while offset < size:
+            kind = data[offset]
+            if kind == KIND_STRING:
+                if offset + _STRING.size > size:
+                    break
+                _, string_id, length = _STRING.unpack_from(data, offset)
+                offset += _STRING.size
+                if offset + length > size:
+                    break
+                strings[string_id] = data[offset:offset + length].decode("utf-8", "replace")
+                offset += length
+                continue
+
+            if offset + _EVENT.size > size:
+                # Unvollständiger Record am Ende (Absturz während der Aufzeichnung)
+                break
+            kind, t_ns, pid, create_time, name_id, exe_id = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            yield TraceEvent(kind, t_ns, pid, create_time,
+                             strings.get(name_id), strings.get(exe_id))
+
+
+# ========== REPLAY ==========
+
+class ReplayBackend(PlatformBackend):
+    """Backend, dessen Prozessliste vollständig aus dem Trace stammt."""
+
+    name = "replay"
+
+    def __init__(self) -> None:
+        self._processes: Dict[int, ProcessInfo] = {}
+
+    def start(self, info: ProcessInfo) -> None:
+        self._processes[info.pid] = info
+
+    def exit(self, info: ProcessInfo) -> None:
+        if self._processes.get(info.pid) == info:
+            del self._processes[info.pid]
+
+    def snapshot(self) -> List[ProcessInfo]:
+        return list(self._processes.values())
+
+    def process_details(self, pid: int):
+        info = self._processes.get(pid)
+        return (info.name, None) if info else (None, None)
+
+    def create_time(self, pid: int) -> Optional[float]:
+        info = self._processes.get(pid)
+        return info.create_time if info else None
+
+
+class ReplayResult(NamedTuple):
+    """Kennzahlen eines Replays."""
+
+    events: int
+    sessions: int
+    simulated_seconds: float
+    wall_seconds: float
+
+    @property
+    def speedup(self) -> float:
+        """Simulierte Zeit pro Sekunde echter Laufzeit."""
+        return self.simulated_seconds / self.wall_seconds if self.wall_seconds else 0.0
+
+
+def replay_trace(trace_path: Path | str, config_path: Path | str,
+                 quiet: bool = True) -> ReplayResult:
+    """Spiele einen Trace durch die echte Session-Logik des AppTrackers.
+
+    Die Zeit kommt aus einer virtuellen Uhr, die auf den Zeitstempel des
+    jeweiligen Events springt – das Replay läuft so schnell wie die
+    Verarbeitung erlaubt. Die Sessions landen in der ``db_path`` der
+    übergebenen Config und lassen sich mit der Live-DB vergleichen.
+
+    Args:
+        trace_path: Aufgezeichneter Trace
+        config_path: Config für den Replay-Tracker (target_apps, db_path)
+        quiet: Konsolen-Ausgaben des Trackers unterdrücken
+
+    Returns:
+        ReplayResult: Anzahl Events/Sessions, simulierte und echte Dauer
+    """
+    from .tracker import AppTracker
+
+    reader = TraceReader(trace_path)
+    clock = VirtualClock(reader.start)
+    backend = ReplayBackend()
+    # Keine Aufbewahrung: Sessions aus der Vergangenheit des Traces sollen
+    # nicht als "abgelaufen" aus der Replay-DB gelöscht werden
+    tracker = AppTracker(config_path, backend=backend,
+                         foreground_source=ScriptedForegroundSource(), clock=clock,
+                         retention=False)
+
+    events = 0
+    pending_liveness = False
+    started = time.perf_counter()
+
+    with contextlib.ExitStack() as stack:
+        if quiet:
+            devnull = stack.enter_context(open(os.devnull, "w", encoding="utf-8"))
+            stack.enter_context(contextlib.redirect_stdout(devnull))
+
+        for event in reader:
+            events += 1
+            # Start/Exit-Events eines Snapshots (gleicher Zeitstempel) gemeinsam anwenden
+            if pending_liveness and (event.kind not in (KIND_START, KIND_EXIT)
+                                     or event.t_ns != clock.ns):
+                tracker.check_liveness()
+                pending_liveness = False
+            clock.set(event.t_ns)
+
+            if event.kind == KIND_START:
+                backend.start(ProcessInfo(event.pid, event.name, event.create_time))
+                pending_liveness = True
+            elif event.kind == KIND_EXIT:
+                backend.exit(ProcessInfo(event.pid, event.name, event.create_time))
+                pending_liveness = True
+            elif event.kind == KIND_FOCUS:
+                tracker.handle_foreground(ForegroundEvent(event.pid, event.name, event.exe))
+            elif event.kind == KIND_END:
+                break
+
+        if pending_liveness:
+            tracker.check_liveness()
+        tracker.close()
+
+    wall = time.perf_counter() - started
+    result = ReplayResult(events, tracker.writer.written, clock.ns / 1e9, wall)
+    logger.info(
+        f"Replay {trace_path}: {result.events} Events, {result.sessions} Sessions, "
+        f"{result.simulated_seconds:.0f}s simuliert in {wall:.2f}s"
+    )
+    return result
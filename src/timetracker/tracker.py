@@ -1,51 +1,127 @@
 """App-Monitoring und Activity Tracking für TimeTracker."""
 
+import asyncio
+import functools
 import time
 import json
+import queue
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from datetime import datetime
-from typing import Optional, Tuple, Dict, Any
-
-import win32gui
-import win32process
-import psutil
-
+from datetime import timedelta
+from typing import Any, Callable, Optional, Tuple, Dict, List
+
+from .backends import PlatformBackend, get_backend
+from .checkpoint import CheckpointJournal
+from .config import (
+    CHECKPOINT_INTERVAL,
+    LIVENESS_INTERVAL,
+    LIVENESS_INTERVAL_WATCHED,
+    REPORT_INTERVAL,
+)
 from .exceptions import TrackerError
 from .logger_config import setup_logger
-from .database import Database
+from .database import Database, SessionRecord
+from .foreground import ForegroundEvent, ForegroundSource
+from .matcher import AppMatcher
+from .metrics import REGISTRY, start_exporters
+from .process_table import PidCache, ProcessInfo, ProcessTable
+from .scheduler import AdaptiveScheduler
+from .retention import Compactor
+from .session import Session, SystemClock
+from .trace import TraceRecorder
+from .writer import SessionWriter
 
 logger = setup_logger(__name__)
 
+# Sentinel in der Event-Queue: Monitoring beenden
+_STOP = object()
+
 
 class AppTracker:
     """Überwacht Anwendungsnutzung und loggt Sessions (Fokus + Gesamtzeit pro App)."""
 
-    def __init__(self, config_path: Path | str) -> None:
+    def __init__(self, config_path: Path | str,
+                 backend: Optional[PlatformBackend] = None,
+                 foreground_source: Optional[ForegroundSource] = None,
+                 clock: Optional[SystemClock] = None,
+                 recorder: Optional[TraceRecorder] = None,
+                 retention: bool = True) -> None:
         """Initialisiere den AppTracker.
 
         Args:
             config_path: Pfad zur config.json
+            backend: Plattform-Backend (Standard: passend zur Plattform)
+            foreground_source: Quelle für Fokuswechsel (Standard: bevorzugte
+                Quelle des Backends)
+            clock: Uhr für Dauern und Zeitstempel (Standard: Systemuhr)
+            recorder: Zeichnet Fokuswechsel und Prozess-Events für ein
+                späteres Replay auf (Standard: keine Aufzeichnung)
+            retention: Abgelaufene Roh-Sessions laut ``retention_days``
+                löschen (für Replays aus)
 
         Raises:
             TrackerError: Wenn Config nicht geladen werden kann
         """
         self.config_path = Path(config_path)
+        self.clock = clock or SystemClock()
+        self.recorder = recorder
 
         try:
             self.config = self._load_config()
             self.target_apps = self.config["target_apps"]
+            # Regeln einmal kompilieren statt pro Tick alle durchzugehen
+            self.matcher = AppMatcher(self.target_apps)
             self.check_interval = self.config["check_interval"]
             self.db = Database(self.config["db_path"])
-
-            # Pro-App Session State (app_name → state dict)
-            self.sessions: Dict[str, Dict[str, Any]] = {}
-            # Jede App hat: {
-            #   "is_running": bool,              # App aktuell im Fokus
-            #   "total_start_time": datetime,    # Wann die Session anfing
-            #   "current_focus_start": datetime, # Anfang der Fokusphase
-            #   "focus_accumulated": int,        # Summierte Fokuszeit
-            #   "app_path": str,                 # Voller Pfad zur App
-            # }
+            # Sperrt das Journal für diese Instanz – vor Writer und Compactor,
+            # damit eine zweite Instanz weder Journal noch Auslagerung anfasst
+            db_path = self.db.db_path
+            self.journal = CheckpointJournal(db_path.with_name(db_path.name + ".ckpt"))
+            # Sessions werden im Hintergrund geschrieben, nie im Tick
+            self.writer = SessionWriter(self.db)
+            # Alte Roh-Sessions im Hintergrund löschen (nur mit retention_days)
+            self.compactor = Compactor.from_config(self.db, self.config) if retention else None
+            if self.compactor is not None:
+                self.compactor.start()
+
+            # Offene Sessions eines abgestürzten Laufs nachtragen; Slots erst
+            # nach dem Speichern freigeben (zweiter Absturz möglich)
+            for slot, record in self.journal.recover():
+                self.writer.submit(record, functools.partial(self.journal.release, slot))
+            self.backend = backend or get_backend()
+            self.foreground = foreground_source or self.backend.create_foreground_source()
+            self.process_table = ProcessTable(self.backend.snapshot)
+            # Name/Pfad pro PID nur einmal abfragen
+            self.pid_cache = PidCache(self.backend.process_details, self.backend.create_time)
+            # Polling-Intervall: schnell nach Wechseln, langsam bei Ruhe
+            self.scheduler = AdaptiveScheduler(
+                self.check_interval,
+                idle_detector=self.backend.create_idle_detector(),
+            )
+            # Meldet Exits beobachteter Prozesse ohne Rescan (falls verfügbar)
+            self.exit_watcher = self.backend.create_exit_watcher()
+
+            # Fokus-Events, Exits (ProcessInfo) und _STOP, abgearbeitet im Monitoring
+            self._events: "queue.Queue[object]" = queue.Queue()
+            self._last_pid: Optional[int] = None
+            # Zustand der asyncio-Engine (nur während run_async gesetzt)
+            self._loop: Optional[asyncio.AbstractEventLoop] = None
+            self._async_events: Optional["asyncio.Queue[object]"] = None
+            # Anzahl Aufwachvorgänge der Monitoring-Schleife
+            self.wakeups = 0
+
+            # Latenz-Histogramme pro Phase (einmal holen, im Tick nur record())
+            self.metrics = REGISTRY
+            self._h_tick = REGISTRY.histogram("tick")
+            self._h_query = REGISTRY.histogram("tick_foreground_query")
+            self._h_focus = REGISTRY.histogram("tick_focus")
+            self._h_liveness = REGISTRY.histogram("tick_liveness")
+            self._h_checkpoint = REGISTRY.histogram("tick_checkpoint")
+
+            # Offene Sessions (app_name → Session)
+            self.sessions: Dict[str, Session] = {}
+            # Höchstens eine Session ist im Fokus
+            self._focused: Optional[Session] = None
 
             logger.info(f"AppTracker initialisiert für Apps: {self.target_apps}")
 
@@ -65,85 +141,110 @@ class AppTracker:
 
     def get_active_window_process(self) -> Tuple[Optional[str], Optional[str]]:
         """Hole Info über das aktive Fenster."""
-        try:
-            hwnd = win32gui.GetForegroundWindow()
-            _, pid = win32process.GetWindowThreadProcessId(hwnd)
+        event = self.foreground.poll()
+        if event is None:
+            return None, None
+        return self._resolve_process(event)
 
-            try:
-                process = psutil.Process(pid)
-                return process.name(), process.exe()
-            except psutil.NoSuchProcess:
-                return None, None
+    def _resolve_process(self, event: ForegroundEvent) -> Tuple[Optional[str], Optional[str]]:
+        """Ermittle Prozessname und Pfad zu einem Fokus-Event."""
+        if event.name:
+            return event.name, event.exe
 
+        try:
+            return self.pid_cache.lookup(event.pid)
         except Exception as e:
             logger.debug(f"Fehler beim Abrufen des aktiven Fensters: {e}")
             return None, None
 
     def is_target_app(self, process_name: Optional[str]) -> bool:
         """Prüfe ob Prozessname einer zu trackenden App entspricht."""
-        if not process_name:
-            return False
+        return self.matcher.match(process_name)
 
-        process_name_lower = process_name.lower()
+    def _is_target_process(self, pid: int, process_name: Optional[str],
+                           process_exe: Optional[str]) -> bool:
+        """Prüfe einen Prozess, gecacht über (pid, create_time) falls bekannt.
 
-        for target_app in self.target_apps:
-            if target_app.lower() in process_name_lower:
-                return True
-
-        return False
+        Die create_time wird live gelesen: Der letzte Snapshot kann eine
+        inzwischen wiederverwendete PID noch dem alten Prozess zuordnen.
+        """
+        create_time = self.backend.create_time(pid) if pid > 0 else None
+        if create_time is None:
+            return self.matcher.match(process_name, process_exe)
+        return self.matcher.match_process((pid, create_time), process_name, process_exe)
 
     def is_process_running(self, app_name: str) -> bool:
-        """Prüfe ob Prozess mit gegebenem Namen noch läuft."""
+        """Prüfe ob Prozess mit gegebenem Namen laut Prozesstabelle noch läuft."""
         if not app_name:
             return False
 
-        try:
-            for proc in psutil.process_iter(["name"]):
-                try:
-                    if proc.info["name"] and proc.info["name"].lower() == app_name:
-                        return True
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
-        except Exception as e:
-            logger.debug(f"Fehler beim Prüfen von laufenden Prozessen: {e}")
+        return self.process_table.is_running(app_name)
 
-        return False
+    def _handle_exited(self, exited: List[ProcessInfo]) -> None:
+        """Beende Sessions, deren letzter Prozess beendet wurde.
 
-    def _init_session(self, app_name: str, app_path: str) -> None:
-        """Initialisiere eine neue Session für eine App."""
-        now = datetime.now()
-        self.sessions[app_name] = {
-            "is_running": True,
-            "total_start_time": now,
-            "current_focus_start": now,
-            "focus_accumulated": 0,
-            "app_path": app_path,
-        }
+        Args:
+            exited: Seit dem letzten Snapshot beendete Prozesse
+        """
+        for info in exited:
+            if info.name in self.sessions and not self.is_process_running(info.name):
+                self._end_session(info.name)
+
+    def _watch_app(self, app_name: str) -> None:
+        """Melde alle laufenden Instanzen einer App beim Exit-Watcher an."""
+        if self.exit_watcher is None:
+            return
+        for info in self.process_table.instances(app_name):
+            self.exit_watcher.watch(info)
+
+    def _init_session(self, app_name: str, app_path: str) -> Session:
+        """Initialisiere eine neue Session für eine App (im Fokus)."""
+        started_at = self.clock.now()
+        self.metrics.inc("sessions_started")
+        session = Session(
+            app_name,
+            app_path,
+            started_at,
+            self.clock.monotonic_ns(),
+            self.journal.open_slot(app_name, app_path, started_at),
+        )
+        self.sessions[app_name] = session
+        return session
 
     def _end_session(self, app_name: str) -> None:
         """Beende die Session für eine App und speichere sie."""
         if app_name not in self.sessions:
             return
 
-        state = self.sessions[app_name]
-        end_time = datetime.now()
-
-        # Falls noch Fokusphase offen, einsammeln
-        if state["current_focus_start"]:
-            focus_delta = int((end_time - state["current_focus_start"]).total_seconds())
-            state["focus_accumulated"] += focus_delta
-
-        total_duration = int((end_time - state["total_start_time"]).total_seconds())
-        focus_duration = state["focus_accumulated"]
-
-        # In DB speichern
-        self.db.log_session(
-            app_name,
-            state["app_path"],
-            state["total_start_time"],
-            end_time,
-            focus_duration,
-            total_duration,
+        self.metrics.inc("sessions_ended")
+        session = self.sessions.pop(app_name)
+        if session is self._focused:
+            self._focused = None
+
+        now_ns = self.clock.monotonic_ns()
+        end_time = self.clock.now()
+
+        # Erst hier einmal auf ganze Sekunden runden
+        total_duration = round(session.total_seconds(now_ns))
+        focus_duration = min(round(session.focus_seconds(now_ns)), total_duration)
+
+        # Endstand in den Checkpoint, damit eine Wiederherstellung vor dem
+        # Commit dieselben Werte liefert
+        self.journal.update(session.checkpoint_slot,
+                            session.started_at.timestamp() + total_duration, focus_duration)
+
+        # An den Writer übergeben (blockiert nicht auf SQLite). Der Slot
+        # bleibt belegt, bis die Session committet oder ausgelagert ist
+        self.writer.submit(
+            SessionRecord(
+                app_name,
+                session.app_path,
+                session.started_at,
+                end_time,
+                focus_duration,
+                total_duration,
+            ),
+            functools.partial(self.journal.release, session.checkpoint_slot),
         )
 
         print(
@@ -155,79 +256,498 @@ class AppTracker:
             f"(focus={focus_duration}s, total={total_duration}s)"
         )
 
-        # Session löschen
-        del self.sessions[app_name]
+    def handle_foreground(self, event: ForegroundEvent) -> None:
+        """Verarbeite einen Fokuswechsel.
 
-    def start_monitoring(self) -> None:
-        """Starte die Hauptüberwachungsschleife."""
+        Args:
+            event: Neuer Vordergrund-Prozess
+        """
+        # Fensterwechsel innerhalb desselben Prozesses ändern nichts
+        if event.pid == self._last_pid:
+            return
+        self._last_pid = event.pid
+        self.scheduler.on_transition()
+        self.metrics.inc("focus_transitions")
+        start = time.perf_counter_ns()
+
+        process_name, process_exe = self._resolve_process(event)
+        self._apply_focus(event.pid, process_name, process_exe)
+
+        # Nach der Verarbeitung aufzeichnen: Prozess-Events, die dabei
+        # entstehen, stehen im Trace so vor dem Fokuswechsel
+        if self.recorder is not None:
+            self.recorder.focus(event.pid, process_name, process_exe)
+
+        self._h_focus.record(time.perf_counter_ns() - start)
+
+    def _apply_focus(self, pid: int, process_name: Optional[str],
+                     process_exe: Optional[str]) -> None:
+        """Übernimm einen aufgelösten Fokuswechsel in die Sessions."""
+        is_active = self._is_target_process(pid, process_name, process_exe)
+
+        # Bestimme aktuell fokussierte App
+        active_app = process_name.lower() if is_active else None
+        focused = self._focused
+        if focused is not None and focused.app_name == active_app:
+            return
+
+        now_ns = self.clock.monotonic_ns()
+
+        # ========== BISHERIGE APP VERLIERT DEN FOKUS (läuft aber noch) ==========
+        if focused is not None:
+            focused.blur(now_ns)
+            self._focused = None
+
+            print(f"[⏸️  FOCUS LOST] {focused.app_name} um {time.strftime('%H:%M:%S')}")
+            logger.info(
+                f"App Fokus verloren: {focused.app_name}, "
+                f"fokus_accum={focused.focus_ns / 1e9:.1f}s"
+            )
+
+        if not is_active:
+            return
+
+        # ========== APP MIT OFFENER SESSION IST WIEDER IM FOKUS ==========
+        session = self.sessions.get(active_app)
+        if session is not None:
+            session.focus(now_ns)
+            self._focused = session
+
+            print(f"[▶️  START] {active_app} im Fokus um {time.strftime('%H:%M:%S')}")
+            logger.info(f"App im Fokus: {active_app}")
+            return
+
+        # ========== NEUE APP KOMMT IN DEN FOKUS ==========
+
+        # Prozess ist evtl. jünger als der letzte Snapshot
+        if not self.is_process_running(active_app):
+            self.check_liveness()
+
+        # Nur starten, wenn der Prozess im Snapshot auftaucht; sonst
+        # käme für ihn nie ein Exit-Event und die Session bliebe offen
+        if not self.is_process_running(active_app):
+            # Beim nächsten Event derselben PID erneut versuchen
+            self._last_pid = None
+            return
+
+        session = self._init_session(active_app, process_exe)
+        self._focused = session
+        self._watch_app(active_app)
+
+        time_str = session.started_at.strftime("%H:%M:%S")
+        print(f"[▶️  START] {active_app} im Fokus um {time_str}")
+        logger.info(f"App im Fokus: {active_app}")
+
+    def check_liveness(self) -> None:
+        """Aktualisiere die Prozesstabelle und beende Sessions beendeter Apps."""
+        start = time.perf_counter_ns()
+        self._apply_liveness(*self.process_table.refresh())
+        self._h_liveness.record(time.perf_counter_ns() - start)
+
+    def _apply_liveness(self, started: List[ProcessInfo], exited: List[ProcessInfo]) -> None:
+        """Verarbeite Start/Exit-Events eines Snapshot-Diffs."""
+        if self.recorder is not None and (started or exited):
+            self.recorder.processes(started, exited)
+
+        for info in exited:
+            # Gleiche PID kann später einem neuen Prozess gehören
+            if info.pid == self._last_pid:
+                self._last_pid = None
+            self.matcher.forget(info.key)
+            self.pid_cache.evict(info)
+
+        self._handle_exited(exited)
+
+        # Neue Instanzen laufender Sessions ebenfalls beobachten
+        if self.exit_watcher is not None:
+            for info in started:
+                if info.name in self.sessions:
+                    self.exit_watcher.watch(info)
+
+    def checkpoint(self) -> None:
+        """Schreibe den Stand aller offenen Sessions ins Checkpoint-Journal."""
+        start = time.perf_counter_ns()
+        self._update_checkpoints()
+        self._flush_checkpoint()
+        self._h_checkpoint.record(time.perf_counter_ns() - start)
+
+    def _flush_checkpoint(self) -> None:
+        """Journal (msync) und ggf. Trace auf die Platte bringen.
+
+        Ohne Flush bliebe eine laufende Aufzeichnung bis ``close()`` im
+        Puffer – nach einem Absturz fehlten gerade die letzten Events.
+        """
+        self.journal.flush()
+        if self.recorder is not None:
+            self.recorder.flush()
+
+    def _update_checkpoints(self) -> None:
+        """Aktualisiere die Journal-Slots aller offenen Sessions (ohne Flush).
+
+        Der Checkpoint-Zeitpunkt wird aus Startzeit + monotoner Laufzeit
+        berechnet, nicht von der Wanduhr gelesen.
+        """
+        now_ns = self.clock.monotonic_ns()
+
+        for session in self.sessions.values():
+            checkpoint = session.started_at + timedelta(seconds=session.total_seconds(now_ns))
+            self.journal.update(session.checkpoint_slot, checkpoint.timestamp(),
+                                session.focus_seconds(now_ns))
+
+    def report(self) -> None:
+        """Logge den Zwischenstand aller offenen Sessions."""
+        now_ns = self.clock.monotonic_ns()
+        summary = ", ".join(
+            f"{session.app_name} (focus={session.focus_seconds(now_ns):.0f}s, "
+            f"total={session.total_seconds(now_ns):.0f}s)"
+            for session in self.sessions.values()
+        )
+        logger.info(
+            f"Offene Sessions: {summary or 'keine'} – {self.wakeups} Wakeups, "
+            f"PID-Cache {self.pid_cache.hits}/{self.pid_cache.misses}"
+        )
+
+    def close(self) -> None:
+        """Beende offene Sessions, schreibe ausstehende und schließe die Datenbank."""
+        self.save_open_sessions()
+        if self.recorder is not None:
+            self.recorder.close()
+        if self.compactor is not None:
+            self.compactor.close()
+        self.writer.close()
+        self.journal.close()
+        self.db.close()
+
+    def stop(self) -> None:
+        """Beende das Monitoring (thread-sicher, auch für run_async)."""
+        if self._loop is not None:
+            self._post_async(_STOP)
+        else:
+            self._events.put(_STOP)
+
+    def _on_foreground(self, event: Optional[ForegroundEvent]) -> None:
+        """Callback der Fokus-Quelle (läuft ggf. in deren Thread)."""
+        self._events.put(event if event is not None else _STOP)
+
+    def _on_process_exit(self, info: ProcessInfo) -> None:
+        """Callback des Exit-Watchers (läuft in dessen Thread)."""
+        self._events.put(info)
+
+    def _start_foreground_source(self, callback: Optional[Callable[[Any], None]] = None) -> None:
+        """Starte die Fokus-Quelle, bei Fehlern mit Fallback auf Polling."""
+        callback = callback or self._on_foreground
+        try:
+            self.foreground.start(callback)
+        except TrackerError as e:
+            if not self.foreground.event_driven:
+                raise
+            logger.warning(f"{e} – verwende Polling als Fallback")
+            self.foreground = self.backend.create_polling_source()
+            self.foreground.start(callback)
+
+    def _liveness_interval(self) -> float:
+        """Abstand der periodischen Liveness-Prüfung in Sekunden.
+
+        Mit Exit-Watcher ist der periodische Scan nur noch ein Sicherheitsnetz.
+        Ohne (z.B. Windows) erkennt erst der Scan das Ende einer App, und
+        dessen Zeitpunkt wird zur Endzeit der Session – bei offenen Sessions
+        wird daher im Takt von check_interval gescannt, sonst seltener.
+        """
+        if self.exit_watcher is not None:
+            return LIVENESS_INTERVAL_WATCHED
+        if self.sessions:
+            return self.check_interval
+        return LIVENESS_INTERVAL
+
+    def _wait_timeout(self, last_liveness: float, last_checkpoint: float) -> float:
+        """Berechne, wie lange die Schleife auf das nächste Event warten darf."""
+        if not self.foreground.event_driven:
+            return self.scheduler.next_interval(bool(self.sessions))
+
+        now = time.monotonic()
+        timeout = self._liveness_interval() - (now - last_liveness)
+        # Checkpoints nur, solange es offene Sessions gibt
+        if self.sessions:
+            timeout = min(timeout, CHECKPOINT_INTERVAL - (now - last_checkpoint))
+        return max(0.0, timeout)
+
+    def _run_loop(self) -> None:
+        """Warte auf Fokus-/Exit-Events, prüfe periodisch Liveness und Checkpoints."""
+        last_liveness = last_checkpoint = time.monotonic()
+
+        while True:
+            try:
+                item = self._events.get(
+                    timeout=self._wait_timeout(last_liveness, last_checkpoint)
+                )
+            except queue.Empty:
+                item = None
+            tick_start = time.perf_counter_ns()
+            self.wakeups += 1
+
+            if item is _STOP:
+                return
+
+            if isinstance(item, ProcessInfo):
+                # Exit einer beobachteten App: Tabelle sofort aktualisieren,
+                # damit auch unbeobachtete Instanzen berücksichtigt werden
+                self.check_liveness()
+                last_liveness = time.monotonic()
+            elif isinstance(item, ForegroundEvent):
+                self.handle_foreground(item)
+            elif not self.foreground.event_driven:
+                # Polling-Fallback: ohne ermittelbares Fenster verliert
+                # jede App den Fokus (PID 0 ist nie eine Ziel-App)
+                event = self.foreground.poll()
+                self._h_query.record(time.perf_counter_ns() - tick_start)
+                self.handle_foreground(event or ForegroundEvent(0))
+
+            now = time.monotonic()
+            if (not self.foreground.event_driven
+                    or now - last_liveness >= self._liveness_interval()):
+                self.check_liveness()
+                last_liveness = now
+
+            if self.sessions and now - last_checkpoint >= CHECKPOINT_INTERVAL:
+                self.checkpoint()
+                last_checkpoint = now
+
+            self._record_tick(tick_start)
+
+    def _record_tick(self, tick_start: int) -> None:
+        """Erfasse die Dauer eines Ticks; länger als das Polling-Intervall = Overrun."""
+        elapsed = time.perf_counter_ns() - tick_start
+        self._h_tick.record(elapsed)
+        self.metrics.inc("ticks")
+        if elapsed > self.scheduler.min_interval * 1e9:
+            self.metrics.inc("tick_overruns")
+
+    def _stop_sources(self) -> None:
+        """Stoppe Fokus-Quelle und Exit-Watcher."""
+        self.foreground.stop()
+        if self.exit_watcher is not None:
+            self.exit_watcher.stop()
+
+    @staticmethod
+    def _close_exporters(exporters: List[object]) -> None:
+        """Beende Metrik-Endpunkt/-Datei (schreibt den letzten Stand)."""
+        for exporter in exporters:
+            exporter.close()
+
+    def _announce_start(self) -> None:
+        """Melde den Start des Monitorings."""
         logger.info(f"Monitoring gestartet für {len(self.target_apps)} App(s)")
         print(f"\n[START] Monitoring aktiv für: {', '.join(self.target_apps)}")
         print("[INFO] Drücke CTRL+C zum Beenden...\n")
 
+    def save_open_sessions(self) -> None:
+        """Beende und speichere alle offenen Sessions."""
+        while self.sessions:
+            app_name = next(iter(self.sessions))
+            self._end_session(app_name)
+            print(f"[SAVE] Session gespeichert: {app_name}")
+
+    def start_monitoring(self) -> None:
+        """Starte die Hauptüberwachungsschleife."""
+        self._announce_start()
+
+        # Erster Snapshot als Ausgangsbasis für die Diffs
+        self.check_liveness()
+        exporters = start_exporters(self.config)
+
         try:
-            while True:
-                process_name, process_exe = self.get_active_window_process()
-                is_active = self.is_target_app(process_name)
-
-                # Bestimme aktuell fokussierte App
-                active_app = process_name.lower() if is_active else None
-
-                # ========== FÜR JEDE GETRACKTE APP ==========
-                for app_name in self.sessions.copy().keys():
-                    state = self.sessions[app_name]
-
-                    # === App ist gerade im Fokus ===
-                    if app_name == active_app and not state["is_running"]:
-                        state["is_running"] = True
-                        state["current_focus_start"] = datetime.now()
-
-                        time_str = datetime.now().strftime("%H:%M:%S")
-                        print(f"[▶️  START] {app_name} im Fokus um {time_str}")
-                        logger.info(f"App im Fokus: {app_name}")
-
-                    # === App verliert Fokus (aber läuft noch) ===
-                    elif app_name != active_app and state["is_running"]:
-                        state["is_running"] = False
-                        now = datetime.now()
-
-                        if state["current_focus_start"]:
-                            focus_delta = int(
-                                (now - state["current_focus_start"]).total_seconds()
-                            )
-                            state["focus_accumulated"] += focus_delta
-                            state["current_focus_start"] = None
-
-                        time_str = now.strftime("%H:%M:%S")
-                        print(f"[⏸️  FOCUS LOST] {app_name} um {time_str}")
-                        logger.info(
-                            f"App Fokus verloren: {app_name}, "
-                            f"fokus_accum={state['focus_accumulated']}s"
-                        )
-
-                    # === App läuft nicht mehr ===
-                    if not self.is_process_running(app_name) and app_name in self.sessions:
-                        self._end_session(app_name)
-
-                # ========== NEUE APP KOMMT IN DEN FOKUS ==========
-                if is_active and active_app not in self.sessions:
-                    self._init_session(active_app, process_exe)
-
-                    time_str = datetime.now().strftime("%H:%M:%S")
-                    print(f"[▶️  START] {active_app} im Fokus um {time_str}")
-                    logger.info(f"App im Fokus: {active_app}")
-
-                time.sleep(self.check_interval)
+            if self.exit_watcher is not None:
+                self.exit_watcher.start(self._on_process_exit)
+            self._start_foreground_source()
 
-        except KeyboardInterrupt:
-            print("\n[STOP] Monitoring beendet durch User")
+            # Event-Quellen melden nur Wechsel → Startzustand einmal abfragen
+            initial = self.foreground.poll()
+            if initial is not None:
+                self.handle_foreground(initial)
 
-            # Speichere alle offenen Sessions
-            for app_name in list(self.sessions.keys()):
-                self._end_session(app_name)
-                print(f"[SAVE] Session gespeichert: {app_name}")
+            self._run_loop()
 
-            logger.info("Monitoring beendet")
+        except KeyboardInterrupt:
+            print("\n[STOP] Monitoring beendet durch User")
 
         except Exception as e:
+            self._stop_sources()
+            self._close_exporters(exporters)
             logger.error(f"Fehler im Monitoring: {e}", exc_info=True)
             raise TrackerError(f"Fehler während Monitoring: {e}")
+
+        self._stop_sources()
+        self._close_exporters(exporters)
+
+        # Speichert auch alle offenen Sessions
+        self.close()
+        logger.info(
+            f"Monitoring beendet ({self.wakeups} Wakeups, PID-Cache: "
+            f"{self.pid_cache.hits} Treffer, {self.pid_cache.misses} Fehlgriffe)"
+        )
+
+    # ========== ASYNCIO-ENGINE ==========
+
+    def _post_async(self, item: object) -> None:
+        """Reiche ein Event aus beliebigem Thread an die Event-Loop weiter."""
+        try:
+            self._loop.call_soon_threadsafe(self._async_events.put_nowait, item)
+        except (AttributeError, RuntimeError):
+            # Loop bereits beendet: Event verwerfen
+            pass
+
+    def _on_foreground_async(self, event: Optional[ForegroundEvent]) -> None:
+        """Callback der Fokus-Quelle im asyncio-Betrieb."""
+        self._post_async(event if event is not None else _STOP)
+
+    async def _blocking(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Führe einen blockierenden Plattform-Aufruf im Plattform-Executor aus.
+
+        Ein einzelner Worker serialisiert Snapshot, Fokus-Abfrage und
+        Prozess-Metadaten, die Event-Loop blockiert dabei nie.
+        """
+        return await self._loop.run_in_executor(self._platform_executor, func, *args)
+
+    async def _check_liveness_async(self) -> None:
+        """Snapshot im Executor erstellen, Diff auf der Event-Loop verarbeiten."""
+        start = time.perf_counter_ns()
+        async with self._state_lock:
+            self._apply_liveness(*await self._blocking(self.process_table.refresh))
+        self._h_liveness.record(time.perf_counter_ns() - start)
+
+    async def _handle_foreground_async(self, event: ForegroundEvent) -> None:
+        """Fokuswechsel verarbeiten; Auflösung und Snapshot laufen im Executor."""
+        if event.pid == self._last_pid:
+            return
+
+        async with self._state_lock:
+            if not event.name:
+                name, exe = await self._blocking(self._resolve_process, event)
+                event = ForegroundEvent(event.pid, name, exe)
+
+            # Neue Ziel-App jünger als der letzte Snapshot: Snapshot vorab
+            # im Executor, damit handle_foreground nicht selbst scannt
+            name = (event.name or "").lower()
+            if (name and name not in self.sessions
+                    and not self.is_process_running(name)
+                    and self.matcher.match(event.name, event.exe)):
+                self._apply_liveness(*await self._blocking(self.process_table.refresh))
+
+            self.handle_foreground(event)
+
+    async def _focus_task(self) -> None:
+        """Fokus-Sampling: wartet auf Events bzw. pollt adaptiv."""
+        while True:
+            timeout = None
+            if not self.foreground.event_driven:
+                timeout = self.scheduler.next_interval(bool(self.sessions))
+            try:
+                item = await asyncio.wait_for(self._async_events.get(), timeout)
+            except asyncio.TimeoutError:
+                start = time.perf_counter_ns()
+                item = await self._blocking(self.foreground.poll) or ForegroundEvent(0)
+                self._h_query.record(time.perf_counter_ns() - start)
+            self.wakeups += 1
+            self.metrics.inc("ticks")
+
+            if item is _STOP:
+                return
+            if isinstance(item, ProcessInfo):
+                # Exit einer beobachteten App: Liveness-Task sofort wecken
+                self._liveness_due.set()
+            elif isinstance(item, ForegroundEvent):
+                await self._handle_foreground_async(item)
+
+    async def _liveness_task(self) -> None:
+        """Liveness: periodisch und sofort nach gemeldeten Exits."""
+        while True:
+            try:
+                await asyncio.wait_for(self._liveness_due.wait(), self._liveness_interval())
+            except asyncio.TimeoutError:
+                pass
+            self._liveness_due.clear()
+            await self._check_liveness_async()
+
+    async def _persistence_task(self) -> None:
+        """Persistenz: Checkpoints offener Sessions, Flush im Executor."""
+        while True:
+            await asyncio.sleep(CHECKPOINT_INTERVAL)
+            if self.sessions:
+                self._update_checkpoints()
+                await self._loop.run_in_executor(None, self._flush_checkpoint)
+
+    async def _reporting_task(self) -> None:
+        """Reporting: Zwischenstand in festen Abständen loggen."""
+        while True:
+            await asyncio.sleep(REPORT_INTERVAL)
+            self.report()
+
+    async def run_async(self) -> None:
+        """Monitoring als asyncio-Engine (einbettbar in eine fremde Event-Loop).
+
+        Fokus-Sampling, Liveness, Persistenz und Reporting laufen als
+        unabhängige Tasks mit eigenem Takt. Blockierende Plattform-Aufrufe
+        laufen in einem Executor. Endet über ``stop()``, das Ende der
+        Fokus-Quelle oder Abbruch des Tasks; offene Sessions werden dabei
+        immer gespeichert.
+
+        Raises:
+            TrackerError: Wenn ein Task mit einem Fehler abbricht
+        """
+        self._loop = asyncio.get_running_loop()
+        self._async_events = asyncio.Queue()
+        self._liveness_due = asyncio.Event()
+        self._state_lock = asyncio.Lock()
+        self._platform_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="TrackerPlatform"
+        )
+        self._announce_start()
+
+        tasks: List[asyncio.Task] = []
+        exporters: List[object] = []
+        error: Optional[BaseException] = None
+        try:
+            exporters = start_exporters(self.config)
+            await self._check_liveness_async()
+            if self.exit_watcher is not None:
+                self.exit_watcher.start(self._post_async)
+            await self._blocking(self._start_foreground_source, self._on_foreground_async)
+
+            initial = await self._blocking(self.foreground.poll)
+            if initial is not None:
+                await self._handle_foreground_async(initial)
+
+            focus = asyncio.create_task(self._focus_task(), name="tracker-focus")
+            tasks = [
+                focus,
+                asyncio.create_task(self._liveness_task(), name="tracker-liveness"),
+                asyncio.create_task(self._persistence_task(), name="tracker-persistence"),
+                asyncio.create_task(self._reporting_task(), name="tracker-reporting"),
+            ]
+            # Nur der Fokus-Task endet regulär; jeder andere Abschluss ist ein Fehler
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is not None:
+                    error = task.exception()
+
+        except Exception as e:
+            error = e
+
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+            await self._blocking(self._stop_sources)
+            self._close_exporters(exporters)
+            # Im Loop-Thread beenden, close() findet dann keine offenen mehr
+            self.save_open_sessions()
+            # Writer-Thread leeren und DB schließen, ohne die Loop zu blockieren
+            await self._loop.run_in_executor(None, self.close)
+            self._platform_executor.shutdown(wait=False)
+            self._loop = None
+            logger.info(f"Monitoring beendet ({self.wakeups} Wakeups)")
+
+        if error is not None:
+            logger.error(f"Fehler im Monitoring: {error}", exc_info=error)
+            raise TrackerError(f"Fehler während Monitoring: {error}")
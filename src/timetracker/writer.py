@@ -0,0 +1,294 @@
+"""Hintergrund-Writer mit Group Commit und Auslagerung für TimeTracker."""
+
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+from .config import (
+    WRITER_BATCH_SIZE,
+    WRITER_FLUSH_INTERVAL,
+    WRITER_QUEUE_SIZE,
+    WRITER_RETRY_INTERVAL,
+)
+from .database import Database, SessionRecord
+from .exceptions import DatabaseError
+from .logger_config import setup_logger
+from .metrics import REGISTRY
+
+logger = setup_logger(__name__)
+
+# Sentinel in der Warteschlange: restliche Sessions schreiben und beenden
+_STOP = object()
+
+# Wird aufgerufen, sobald die Session dauerhaft gespeichert ist
+DurableCallback = Callable[[], None]
+_Item = Tuple[SessionRecord, Optional[DurableCallback]]
+
+
+class SessionWriter:
+    """Schreibt Sessions in einem eigenen Thread in die Datenbank.
+
+    Der Tracker legt Sessions nur in eine begrenzte Warteschlange und
+    wartet nie auf SQLite. Der Writer fasst sie zu Transaktionen zusammen
+    (max. ``batch_size`` Sessions oder ``flush_interval`` Sekunden).
+
+    Ist die DB nicht erreichbar (oder läuft die Warteschlange über),
+    landen Sessions als JSON-Zeilen in einer Auslagerungsdatei neben der
+    DB. Sie wird beim nächsten erfolgreichen Zugriff vor neuen Sessions
+    nachgetragen und danach gelöscht. Nicht lesbare Zeilen wandern dabei
+    in eine Quarantäne-Datei (``<spill>.bad``) statt verloren zu gehen.
+
+    Erst nach dem Commit bzw. dem fsync der Auslagerungsdatei meldet der
+    Writer eine Session als gespeichert (``on_durable`` von ``submit()``).
+    Nachgetragen wird per INSERT OR IGNORE: Stürzt der Prozess zwischen
+    Commit und Aufräumen der Auslagerung (bzw. Freigabe des Checkpoints)
+    ab, wird dieselbe Session beim nächsten Start nicht doppelt gezählt.
+    """
+
+    def __init__(self, db: Database,
+                 spill_path: Optional[Path] = None,
+                 batch_size: int = WRITER_BATCH_SIZE,
+                 flush_interval: float = WRITER_FLUSH_INTERVAL,
+                 queue_size: int = WRITER_QUEUE_SIZE,
+                 retry_interval: float = WRITER_RETRY_INTERVAL) -> None:
+        """Initialisiere den Writer und starte seinen Thread.
+
+        Args:
+            db: Ziel-Datenbank
+            spill_path: Auslagerungsdatei (Standard: <db>.spill neben der DB)
+            batch_size: Max. Sessions pro Transaktion
+            flush_interval: Max. Wartezeit bis ein Batch geschrieben wird
+            queue_size: Größe der Warteschlange
+            retry_interval: Abstand der Wiederholungsversuche bei DB-Fehlern
+        """
+        self.db = db
+        self.spill_path = spill_path or db.db_path.with_name(db.db_path.name + ".spill")
+        # Nicht lesbare Zeilen der Auslagerung, zur manuellen Prüfung
+        self.quarantine_path = self.spill_path.with_name(self.spill_path.name + ".bad")
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retry_interval = retry_interval
+
+        self._queue: "queue.Queue[object]" = queue.Queue(maxsize=queue_size)
+        self._spill_lock = threading.Lock()
+        self._spill_pending = self.spill_path.exists()
+
+        # Zähler für Diagnose
+        self.written = 0
+        self.spilled = 0
+
+        self._thread = threading.Thread(target=self._run, name="SessionWriter", daemon=True)
+        self._thread.start()
+
+    def submit(self, record: SessionRecord,
+               on_durable: Optional[DurableCallback] = None) -> None:
+        """Übergib eine Session zum Schreiben (blockiert nie auf SQLite).
+
+        Ist die Warteschlange voll, wird die Session direkt im aufrufenden
+        Thread ausgelagert – inklusive fsync, der bei langsamer Platte
+        spürbar blockieren kann. Das passiert nur, wenn der Writer schon
+        ``queue_size`` Sessions im Rückstand ist.
+
+        Args:
+            record: Abgeschlossene Session
+            on_durable: Wird aufgerufen, sobald die Session committet oder
+                ausgelagert ist (meist im Writer-Thread). Schlägt beides
+                fehl, wird er nie aufgerufen.
+        """
+        try:
+            self._queue.put_nowait((record, on_durable))
+        except queue.Full:
+            logger.warning("Writer-Warteschlange voll – Session wird ausgelagert")
+            self._spill([(record, on_durable)])
+
+    def close(self) -> None:
+        """Schreibe alle ausstehenden Sessions und beende den Thread."""
+        if not self._thread.is_alive():
+            return
+        # Blockierendes put: die Sentinel darf bei voller Queue nicht verloren gehen
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    # ========== THREAD ==========
+
+    def _run(self) -> None:
+        """Hauptschleife des Writer-Threads."""
+        self._replay_spill()
+
+        stopping = False
+        while not stopping:
+            timeout = self.retry_interval if self._spill_pending else None
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                self._replay_spill()
+                continue
+
+            batch: List[_Item] = []
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+
+            if batch:
+                self._write(batch)
+
+        # Letzter Versuch, Ausgelagertes vor dem Beenden nachzutragen
+        if self._spill_pending:
+            self._replay_spill()
+
+    def _write(self, batch: List[_Item]) -> None:
+        """Schreibe einen Batch, bei Fehlern in die Auslagerungsdatei."""
+        # Ältere, ausgelagerte Sessions zuerst (Reihenfolge bleibt erhalten)
+        if self._spill_pending:
+            self._replay_spill()
+        if self._spill_pending:
+            self._spill(batch)
+            return
+
+        try:
+            written = self.db.log_sessions([record for record, _ in batch], skip_existing=True)
+            self.written += written
+            REGISTRY.inc("sessions_written", written)
+        except DatabaseError as e:
+            logger.warning(f"DB nicht verfügbar, {len(batch)} Session(s) ausgelagert: {e}")
+            self._spill(batch)
+            return
+        self._notify_durable(batch)
+
+    @staticmethod
+    def _notify_durable(batch: List[_Item]) -> None:
+        """Melde gespeicherte Sessions (z.B. Checkpoint-Slot freigeben)."""
+        for _, on_durable in batch:
+            if on_durable is None:
+                continue
+            try:
+                on_durable()
+            except Exception as e:
+                logger.error(f"Fehler nach dem Speichern einer Session: {e}")
+
+    # ========== AUSLAGERUNG ==========
+
+    @staticmethod
+    def _to_json(record: SessionRecord) -> str:
+        """Serialisiere eine Session als JSON-Zeile."""
+        data = record._asdict()
+        data["start_time"] = record.start_time.isoformat()
+        data["end_time"] = record.end_time.isoformat()
+        return json.dumps(data, ensure_ascii=False)
+
+    @staticmethod
+    def _from_json(line: str) -> SessionRecord:
+        """Lies eine Session aus einer JSON-Zeile."""
+        data = json.loads(line)
+        data["start_time"] = datetime.fromisoformat(data["start_time"])
+        data["end_time"] = datetime.fromisoformat(data["end_time"])
+        return SessionRecord(**data)
+
+    def _spill(self, batch: List[_Item]) -> None:
+        """Hänge Sessions an die Auslagerungsdatei an (append-only).
+
+        Schlägt das Schreiben fehl, gelten die Sessions nicht als
+        gespeichert – ihr Checkpoint-Slot bleibt für die Wiederherstellung
+        belegt.
+        """
+        with self._spill_lock:
+            try:
+                with open(self.spill_path, "a", encoding="utf-8") as f:
+                    for record, _ in batch:
+                        f.write(self._to_json(record) + "\n")
+                    f.flush()
+                    os.fsync(f.fileno())
+                self._spill_pending = True
+                self.spilled += len(batch)
+                REGISTRY.inc("sessions_spilled", len(batch))
+            except OSError as e:
+                logger.error(f"Sessions konnten nicht ausgelagert werden: {e}")
+                return
+        self._notify_durable(batch)
+
+    def _quarantine(self, lines: List[str]) -> bool:
+        """Hänge nicht lesbare Zeilen an die Quarantäne-Datei an.
+
+        Returns:
+            bool: True wenn die Zeilen dauerhaft gesichert sind
+        """
+        try:
+            with open(self.quarantine_path, "a", encoding="utf-8") as f:
+                for line in lines:
+                    f.write(line + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+        except OSError as e:
+            logger.error(f"Quarantäne-Datei nicht beschreibbar, Zeilen bleiben ausgelagert: {e}")
+            return False
+        return True
+
+    def _replay_spill(self) -> None:
+        """Trage ausgelagerte Sessions nach und entferne sie bei Erfolg.
+
+        Die Sperre wird nur für Dateizugriffe gehalten, nie während des
+        DB-Zugriffs – ``submit()`` kann also weiter auslagern.
+        """
+        with self._spill_lock:
+            if not self.spill_path.exists():
+                self._spill_pending = False
+                return
+            try:
+                data = self.spill_path.read_bytes()
+            except OSError as e:
+                logger.error(f"Auslagerungsdatei nicht lesbar: {e}")
+                return
+
+        records = []
+        rejected = []
+        for line in data.decode("utf-8", "replace").splitlines():
+            if not line.strip():
+                continue
+            try:
+                records.append(self._from_json(line))
+            except (ValueError, TypeError) as e:
+                # z.B. halb geschriebene Zeile nach einem Absturz
+                logger.warning(f"Beschädigte Zeile in Auslagerungsdatei, "
+                               f"verschoben nach {self.quarantine_path.name}: {e}")
+                rejected.append(line)
+
+        try:
+            # Eine Transaktion: entweder alles oder nichts nachgetragen.
+            # Schon committete Sessions (Absturz vor dem Aufräumen unten)
+            # werden übersprungen
+            written = self.db.log_sessions(records, skip_existing=True)
+            self.written += written
+            REGISTRY.inc("sessions_written", written)
+        except DatabaseError as e:
+            logger.debug(f"Nachtragen weiterhin nicht möglich: {e}")
+            return
+
+        with self._spill_lock:
+            # Zwischenzeitlich angehängte Sessions bleiben stehen
+            rest = self.spill_path.read_bytes()[len(data):]
+            if rejected and not self._quarantine(rejected):
+                # Lieber erneut prüfen als Daten endgültig verwerfen
+                rest = "".join(line + "\n" for line in rejected).encode("utf-8") + rest
+            if rest:
+                tmp_path = self.spill_path.with_name(self.spill_path.name + ".tmp")
+                tmp_path.write_bytes(rest)
+                os.replace(tmp_path, self.spill_path)
+            else:
+                self.spill_path.unlink()
+            self._spill_pending = bool(rest)
+
+        logger.info(f"{len(records)} ausgelagerte Session(s) nachgetragen")
@@ -0,0 +1,22 @@
+"""Gemeinsame Fixtures für alle Tests."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Füge src zum Path hinzu
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from timetracker import logger_config
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _log_to_tmp(tmp_path_factory):
+    """Log-Datei der Tests im Temp-Verzeichnis statt unter data/."""
+    logger_config.shutdown_logging()
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(logger_config, "LOG_PATH", tmp_path_factory.mktemp("logs") / "tracker.log")
+        yield
+        logger_config.shutdown_logging()
@@ -0,0 +1,57 @@
+"""Tests für die NumPy-Analytics (nur mit installiertem numpy)."""
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+# Füge src zum Path hinzu
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+np = pytest.importorskip("numpy")
+
+from timetracker import analytics
+from timetracker.database import Database, SessionRecord
+
+
+def session(app, start, minutes, focus_minutes):
+    return SessionRecord(app, None, start, start + timedelta(minutes=minutes),
+                         focus_minutes * 60, minutes * 60)
+
+
+def test_aggregates_and_incremental_cache(tmp_path):
+    """Heatmap, Serien, Co-Nutzung und Perzentile; neue Zeilen werden angehängt."""
+    monday = datetime(2026, 10, 12, 9, 0)
+    with Database(tmp_path / "tracker.db") as db:
+        db.log_sessions([
+            session("code.exe", monday, 90, 60),                        # Mo 9–10:30
+            session("chrome.exe", monday + timedelta(minutes=30), 30, 10),
+            session("code.exe", monday + timedelta(days=1), 30, 30),    # Di
+            session("code.exe", monday + timedelta(days=3), 10, 5),     # Do
+        ])
+
+        data = analytics.load_sessions(db)
+        assert data.count == 4 and data.apps == ["code.exe", "chrome.exe"]
+        assert analytics.cache_path(db).exists()
+
+        heatmap = analytics.hour_heatmap(data)
+        assert heatmap.shape == (2, 7, 24)
+        assert heatmap[0, 0, 9] == 3600 and heatmap[0, 1, 9] == 1800
+        assert heatmap[1, 0, 9] == 600
+
+        assert analytics.streaks(data) == {"code.exe": (2, 1), "chrome.exe": (1, 0)}
+
+        co = analytics.co_usage(data)
+        assert co[0, 1] == co[1, 0] == 1          # beide Mo 9 Uhr
+        assert co[0, 0] == 4                      # Mo 9+10, Di 9, Do 9
+
+        median = analytics.duration_percentiles(data, (50,))["code.exe"][0]
+        assert median == 1800
+
+        # Zweiter Lauf: nur die neue Zeile wird gelesen
+        db.log_sessions([session("code.exe", monday + timedelta(days=4), 10, 10)])
+        again = analytics.load_sessions(db)
+        assert again.count == 5 and again.last_id == data.last_id + 1
+        assert analytics.streaks(again)["code.exe"] == (2, 2)
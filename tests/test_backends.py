@@ -0,0 +1,66 @@
+"""Tests für das Linux-Backend (/proc und pidfd)."""
+
+import os
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# Füge src zum Path hinzu
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from timetracker.backends import LinuxBackend, PidfdExitWatcher
+
+pytestmark = pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="Linux-Backend nur unter Linux"
+)
+
+
+def test_snapshot_contains_own_process():
+    """Der eigene Prozess taucht mit Name und create_time im Snapshot auf."""
+    backend = LinuxBackend()
+    own = [p for p in backend.snapshot() if p.pid == os.getpid()]
+
+    assert len(own) == 1
+    assert own[0].name.startswith("python")
+    assert own[0].create_time > 0
+
+
+def test_process_details_reads_exe():
+    """Name und Pfad werden direkt aus /proc gelesen."""
+    name, exe = LinuxBackend().process_details(os.getpid())
+
+    assert name.startswith("python")
+    assert os.path.realpath(exe) == os.path.realpath(sys.executable)
+
+
+@pytest.mark.skipif(not PidfdExitWatcher.is_supported(), reason="pidfd_open fehlt")
+def test_pidfd_watcher_reports_exit():
+    """Ein beobachteter Prozess meldet sein Ende ohne Polling."""
+    backend = LinuxBackend()
+    child = subprocess.Popen([sys.executable, "-c", "import sys; sys.stdin.read()"],
+                             stdin=subprocess.PIPE)
+    info = next(p for p in backend.snapshot() if p.pid == child.pid)
+
+    exited = threading.Event()
+    reported = []
+
+    def on_exit(process):
+        reported.append(process)
+        exited.set()
+
+    watcher = backend.create_exit_watcher()
+    watcher.start(on_exit)
+    try:
+        watcher.watch(info)
+        assert not exited.wait(0.1)
+
+        child.stdin.close()
+        child.wait()
+        assert exited.wait(5)
+        assert reported == [info]
+    finally:
+        watcher.stop()
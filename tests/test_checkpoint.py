@@ -0,0 +1,79 @@
+"""Tests für das Checkpoint-Journal offener Sessions."""
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+# Füge src zum Path hinzu
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from timetracker.checkpoint import CheckpointJournal
+from timetracker.exceptions import TrackerError
+
+
+def test_recovers_open_sessions_after_crash(tmp_path):
+    """Nicht freigegebene Slots werden mit dem letzten Checkpoint wiederhergestellt."""
+    path = tmp_path / "tracker.db.ckpt"
+    start = datetime.now().replace(microsecond=0) - timedelta(minutes=10)
+
+    journal = CheckpointJournal(path)
+    journal.recover()
+    crashed = journal.open_slot("notepad.exe", "C:/Windows/notepad.exe", start)
+    finished = journal.open_slot("code.exe", "C:/code.exe", start)
+    journal.update(crashed, start.timestamp() + 300, 120.5)
+    journal.release(finished)
+    journal.close()  # kein regulärer Abschluss von notepad.exe
+
+    journal = CheckpointJournal(path)
+    records = journal.recover()
+
+    assert len(records) == 1
+    slot, record = records[0]
+    assert record.app_name == "notepad.exe"
+    assert record.app_path == "C:/Windows/notepad.exe"
+    assert record.start_time == start
+    assert record.end_time == start + timedelta(seconds=300)
+    assert (record.focus_duration, record.total_duration) == (120, 300)
+
+    # Bis zum Speichern bleibt der Slot belegt: erneuter Absturz verliert nichts
+    other = journal.open_slot("code.exe", "C:/code.exe", start)
+    assert other != slot
+    journal.release(other)
+    journal.close()
+    journal = CheckpointJournal(path)
+    assert [record for _, record in journal.recover()] == [record]
+    journal.release(slot)
+    journal.close()
+
+    journal = CheckpointJournal(path)
+    assert journal.recover() == []
+    journal.close()
+
+
+def test_foreign_file_is_reset(tmp_path):
+    """Eine Datei mit fremdem Inhalt wird verworfen statt falsch gelesen."""
+    path = tmp_path / "tracker.db.ckpt"
+    path.write_bytes(b"garbage" * 100)
+
+    journal = CheckpointJournal(path, slots=4)
+    assert journal.recover() == []
+    journal.close()
+
+
+def test_second_instance_is_locked_out(tmp_path):
+    """Solange eine Instanz das Journal hält, kann keine zweite es übernehmen."""
+    path = tmp_path / "tracker.db.ckpt"
+    journal = CheckpointJournal(path)
+    journal.recover()
+    journal.open_slot("notepad.exe", "C:/notepad.exe", datetime.now())
+
+    with pytest.raises(TrackerError):
+        CheckpointJournal(path)
+
+    journal.close()
+    journal = CheckpointJournal(path)
+    assert len(journal.recover()) == 1
+    journal.close()
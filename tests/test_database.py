@@ -0,0 +1,120 @@
+"""Tests für die SQLite-Datenbankschicht."""
+
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+# Füge src zum Path hinzu
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from timetracker.database import Database, SessionRecord
+from timetracker.exceptions import DatabaseError
+
+
+def log(db, app_name, focus=10, total=20):
+    """Logge eine Session, die gerade geendet hat."""
+    end = datetime.now()
+    db.log_session(app_name, f"C:/{app_name}", end - timedelta(seconds=total), end,
+                   focus, total)
+
+
+def test_uses_wal_journal(tmp_path):
+    """Die Datenbank läuft im WAL-Modus."""
+    with Database(tmp_path / "tracker.db"):
+        conn = sqlite3.connect(tmp_path / "tracker.db")
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        conn.close()
+
+
+def test_stats_not_blocked_by_open_write(tmp_path):
+    """Lesen funktioniert, während ein anderer Schreiber die Sperre hält."""
+    with Database(tmp_path / "tracker.db") as db:
+        log(db, "notepad.exe", focus=10, total=20)
+
+        other = sqlite3.connect(tmp_path / "tracker.db", isolation_level=None)
+        other.execute("BEGIN IMMEDIATE")
+        other.execute("INSERT INTO app_sessions (app_id, start_ms, day, hour) VALUES (1, 0, 0, 0)")
+        try:
+            opens, focus, total, _ = db.get_stats_all_time("notepad.exe")
+        finally:
+            other.execute("ROLLBACK")
+            other.close()
+
+        assert (opens, focus, total) == (1, 10, 20)
+
+
+def test_rollup_matches_raw_sessions(tmp_path):
+    """Die Statistiken aus der Rollup-Tabelle entsprechen den Rohdaten."""
+    with Database(tmp_path / "tracker.db") as db:
+        log(db, "notepad.exe", focus=10, total=20)
+        log(db, "notepad.exe", focus=5, total=30)
+        log(db, "code.exe", focus=1, total=1)
+
+        assert db.get_stats_today("notepad.exe") == (2, 15, 50, 7.5)
+        opens, focus, total, first_use = db.get_stats_all_time("notepad.exe")
+        assert (opens, focus, total) == (2, 15, 50)
+        assert db.get_stats_all_time("unknown.exe")[0] == 0
+
+
+def test_backfills_rollup_for_existing_database(tmp_path):
+    """Eine DB ohne Rollup-Tabelle wird beim Öffnen einmalig nachberechnet."""
+    conn = sqlite3.connect(tmp_path / "tracker.db")
+    conn.execute("""
+        CREATE TABLE app_sessions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, app_name TEXT NOT NULL,
+            app_path TEXT, start_time DATETIME NOT NULL, end_time DATETIME,
+            duration_seconds INTEGER, total_duration_seconds INTEGER,
+            date DATE DEFAULT CURRENT_DATE
+        )
+    """)
+    conn.executemany(
+        "INSERT INTO app_sessions (app_name, start_time, duration_seconds, "
+        "total_duration_seconds, date) VALUES (?, ?, ?, ?, ?)",
+        [("notepad.exe", "2024-01-01 10:00:00", 60, 120, "2024-01-01"),
+         ("notepad.exe", "2024-01-02 09:00:00", 30, 40, "2024-01-02")],
+    )
+    conn.commit()
+    conn.close()
+
+    with Database(tmp_path / "tracker.db") as db:
+        log(db, "notepad.exe", focus=10, total=20)
+        assert db.get_stats_all_time("notepad.exe") == (3, 100, 180, "2024-01-01 10:00:00")
+
+
+def test_bulk_stats_for_all_apps(tmp_path):
+    """Eine Abfrage liefert Heute und Gesamt für alle angefragten Apps."""
+    with Database(tmp_path / "tracker.db") as db:
+        log(db, "notepad.exe", focus=10, total=20)
+        log(db, "notepad.exe", focus=5, total=30)
+        log(db, "code.exe", focus=1, total=2)
+
+        stats = db.get_stats_bulk(["notepad.exe", "code.exe", "unknown.exe"])
+
+        assert stats["notepad.exe"].today == (2, 15, 50, 7.5)
+        assert stats["notepad.exe"].all_time[:3] == (2, 15, 50)
+        assert stats["notepad.exe"].today == db.get_stats_today("notepad.exe")
+        assert stats["code.exe"].all_time == db.get_stats_all_time("code.exe")
+        assert stats["unknown.exe"].today[0] == 0
+
+
+def test_app_ids_survive_rollback(tmp_path):
+    """Nach einem Rollback enthält der Intern-Cache keine verworfenen IDs."""
+    now = datetime.now()
+    with Database(tmp_path / "tracker.db") as db:
+        log(db, "notepad.exe")
+        broken = [SessionRecord("neu.exe", "C:/neu.exe", now, now, 1, 1),
+                  SessionRecord("neu.exe", None, None, None, 1, 1)]
+        with pytest.raises(DatabaseError):
+            db.log_sessions(broken)
+        assert db.read("SELECT name FROM apps") == [("notepad.exe",)]
+
+        log(db, "neu.exe")
+        log(db, "notepad.exe")
+        assert db.read(
+            "SELECT apps.name FROM app_sessions JOIN apps ON apps.id = app_id ORDER BY app_sessions.id"
+        ) == [("notepad.exe",), ("neu.exe",), ("notepad.exe",)]
+        assert db.read("SELECT COUNT(*) FROM apps")[0][0] == 2
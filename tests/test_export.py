@@ -0,0 +1,62 @@
+"""Tests für den Streaming-Export."""
+
+import csv
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Füge src zum Path hinzu
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from timetracker.cli import main
+from timetracker.database import Database, SessionRecord
+from timetracker.export import export_sessions
+
+
+def make_db(path):
+    """DB mit drei Sessions an zwei Tagen."""
+    db = Database(path)
+    db.log_sessions([
+        SessionRecord("code.exe", "C:/code.exe", datetime(2026, 10, 1, 9), datetime(2026, 10, 1, 10), 3000, 3600),
+        SessionRecord("chrome.exe", None, datetime(2026, 10, 1, 11), datetime(2026, 10, 1, 12), 1800, 3600),
+        SessionRecord("code.exe", "C:/code.exe", datetime(2026, 10, 2, 9), datetime(2026, 10, 2, 9, 30), 1200, 1800),
+    ])
+    return db
+
+
+def test_export_filters_in_small_batches(tmp_path):
+    """Zeit- und App-Filter greifen, auch über mehrere fetchmany-Batches."""
+    with make_db(tmp_path / "tracker.db") as db:
+        rows = export_sessions(db, str(tmp_path / "out.jsonl"),
+                               since=datetime(2026, 10, 1, 10), app_names=["code.exe", "chrome.exe"],
+                               batch_size=1)
+        assert rows == 2
+        lines = [json.loads(line) for line in (tmp_path / "out.jsonl").read_text(encoding="utf-8").splitlines()]
+        assert [line["app_name"] for line in lines] == ["chrome.exe", "code.exe"]
+        assert lines[0]["app_path"] is None
+        assert lines[1]["duration_seconds"] == 1200
+
+        assert export_sessions(db, str(tmp_path / "none.csv"), until=datetime(2026, 10, 1)) == 0
+
+
+def test_cli_export_csv(tmp_path):
+    """``export`` schreibt CSV mit Kopfzeile, gefiltert nach App."""
+    make_db(tmp_path / "tracker.db").close()
+    output = tmp_path / "sessions.csv"
+
+    code = main(["export", str(output), "--db", str(tmp_path / "tracker.db"),
+                 "--app", "code.exe", "--until", "2026-10-02"])
+
+    assert code == 0
+    with open(output, newline="", encoding="utf-8") as file:
+        rows = list(csv.DictReader(file))
+    assert len(rows) == 1
+    assert rows[0]["start_time"] == "2026-10-01 09:00:00"
+    assert rows[0]["total_duration_seconds"] == "3600"
+
+    # Tippfehler im DB-Pfad: Fehler statt stiller, leerer DB
+    missing = tmp_path / "trackr.db"
+    assert main(["export", str(output), "--db", str(missing)]) != 0
+    assert not missing.exists()
@@ -15,6 +15,11 @@ def test_imports():
         from timetracker.logger_config import setup_logger
         from timetracker.strings import Messages
         from timetracker.database import Database
+        from timetracker.process_table import ProcessTable
+        from timetracker.foreground import ForegroundSource
+        from timetracker.backends import get_backend
+        from timetracker.writer import SessionWriter
+        from timetracker.checkpoint import CheckpointJournal
         from timetracker.tracker import AppTracker
         from timetracker.app import TimeTrackerApp
         
@@ -24,6 +29,23 @@ def test_imports():
         print(f"❌ Import fehlgeschlagen: {e}")
         return False
 
+
+def test_app_import_is_lazy():
+    """Menü/Statistik laden weder Tracker noch psutil und legen nichts an."""
+    import subprocess
+
+    code = (
+        "import sys; import timetracker.app; "
+        "print(sorted(m for m in ('psutil', 'sqlite3', 'timetracker.tracker') "
+        "if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=src_path, capture_output=True, text=True, check=True,
+    )
+    assert result.stdout.strip() == "[]"
+
+
 if __name__ == "__main__":
     success = test_imports()
     sys.exit(0 if success else 1)
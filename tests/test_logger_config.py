@@ -0,0 +1,45 @@
+"""Tests für die Queue-basierte Logging-Pipeline."""
+
+import logging
+import queue
+import sys
+from pathlib import Path
+
+# Füge src zum Path hinzu
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from timetracker.logger_config import _DeferredQueueHandler, setup_logger
+
+
+def test_loggers_share_one_queue_handler(caplog):
+    """Der QueueHandler hängt einmal am Paket-Logger, Records erreichen auch caplog."""
+    first = setup_logger("timetracker.test_a")
+    setup_logger("timetracker.test_b")
+    setup_logger("timetracker.test_a")
+
+    package = logging.getLogger("timetracker")
+    assert len(package.handlers) == 1
+    assert isinstance(package.handlers[0], _DeferredQueueHandler)
+    assert first.handlers == [] and first.propagate
+
+    with caplog.at_level(logging.INFO):
+        first.info("Hallo %s", "Welt")
+    assert caplog.messages == ["Hallo Welt"]
+
+
+def test_message_is_rendered_in_calling_thread():
+    """Argumente und Traceback werden beim Loggen aufgelöst, nicht erst im Listener."""
+    handler = _DeferredQueueHandler(queue.SimpleQueue())
+    args = ["vorher"]
+    try:
+        raise ValueError("kaputt")
+    except ValueError:
+        record = logging.LogRecord("t", logging.ERROR, __file__, 1, "Wert: %s", (args,),
+                                   sys.exc_info())
+    prepared = handler._prepare(record)
+    args[0] = "nachher"
+
+    assert prepared.getMessage() == "Wert: ['vorher']"
+    assert prepared.exc_info is None and "ValueError: kaputt" in prepared.exc_text
+    assert record.args == (args,)
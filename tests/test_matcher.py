@@ -0,0 +1,70 @@
+"""Tests für den vorkompilierten App-Abgleich."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Füge src zum Path hinzu
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from timetracker.exceptions import ConfigError
+from timetracker.matcher import AppMatcher
+
+
+def test_rule_kinds():
+    """Exakte Namen, Teilstrings, Globs, Regex und Pfade werden erkannt."""
+    matcher = AppMatcher([
+        "Notepad.exe",
+        "chrome",
+        "code*.exe",
+        "re:^(idea|pycharm)64\\.exe$",
+        "C:\\Tools\\*",
+    ])
+
+    assert matcher.match("notepad.exe")
+    assert matcher.match("chrome.exe")             # Teilstring wie bisher
+    assert matcher.match("Code - Insiders.exe")
+    assert matcher.match("pycharm64.exe")
+    assert not matcher.match("mycode.exe")          # Glob ist verankert
+    assert not matcher.match("explorer.exe")
+    assert matcher.match("foo.exe", "c:/tools/foo.exe")
+    assert not matcher.match("foo.exe", "C:\\Other\\foo.exe")
+
+
+def test_decisions_cached_per_process():
+    """Entscheidungen gelten pro (pid, create_time) bis zum forget()."""
+    matcher = AppMatcher(["notepad.exe"])
+    key = (42, 1.0)
+
+    assert matcher.match_process(key, "notepad.exe")
+    # Cache-Treffer: der Name wird nicht erneut geprüft
+    assert matcher.match_process(key, "explorer.exe")
+
+    matcher.forget(key)
+    assert not matcher.match_process(key, "explorer.exe")
+
+
+def test_invalid_regex_raises_config_error():
+    """Ungültige reguläre Ausdrücke fallen schon beim Kompilieren auf."""
+    with pytest.raises(ConfigError):
+        AppMatcher(["re:(unclosed"])
+
+
+def test_regex_rules_with_groups_keep_their_meaning():
+    """Rückverweise und globale Flags funktionieren auch neben anderen Regeln."""
+    matcher = AppMatcher([
+        "notepad.exe",
+        r"re:^(\w)\1\w*\.exe$",        # doppelter Anfangsbuchstabe
+        r"re:(?i)^GAME\d+\.exe$",
+        r"re:^(?P<n>x)y(?P=n)\.exe$",
+        "code*.exe",
+    ])
+
+    assert matcher.match("aardvark.exe")
+    assert not matcher.match("abacus.exe")
+    assert matcher.match("game42.exe")
+    assert matcher.match("xyx.exe")
+    assert matcher.match("code-insiders.exe")
+    assert matcher.match("notepad.exe")
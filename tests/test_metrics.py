@@ -0,0 +1,66 @@
+"""Tests für Latenz-Histogramme und den Metrik-Export."""
+
+import sys
+import threading
+import urllib.request
+from pathlib import Path
+
+# Füge src zum Path hinzu
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from timetracker.metrics import Histogram, Metrics, MetricsServer
+
+
+def test_histogram_percentiles_within_bucket_error():
+    """Perzentile liegen höchstens einen Bucket (~3 %) unter dem exakten Wert."""
+    hist = Histogram()
+    values = list(range(1, 100_001))
+    for value in values:
+        hist.record(value * 1000)
+
+    for q in (0.5, 0.9, 0.99, 0.999):
+        exact = values[int(q * len(values)) - 1] * 1000
+        assert exact * 0.96 <= hist.percentile(q) <= exact
+    assert hist.count == len(values)
+    assert hist.max == 100_000_000
+    assert Histogram().percentile(0.5) == 0
+
+
+def test_prometheus_endpoint():
+    """Der Endpunkt liefert Zähler und Summaries im Prometheus-Textformat."""
+    metrics = Metrics()
+    metrics.inc("ticks", 3)
+
+    @metrics.timed("work")
+    def work():
+        return 42
+
+    assert work() == 42
+
+    server = MetricsServer(metrics, port=0)
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics") as response:
+            body = response.read().decode("utf-8")
+    finally:
+        server.close()
+
+    assert "timetracker_ticks_total 3" in body
+    assert 'timetracker_work_seconds{quantile="0.99"}' in body
+    assert "timetracker_work_seconds_count 1" in body
+
+
+def test_counters_are_thread_safe():
+    """Gleichzeitige inc()-Aufrufe aus mehreren Threads gehen nicht verloren."""
+    metrics = Metrics()
+
+    def work():
+        for _ in range(20_000):
+            metrics.inc("events")
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert metrics.counters["events"] == 80_000
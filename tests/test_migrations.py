@@ -0,0 +1,131 @@
+"""Tests für die versionierten Schema-Migrationen."""
+
+import sqlite3
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+# Füge src zum Path hinzu
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from timetracker import migrations
+from timetracker.database import Database, SessionRecord, to_epoch_ms
+
+
+def legacy_db(path: Path) -> None:
+    """DB im Schema von vor den Migrationen (user_version 0, Text-Zeitstempel)."""
+    conn = sqlite3.connect(path)
+    migrations._create_base_schema(conn)
+    conn.executemany(
+        "INSERT INTO app_sessions (app_name, app_path, start_time, end_time, "
+        "duration_seconds, total_duration_seconds, date) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [("code.exe", "C:/code.exe", f"2026-10-0{day} 23:30:00.250000",
+          f"2026-10-0{day + 1} 00:30:00", 1800, 3600, f"2026-10-0{day + 1}")
+         for day in range(1, 6)]
+        + [("kaputt.exe", None, "y", None, None, None, "2026-10-01")],
+    )
+    # Gelöschte letzte Session: ihre ID darf nicht erneut vergeben werden
+    conn.execute("DELETE FROM app_sessions WHERE app_name = 'kaputt.exe'")
+    conn.commit()
+    conn.close()
+
+
+def test_migrates_legacy_database(tmp_path):
+    """Text-Zeitstempel werden zu Epoch-ms und lokalen Buckets, Rollups bleiben gleich."""
+    path = tmp_path / "tracker.db"
+    legacy_db(path)
+    conn = sqlite3.connect(path)
+    rollups = conn.execute("SELECT * FROM app_hourly_stats ORDER BY 1, 2").fetchall()
+    conn.close()
+
+    with Database(path) as db:
+        row = db.read("SELECT start_ms, end_ms, day, hour FROM app_sessions WHERE id = 1")[0]
+        assert row == (
+            to_epoch_ms(datetime(2026, 10, 1, 23, 30, 0, 250000)),
+            to_epoch_ms(datetime(2026, 10, 2, 0, 30)),
+            (datetime(2026, 10, 1) - datetime(1970, 1, 1)).days,
+            23,
+        )
+        assert db.read(
+            "SELECT apps.name, hour, opens, focus_seconds, total_seconds "
+            "FROM app_hourly_stats JOIN apps ON apps.id = app_id ORDER BY 1, 2"
+        ) == rollups
+        assert db.read("SELECT path FROM app_paths") == [("C:/code.exe",)]
+
+        # Neue Sessions landen über die neuen Trigger im selben Rollup
+        db.log_session("code.exe", "C:/code.exe", datetime(2026, 10, 1, 23, 45),
+                       datetime(2026, 10, 1, 23, 50), 60, 300)
+        assert db.read("SELECT MAX(id) FROM app_sessions")[0][0] == 7
+        assert db.read(
+            "SELECT opens, total_seconds FROM app_hourly_stats WHERE hour = '2026-10-01 23'"
+        ) == [(2, 3900)]
+
+        sql = ("EXPLAIN QUERY PLAN SELECT SUM(total_duration_seconds) FROM app_sessions "
+               "WHERE app_id = ? AND start_ms BETWEEN ? AND ?")
+        assert "COVERING INDEX" in db.read(sql, (1, 0, 1))[0][-1]
+
+    conn = sqlite3.connect(path)
+    assert migrations.schema_version(conn) == migrations.SCHEMA_VERSION
+    # Alt-DB ohne auto_vacuum: einmalig per VACUUM umgestellt
+    assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2  # INCREMENTAL
+    if sqlite3.sqlite_version_info >= (3, 37, 0):
+        assert conn.execute(
+            "SELECT strict FROM pragma_table_list WHERE name = 'app_sessions'"
+        ).fetchone() == (1,)
+    conn.close()
+
+
+def test_interrupted_migration_resumes(tmp_path, monkeypatch):
+    """Ein Abbruch nach dem Kopieren lässt die Version stehen, der nächste Lauf setzt fort."""
+    path = tmp_path / "tracker.db"
+    legacy_db(path)
+
+    def crash(conn):
+        raise sqlite3.OperationalError("Absturz")
+
+    patched = list(migrations.MIGRATIONS)
+    patched[1] = patched[1]._replace(finish=crash)
+    monkeypatch.setattr(migrations, "MIGRATIONS", patched)
+    conn = sqlite3.connect(path, isolation_level="IMMEDIATE")
+    with pytest.raises(sqlite3.OperationalError):
+        migrations.migrate(conn, batch_size=2)
+    assert migrations.schema_version(conn) == 1
+    assert conn.execute("SELECT COUNT(*) FROM app_sessions_v2").fetchone()[0] == 5
+    assert "app_sessions_v3" not in {
+        row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+    monkeypatch.undo()
+
+    assert migrations.migrate(conn, batch_size=2) == migrations.SCHEMA_VERSION
+    assert conn.execute("SELECT COUNT(*) FROM app_sessions").fetchone()[0] == 5
+    conn.close()
+
+
+def test_duplicate_sessions_are_removed(tmp_path):
+    """Version 5 entfernt doppelt gespeicherte Sessions samt ihrem Anteil an den Rollups."""
+    path = tmp_path / "tracker.db"
+    with Database(path) as db:
+        db.log_sessions([SessionRecord("code.exe", None, datetime(2026, 10, 1, 9),
+                                       datetime(2026, 10, 1, 10), 1800, 3600)])
+
+    # Stand von Version 4: kein Unique-Index, Session doppelt nachgetragen
+    conn = sqlite3.connect(path)
+    conn.execute("DROP INDEX idx_sessions_identity")
+    conn.execute("PRAGMA user_version = 4")
+    conn.execute(
+        "INSERT INTO app_sessions (app_id, path_id, start_ms, end_ms, duration_seconds, "
+        "total_duration_seconds, day, hour) SELECT app_id, path_id, start_ms, end_ms, "
+        "duration_seconds, total_duration_seconds, day, hour FROM app_sessions"
+    )
+    conn.commit()
+    assert conn.execute("SELECT opens FROM app_hourly_stats").fetchall() == [(2,)]
+    conn.close()
+
+    with Database(path) as db:
+        assert db.read("SELECT COUNT(*) FROM app_sessions") == [(1,)]
+        for table in ("app_daily_stats", "app_hourly_stats"):
+            assert db.read(
+                f"SELECT opens, focus_seconds, total_seconds FROM {table}"
+            ) == [(1, 1800, 3600)]
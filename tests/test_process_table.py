@@ -0,0 +1,86 @@
+"""Tests für die Snapshot-und-Diff Prozesstabelle."""
+
+import sys
+from pathlib import Path
+
+# Füge src zum Path hinzu
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from timetracker.process_table import PidCache, ProcessInfo, ProcessTable
+
+
+def test_refresh_emits_started_and_exited():
+    """Start/Exit-Events werden über (pid, create_time) erkannt."""
+    snapshots = [
+        [ProcessInfo(1, "notepad.exe", 100.0), ProcessInfo(2, "code.exe", 100.0)],
+        [ProcessInfo(2, "code.exe", 100.0), ProcessInfo(3, "notepad.exe", 200.0)],
+        # PID 3 wurde wiederverwendet → neuer Prozess
+        [ProcessInfo(2, "code.exe", 100.0), ProcessInfo(3, "notepad.exe", 300.0)],
+    ]
+    table = ProcessTable(lambda: snapshots.pop(0))
+
+    started, exited = table.refresh()
+    assert {p.pid for p in started} == {1, 2}
+    assert exited == []
+
+    started, exited = table.refresh()
+    assert [p.key for p in started] == [(3, 200.0)]
+    assert [p.key for p in exited] == [(1, 100.0)]
+    assert table.is_running("notepad.exe")
+
+    started, exited = table.refresh()
+    assert [p.key for p in started] == [(3, 300.0)]
+    assert [p.key for p in exited] == [(3, 200.0)]
+    assert len(table) == 2
+
+
+def test_is_running_counts_instances():
+    """Ein Name läuft so lange, bis seine letzte Instanz beendet ist."""
+    snapshots = [
+        [ProcessInfo(1, "notepad.exe", 1.0), ProcessInfo(2, "notepad.exe", 2.0)],
+        [ProcessInfo(2, "notepad.exe", 2.0)],
+        [],
+    ]
+    table = ProcessTable(lambda: snapshots.pop(0))
+
+    table.refresh()
+    table.refresh()
+    assert table.is_running("notepad.exe")
+    table.refresh()
+    assert not table.is_running("notepad.exe")
+
+
+def test_refresh_keeps_state_on_error():
+    """Ein fehlgeschlagener Snapshot meldet keine beendeten Prozesse."""
+    calls = []
+
+    def snapshot():
+        calls.append(1)
+        if len(calls) > 1:
+            raise OSError("boom")
+        return [ProcessInfo(1, "notepad.exe", 1.0)]
+
+    table = ProcessTable(snapshot)
+    table.refresh()
+    assert table.refresh() == ([], [])
+    assert table.is_running("notepad.exe")
+
+
+def test_pid_cache_validates_create_time():
+    """Treffer nur solange die PID zum selben Prozess gehört."""
+    live = {7: ProcessInfo(7, "notepad.exe", 1.0)}
+    cache = PidCache(lambda pid: (live[pid].name, f"C:/{live[pid].name}"),
+                     lambda pid: live[pid].create_time if pid in live else None)
+
+    assert cache.lookup(7) == ("notepad.exe", "C:/notepad.exe")
+    assert cache.lookup(7) == ("notepad.exe", "C:/notepad.exe")
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # PID 7 wurde wiederverwendet – ohne neuen Snapshot
+    old, live[7] = live[7], ProcessInfo(7, "code.exe", 2.0)
+    assert cache.lookup(7) == ("code.exe", "C:/code.exe")
+    assert cache.misses == 2
+
+    cache.evict(old)                # alter Prozess: neuer Eintrag bleibt
+    assert len(cache) == 1
@@ -0,0 +1,45 @@
+"""Tests für den Profiling-Modus."""
+
+import sys
+import threading
+from pathlib import Path
+
+# Füge src zum Path hinzu
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from timetracker.profiling import Profiler
+
+
+def _busy_work(stop: threading.Event, sink: list) -> None:
+    while not stop.is_set():
+        sink.append(sum(range(200)))
+        if len(sink) > 10_000:
+            sink.clear()
+
+
+def test_profiler_dumps_and_rotates(tmp_path):
+    """Dumps enthalten CPU- und Speicher-Teil, alte Dumps werden gelöscht."""
+    profiler = Profiler(tmp_path, dump_interval=3600, sample_interval=0.005, keep=2)
+    stop = threading.Event()
+    worker = threading.Thread(target=_busy_work, args=(stop, []))
+
+    profiler.start()
+    worker.start()
+    try:
+        while profiler.sampler.samples < 20:
+            threading.Event().wait(0.01)
+        first = profiler.dump().read_text(encoding="utf-8")
+    finally:
+        stop.set()
+        worker.join()
+
+    assert "_busy_work" in first
+    assert "== Speicher (tracemalloc) ==" in first
+
+    profiler.dump()
+    profiler.stop()  # schreibt den dritten Dump
+
+    assert len(list(tmp_path.glob("profile-*.txt"))) == 2
+    assert len(list(tmp_path.glob("profile-*.folded"))) == 2
+    assert "Zuwachs seit letztem Dump" in first
@@ -0,0 +1,70 @@
+"""Tests für die Zeitraum-Reports."""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Füge src zum Path hinzu
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from timetracker.database import Database, SessionRecord
+from timetracker.reports import build_report, resolve_apps
+
+
+def session(app, start, minutes, focus_minutes):
+    return SessionRecord(app, None, start, start, focus_minutes * 60, minutes * 60)
+
+
+def test_buckets_in_local_time(tmp_path):
+    """Sessions landen im Bucket ihres (lokalen) Starts, Anteile per Window-Funktion."""
+    with Database(tmp_path / "tracker.db") as db:
+        db.log_sessions([
+            # Donnerstag kurz vor Mitternacht: in UTC wäre es u.U. schon Freitag
+            session("code.exe", datetime(2026, 10, 15, 23, 30), 20, 10),
+            session("code.exe", datetime(2026, 10, 16, 9, 0), 60, 30),
+            session("code.exe", datetime(2026, 10, 16, 9, 40), 10, 10),
+            session("chrome.exe", datetime(2026, 10, 16, 9, 5), 30, 20),
+            session("code.exe", datetime(2026, 11, 2, 8, 0), 60, 60),
+        ])
+        since, until = datetime(2026, 10, 1), datetime(2026, 11, 1)
+
+        days = build_report(db, since, until, "day")
+        assert [(r.bucket, r.app_name, r.opens, r.focus_seconds) for r in days] == [
+            ("2026-10-15", "code.exe", 1, 600),
+            ("2026-10-16", "chrome.exe", 1, 1200),
+            ("2026-10-16", "code.exe", 2, 2400),
+        ]
+        assert days[1].focus_share == 1200 / 3600
+        assert days[2].focus_share == 2400 / 3600
+
+        hours = build_report(db, since, until, "hour", ["code.exe"])
+        assert [(r.bucket, r.total_seconds) for r in hours] == [
+            ("2026-10-15 23", 1200), ("2026-10-16 09", 4200),
+        ]
+
+        weekdays = build_report(db, since, until, "weekday", ["code.exe"])
+        assert [(r.bucket, r.opens) for r in weekdays] == [(3, 1), (4, 2)]  # Do, Fr
+
+        weeks = build_report(db, since, datetime(2026, 12, 1), "week", ["code.exe"])
+        assert [r.bucket for r in weeks] == ["2026-10-12", "2026-11-02"]
+
+        months = build_report(db, since, datetime(2026, 12, 1), "month")
+        assert [(r.bucket, r.app_name) for r in months] == [
+            ("2026-10", "chrome.exe"), ("2026-10", "code.exe"), ("2026-11", "code.exe"),
+        ]
+
+
+def test_resolve_apps_applies_target_rules(tmp_path):
+    """Glob-, Regex- und Pfadregeln aus target_apps werden gegen gespeicherte Apps aufgelöst."""
+    start = datetime(2026, 10, 16, 9)
+    with Database(tmp_path / "tracker.db") as db:
+        db.log_sessions([
+            SessionRecord("code.exe", "C:/VS/code.exe", start, start, 60, 60),
+            SessionRecord("codium.exe", None, start, start, 60, 60),
+            SessionRecord("tool.exe", "D:/Portable/tool.exe", start, start, 60, 60),
+            SessionRecord("chrome.exe", "C:/chrome.exe", start, start, 60, 60),
+        ])
+        assert resolve_apps(db, ["re:^cod(e|ium)\\.exe$"]) == ["code.exe", "codium.exe"]
+        assert resolve_apps(db, ["chr*.exe", "D:/Portable/*"]) == ["chrome.exe", "tool.exe"]
+        assert resolve_apps(db, ["notepad.exe"]) == []
@@ -0,0 +1,58 @@
+"""Tests für Aufbewahrung und Verdichtung alter Roh-Sessions."""
+
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+# Füge src zum Path hinzu
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from timetracker.database import Database, SessionRecord
+from timetracker.exceptions import ConfigError
+from timetracker.retention import Compactor
+
+
+def test_compaction_keeps_rollups_and_frees_pages(tmp_path):
+    """Abgelaufene Sessions werden in Batches gelöscht, Rollups und neue Sessions bleiben."""
+    now = datetime(2026, 10, 17, 12, 0)
+    path = tmp_path / "tracker.db"
+    with Database(path) as db:
+        db.log_sessions(
+            SessionRecord("code.exe", "C:/x/" + "p" * 200, start, start + timedelta(minutes=5), 60, 300)
+            for start in (now - timedelta(days=day, minutes=i)
+                          for day in (200, 120, 1) for i in range(500))
+        )
+        before = db.read("SELECT SUM(opens), SUM(total_seconds) FROM app_daily_stats")
+
+        compactor = Compactor(db, 90, batch_size=300, pause=0)
+        assert compactor.run_once(now) == 1000
+        assert compactor.run_once(now) == 0
+
+        assert db.read("SELECT COUNT(*) FROM app_sessions")[0][0] == 500
+        assert db.read("SELECT SUM(opens), SUM(total_seconds) FROM app_daily_stats") == before
+
+    conn = sqlite3.connect(path)
+    assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2  # INCREMENTAL
+    assert conn.execute("PRAGMA freelist_count").fetchone()[0] == 0
+    conn.close()
+
+
+def test_retention_from_config(tmp_path):
+    """Ohne retention_days bleibt alles erhalten, ungültige Werte sind Konfigurationsfehler."""
+    with Database(tmp_path / "tracker.db") as db:
+        assert Compactor.from_config(db, {}) is None
+        assert Compactor.from_config(db, {"retention_days": "30"}).retention_days == 30
+        with pytest.raises(ConfigError):
+            Compactor.from_config(db, {"retention_days": 0})
+        with pytest.raises(ConfigError):
+            Compactor.from_config(db, {"retention_days": "bald"})
+
+        # Hintergrund-Thread endet sauber vor dem ersten Durchlauf
+        compactor = Compactor(db, 30)
+        compactor.start()
+        compactor.close()
+        assert compactor.deleted == 0
@@ -0,0 +1,40 @@
+"""Tests für das adaptive Polling-Intervall."""
+
+import sys
+from pathlib import Path
+
+# Füge src zum Path hinzu
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from timetracker.scheduler import AdaptiveScheduler, ManualIdleDetector
+
+
+def test_backs_off_and_resets_on_transition():
+    """Stabiler Fokus verlängert das Intervall, ein Wechsel setzt es zurück."""
+    scheduler = AdaptiveScheduler(0.5, 4.0, backoff=2.0)
+
+    assert [scheduler.next_interval(True) for _ in range(5)] == [0.5, 1.0, 2.0, 4.0, 4.0]
+
+    scheduler.on_transition()
+    assert scheduler.next_interval(True) == 0.5
+    # Ohne offene Session sofort maximal
+    assert scheduler.next_interval(False) == 4.0
+
+
+def test_idle_pauses_polling():
+    """Inaktivität oder Sperre schalten auf das Idle-Intervall."""
+    detector = ManualIdleDetector()
+    scheduler = AdaptiveScheduler(0.5, 4.0, idle_detector=detector,
+                                  idle_threshold=60.0, idle_interval=30.0)
+
+    detector.idle = 120.0
+    assert scheduler.next_interval(True) == 30.0
+
+    detector.idle = 0.0
+    detector.locked = True
+    assert scheduler.next_interval(True) == 30.0
+
+    # Zurück aus der Sperre: sofort wieder schnell
+    detector.locked = False
+    assert scheduler.next_interval(True) == 0.5
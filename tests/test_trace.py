@@ -0,0 +1,132 @@
+"""Tests für Trace-Aufzeichnung und Replay."""
+
+import json
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Füge src zum Path hinzu
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from timetracker.foreground import ForegroundEvent, ScriptedForegroundSource
+from timetracker.process_table import ProcessInfo
+from timetracker.session import VirtualClock
+from timetracker.trace import (
+    KIND_FOCUS,
+    ReplayBackend,
+    TraceReader,
+    TraceRecorder,
+    replay_trace,
+)
+from timetracker.tracker import AppTracker
+
+START = datetime(2024, 3, 4, 8, 0, 0)
+
+
+def write_config(path: Path, db_path: Path) -> Path:
+    """Schreibe eine Test-Config."""
+    path.write_text(json.dumps({
+        "target_apps": ["notepad.exe", "code.exe"],
+        "db_path": str(db_path),
+        "check_interval": 0.5,
+    }), encoding="utf-8")
+    return path
+
+
+def sessions(db_path: Path):
+    """Alle Sessions ohne ID, sortiert."""
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute(
+        "SELECT apps.name, start_ms, end_ms, duration_seconds, total_duration_seconds "
+        "FROM app_sessions JOIN apps ON apps.id = app_id ORDER BY start_ms, apps.name"
+    ).fetchall()
+    conn.close()
+    return rows
+
+
+def test_replay_reproduces_live_sessions(tmp_path):
+    """Ein aufgezeichneter Lauf ergibt beim Replay dieselben Sessions."""
+    clock = VirtualClock(START)
+    backend = ReplayBackend()
+    trace_path = tmp_path / "live.tttrace"
+    live_config = write_config(tmp_path / "live.json", tmp_path / "live.db")
+    tracker = AppTracker(live_config, backend=backend,
+                         foreground_source=ScriptedForegroundSource(), clock=clock,
+                         recorder=TraceRecorder(trace_path, clock))
+
+    backend.start(ProcessInfo(1, "notepad.exe", 1.0))
+    backend.start(ProcessInfo(2, "explorer.exe", 1.0))
+    tracker.check_liveness()
+
+    tracker.handle_foreground(ForegroundEvent(1, "notepad.exe", "C:/notepad.exe"))
+    clock.advance(90.5)
+    # code.exe ist jünger als der letzte Snapshot
+    backend.start(ProcessInfo(3, "code.exe", 2.0))
+    tracker.handle_foreground(ForegroundEvent(3, "code.exe", "C:/code.exe"))
+    clock.advance(40)
+    tracker.handle_foreground(ForegroundEvent(2, "explorer.exe"))
+    clock.advance(30)
+    backend.exit(ProcessInfo(1, "notepad.exe", 1.0))
+    tracker.check_liveness()
+    clock.advance(10)
+    tracker.close()
+
+    kinds = [event.kind for event in TraceReader(trace_path)]
+    assert kinds.count(KIND_FOCUS) == 3
+
+    replay_config = write_config(tmp_path / "replay.json", tmp_path / "replay.db")
+    result = replay_trace(trace_path, replay_config)
+
+    assert result.sessions == 2
+    assert sessions(tmp_path / "replay.db") == sessions(tmp_path / "live.db")
+
+
+def test_week_replays_fast(tmp_path):
+    """Eine simulierte Woche läuft um Größenordnungen schneller als Echtzeit."""
+    clock = VirtualClock(START)
+    trace_path = tmp_path / "week.tttrace"
+    recorder = TraceRecorder(trace_path, clock)
+
+    apps = [(1, "notepad.exe"), (2, "code.exe"), (3, "explorer.exe")]
+    recorder.processes([ProcessInfo(pid, name, 1.0) for pid, name in apps], [])
+    for day in range(7):
+        clock.set(day * 86400 * 10**9)
+        # 8 Stunden Arbeit, Fokuswechsel alle 30 Sekunden
+        for i in range(8 * 120):
+            pid, name = apps[i % len(apps)]
+            recorder.focus(pid, name, f"C:/{name}")
+            clock.advance(30)
+        # Abends werden die Apps beendet und am nächsten Morgen neu gestartet
+        recorder.processes([], [ProcessInfo(pid, name, 1.0 + day) for pid, name in apps])
+        clock.advance(12 * 3600)
+        recorder.processes([ProcessInfo(pid, name, 2.0 + day) for pid, name in apps], [])
+    recorder.close()
+
+    config = write_config(tmp_path / "replay.json", tmp_path / "replay.db")
+    result = replay_trace(trace_path, config)
+
+    assert result.simulated_seconds >= 6 * 86400
+    assert result.sessions == 14
+    assert result.speedup > 1000
+
+
+def test_checkpoint_flushes_trace(tmp_path):
+    """Nach einem Checkpoint stehen die bisherigen Events schon vor close() in der Datei."""
+    clock = VirtualClock(START)
+    backend = ReplayBackend()
+    trace_path = tmp_path / "live.tttrace"
+    tracker = AppTracker(write_config(tmp_path / "live.json", tmp_path / "live.db"),
+                         backend=backend, foreground_source=ScriptedForegroundSource(),
+                         clock=clock, recorder=TraceRecorder(trace_path, clock))
+
+    backend.start(ProcessInfo(1, "notepad.exe", 1.0))
+    tracker.check_liveness()
+    tracker.handle_foreground(ForegroundEvent(1, "notepad.exe", "C:/notepad.exe"))
+    tracker.checkpoint()
+
+    kinds = [event.kind for event in TraceReader(trace_path)]
+    assert kinds.count(KIND_FOCUS) == 1
+    tracker.close()
+    assert len(sessions(tmp_path / "live.db")) == 1
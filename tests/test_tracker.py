@@ -0,0 +1,229 @@
+"""Tests für den AppTracker mit skriptgesteuerter Fokus-Quelle."""
+
+import asyncio
+import json
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Füge src zum Path hinzu
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from timetracker.backends import PlatformBackend
+from timetracker.config import LIVENESS_INTERVAL
+from timetracker.foreground import ForegroundEvent, ScriptedForegroundSource
+from timetracker.process_table import ProcessInfo
+from timetracker.tracker import AppTracker
+
+
+class FakeBackend(PlatformBackend):
+    """Backend mit veränderbarer Prozessliste, ohne echte Prozesse."""
+
+    def __init__(self, *names: str) -> None:
+        self.processes = [ProcessInfo(pid, name, 1.0) for pid, name in enumerate(names, 1)]
+
+    def snapshot(self):
+        return list(self.processes)
+
+    def _live(self, pid):
+        return next((p for p in self.processes if p.pid == pid), None)
+
+    def process_details(self, pid):
+        info = self._live(pid)
+        return (info.name, f"C:/{info.name}") if info else (None, None)
+
+    def create_time(self, pid):
+        info = self._live(pid)
+        return info.create_time if info else None
+
+    def kill(self, name: str) -> None:
+        self.processes = [p for p in self.processes if p.name != name]
+
+    def reuse(self, pid: int, name: str) -> None:
+        """Beende den Prozess mit ``pid`` und starte einen neuen mit derselben PID."""
+        old = self._live(pid)
+        self.processes = [p for p in self.processes if p.pid != pid]
+        self.processes.append(ProcessInfo(pid, name, old.create_time + 1))
+
+
+class FakeClock:
+    """Manuell vorgestellte Uhr (monoton und Wanduhr gemeinsam)."""
+
+    def __init__(self) -> None:
+        self.ns = 0
+        self.start = datetime(2024, 1, 1, 12, 0, 0)
+
+    def advance(self, seconds: float) -> None:
+        self.ns += int(seconds * 1e9)
+
+    def monotonic_ns(self) -> int:
+        return self.ns
+
+    def now(self) -> datetime:
+        return self.start + timedelta(microseconds=self.ns // 1000)
+
+
+def make_tracker(tmp_path, backend, events=(), clock=None):
+    """Erstelle einen AppTracker mit Test-Config und Fake-Quellen."""
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps({
+        "target_apps": ["notepad.exe", "code.exe"],
+        "db_path": str(tmp_path / "tracker.db"),
+        "check_interval": 0.01,
+    }), encoding="utf-8")
+
+    return AppTracker(
+        config_path,
+        backend=backend,
+        foreground_source=ScriptedForegroundSource(events),
+        clock=clock,
+    )
+
+
+def logged_sessions(tmp_path):
+    """Lies alle geloggten Sessions (app_name) aus der Test-DB."""
+    conn = sqlite3.connect(tmp_path / "tracker.db")
+    sql = "SELECT apps.name FROM app_sessions JOIN apps ON apps.id = app_id ORDER BY app_sessions.id"
+    rows = [row[0] for row in conn.execute(sql)]
+    conn.close()
+    return rows
+
+
+def test_focus_switches_open_sessions(tmp_path):
+    """Fokuswechsel öffnen Sessions, Fokusverlust hält sie offen."""
+    backend = FakeBackend("notepad.exe", "code.exe", "explorer.exe")
+    tracker = make_tracker(tmp_path, backend)
+    tracker.process_table.refresh()
+
+    tracker.handle_foreground(ForegroundEvent(1, "notepad.exe", "C:/notepad.exe"))
+    tracker.handle_foreground(ForegroundEvent(3, "explorer.exe"))
+    tracker.handle_foreground(ForegroundEvent(2, "code.exe", "C:/code.exe"))
+
+    assert set(tracker.sessions) == {"notepad.exe", "code.exe"}
+    assert tracker.sessions["code.exe"].is_focused
+    assert not tracker.sessions["notepad.exe"].is_focused
+    tracker.close()
+
+
+def test_reused_pid_is_not_attributed_to_old_app(tmp_path):
+    """Eine neu vergebene PID zählt sofort als neuer Prozess, auch vor dem nächsten Snapshot."""
+    backend = FakeBackend("notepad.exe", "explorer.exe")
+    tracker = make_tracker(tmp_path, backend)
+    tracker.process_table.refresh()
+
+    tracker.handle_foreground(ForegroundEvent(1))
+    tracker.handle_foreground(ForegroundEvent(2))
+    backend.reuse(1, "calc.exe")    # ohne refresh(): Snapshot kennt noch notepad
+    tracker.handle_foreground(ForegroundEvent(1))
+
+    assert tracker._focused is None
+    assert not tracker.sessions["notepad.exe"].is_focused
+    assert tracker.pid_cache.hits == 0
+    tracker.close()
+
+
+def test_liveness_follows_check_interval_without_exit_watcher(tmp_path):
+    """Ohne Exit-Watcher wird bei offenen Sessions im Takt von check_interval gescannt."""
+    backend = FakeBackend("notepad.exe", "explorer.exe")
+    tracker = make_tracker(tmp_path, backend)
+    tracker.process_table.refresh()
+    assert tracker.exit_watcher is None
+    assert tracker._liveness_interval() == LIVENESS_INTERVAL
+
+    tracker.handle_foreground(ForegroundEvent(1, "notepad.exe"))
+    assert tracker._liveness_interval() == tracker.check_interval == 0.01
+    tracker.close()
+
+
+def test_exit_event_ends_session(tmp_path):
+    """Beendete Prozesse beenden ihre Session beim nächsten Liveness-Check."""
+    backend = FakeBackend("notepad.exe", "explorer.exe")
+    tracker = make_tracker(tmp_path, backend)
+    tracker.process_table.refresh()
+
+    tracker.handle_foreground(ForegroundEvent(1, "notepad.exe", "C:/notepad.exe"))
+    backend.kill("notepad.exe")
+    tracker.check_liveness()
+    tracker.close()
+
+    assert tracker.sessions == {}
+    assert logged_sessions(tmp_path) == ["notepad.exe"]
+
+
+def test_sub_second_focus_accumulates(tmp_path):
+    """Kurze Fokusphasen gehen nicht durch Abschneiden pro Wechsel verloren."""
+    backend = FakeBackend("notepad.exe", "explorer.exe")
+    clock = FakeClock()
+    tracker = make_tracker(tmp_path, backend, clock=clock)
+    tracker.process_table.refresh()
+
+    # 4 × 0,6 s Fokus, jeweils 0,4 s woanders
+    for _ in range(4):
+        tracker.handle_foreground(ForegroundEvent(1, "notepad.exe"))
+        clock.advance(0.6)
+        tracker.handle_foreground(ForegroundEvent(2, "explorer.exe"))
+        clock.advance(0.4)
+
+    tracker._end_session("notepad.exe")
+    tracker.close()
+
+    conn = sqlite3.connect(tmp_path / "tracker.db")
+    focus, total = conn.execute(
+        "SELECT duration_seconds, total_duration_seconds FROM app_sessions"
+    ).fetchone()
+    conn.close()
+    assert (focus, total) == (2, 4)
+
+
+def test_scripted_source_drives_monitoring(tmp_path):
+    """Eine skriptgesteuerte Quelle treibt start_monitoring bis zum Ende."""
+    backend = FakeBackend("notepad.exe", "code.exe")
+    events = [
+        ForegroundEvent(1, "notepad.exe", "C:/notepad.exe"),
+        ForegroundEvent(2, "code.exe", "C:/code.exe"),
+        ForegroundEvent(1, "notepad.exe", "C:/notepad.exe"),
+    ]
+    tracker = make_tracker(tmp_path, backend, events)
+
+    tracker.start_monitoring()
+
+    # Offene Sessions werden beim Beenden gespeichert
+    assert sorted(logged_sessions(tmp_path)) == ["code.exe", "notepad.exe"]
+    # Ein Wakeup pro Event plus Ende, kein Polling dazwischen
+    assert tracker.wakeups == len(events) + 1
+
+
+def test_run_async_flushes_sessions(tmp_path):
+    """Die asyncio-Engine läuft bis zum Ende der Quelle und speichert alles."""
+    backend = FakeBackend("notepad.exe", "code.exe")
+    events = [
+        ForegroundEvent(1, "notepad.exe", "C:/notepad.exe"),
+        ForegroundEvent(2, "code.exe", "C:/code.exe"),
+    ]
+    tracker = make_tracker(tmp_path, backend, events)
+
+    asyncio.run(tracker.run_async())
+
+    assert tracker.sessions == {}
+    assert sorted(logged_sessions(tmp_path)) == ["code.exe", "notepad.exe"]
+
+
+def test_run_async_stops_from_embedding_loop(tmp_path):
+    """stop() beendet eine eingebettete Engine sauber."""
+    backend = FakeBackend("notepad.exe")
+    tracker = make_tracker(tmp_path, backend)
+    tracker.foreground = ScriptedForegroundSource(
+        [ForegroundEvent(1, "notepad.exe")], stop_when_done=False
+    )
+
+    async def agent():
+        engine = asyncio.create_task(tracker.run_async())
+        await asyncio.sleep(0.05)
+        tracker.stop()
+        await asyncio.wait_for(engine, timeout=5)
+
+    asyncio.run(agent())
+
+    assert logged_sessions(tmp_path) == ["notepad.exe"]
@@ -0,0 +1,132 @@
+"""Tests für den Hintergrund-Writer (Group Commit und Auslagerung)."""
+
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Füge src zum Path hinzu
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from timetracker.database import Database, SessionRecord
+from timetracker.exceptions import DatabaseError
+from timetracker.writer import SessionWriter
+
+
+def record(app_name):
+    """Eine kurze, gerade beendete Session."""
+    end = datetime.now()
+    return SessionRecord(app_name, None, end - timedelta(seconds=5), end, 3, 5)
+
+
+def count_rows(db_path):
+    """Anzahl gespeicherter Sessions."""
+    conn = sqlite3.connect(db_path)
+    count = conn.execute("SELECT COUNT(*) FROM app_sessions").fetchone()[0]
+    conn.close()
+    return count
+
+
+def test_batches_are_committed_together(tmp_path):
+    """Sessions werden gesammelt und in wenigen Transaktionen geschrieben."""
+    db = Database(tmp_path / "tracker.db")
+    calls = []
+    log_sessions = db.log_sessions
+    db.log_sessions = lambda records, **kw: calls.append(len(records)) or log_sessions(records, **kw)
+
+    writer = SessionWriter(db, batch_size=10, flush_interval=5.0)
+    for i in range(25):
+        writer.submit(record(f"app{i}.exe"))
+    writer.close()
+    db.close()
+
+    assert count_rows(tmp_path / "tracker.db") == 25
+    assert calls[:2] == [10, 10]
+    assert sum(calls) == 25
+
+
+def test_spills_while_db_unavailable_and_replays(tmp_path):
+    """Bei DB-Fehlern wird ausgelagert und später in Reihenfolge nachgetragen."""
+    db = Database(tmp_path / "tracker.db")
+    log_sessions = db.log_sessions
+
+    def broken(records, **kw):
+        raise DatabaseError("database is locked")
+
+    db.log_sessions = broken
+    writer = SessionWriter(db, flush_interval=0.01, retry_interval=0.05)
+    writer.submit(record("notepad.exe"))
+    writer.submit(record("code.exe"))
+
+    deadline = time.monotonic() + 5
+    while writer.spilled < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert writer.spill_path.exists()
+
+    db.log_sessions = log_sessions
+    writer.close()
+    db.close()
+
+    assert not writer.spill_path.exists()
+    assert count_rows(tmp_path / "tracker.db") == 2
+
+
+def test_durable_callback_only_after_commit_or_spill(tmp_path):
+    """on_durable kommt erst nach dem Commit – und nie, wenn auch das Auslagern scheitert."""
+    db = Database(tmp_path / "tracker.db")
+    durable = []
+    writer = SessionWriter(db, flush_interval=0.01)
+    writer.submit(record("notepad.exe"), lambda: durable.append(count_rows(db.db_path)))
+    writer.close()
+    assert durable == [1]
+
+    def broken(records, **kw):
+        raise DatabaseError("disk I/O error")
+
+    db.log_sessions = broken
+    writer = SessionWriter(db, spill_path=tmp_path / "fehlt" / "tracker.db.spill",
+                           flush_interval=0.01)
+    writer.submit(record("code.exe"), lambda: durable.append("verloren"))
+    writer.close()
+    db.close()
+    assert durable == [1]
+
+
+def test_corrupt_spill_lines_are_quarantined(tmp_path):
+    """Nicht lesbare Zeilen werden nicht gelöscht, sondern in <spill>.bad verschoben."""
+    db = Database(tmp_path / "tracker.db")
+    spill_path = tmp_path / "tracker.db.spill"
+    first = SessionWriter._to_json(record("notepad.exe"))
+    second = SessionWriter._to_json(record("chrome.exe"))
+    spill_path.write_text(f'{first}\n{{"app_name": "code.exe", "start_ti\n{second}\n',
+                          encoding="utf-8")
+
+    writer = SessionWriter(db, spill_path=spill_path)
+    writer.close()
+    db.close()
+
+    assert count_rows(tmp_path / "tracker.db") == 2
+    assert not spill_path.exists()
+    assert writer.quarantine_path.read_text(encoding="utf-8") == '{"app_name": "code.exe", "start_ti\n'
+
+
+def test_replay_after_crash_before_cleanup_is_idempotent(tmp_path):
+    """Absturz zwischen Commit und Löschen der Auslagerung: nichts wird doppelt gezählt."""
+    db = Database(tmp_path / "tracker.db")
+    spill_path = tmp_path / "tracker.db.spill"
+    records = [record("notepad.exe"), record("code.exe")]
+    spill_path.write_text("".join(SessionWriter._to_json(r) + "\n" for r in records),
+                          encoding="utf-8")
+    # Stand nach dem Commit des Nachtragens, die Datei wurde nie entfernt
+    db.log_sessions(records)
+
+    writer = SessionWriter(db, spill_path=spill_path)
+    writer.close()
+
+    assert not spill_path.exists()
+    assert writer.written == 0
+    assert count_rows(tmp_path / "tracker.db") == 2
+    assert db.read("SELECT SUM(opens) FROM app_daily_stats") == [(2,)]
+    db.close()